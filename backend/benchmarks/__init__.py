@@ -0,0 +1,80 @@
+"""
+Benchmarks for the hot paths of the API.
+
+Each module is a standalone script, run from the backend directory:
+
+    python -m benchmarks.pagination
+
+Benchmarks run against a throwaway test database created from the
+configured one (`ENVIRONMENT=test` for SQLite, `DATABASE_URL` for
+PostgreSQL), so they never touch real data.
+
+Functions:
+- setup: Configures Django for a standalone script.
+- test_database: Context manager that creates and destroys a test database.
+- measure: Times a callable and returns its latencies in milliseconds.
+- report: Prints a table of results.
+"""
+
+import contextlib
+import os
+import statistics
+import time
+
+
+def setup() -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
+
+    import django
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(fn, repeat: int = 20) -> list[float]:
+    """
+    Calls `fn` `repeat` times and returns the latency of each call in ms.
+    """
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def percentile(latencies: list[float], p: int) -> float:
+    if len(latencies) == 1:
+        return latencies[0]
+    return statistics.quantiles(latencies, n=100, method='inclusive')[p - 1]
+
+
+def report(title: str, rows: list[tuple]) -> None:
+    """
+    Prints `rows` of `(label, latencies)` as a table of p50/p95/max in ms.
+    """
+    print(f'\n{title}')
+    print(f'{"":<28}{"p50 ms":>10}{"p95 ms":>10}{"max ms":>10}')
+    for label, latencies in rows:
+        print(
+            f'{label:<28}'
+            f'{percentile(latencies, 50):>10.2f}'
+            f'{percentile(latencies, 95):>10.2f}'
+            f'{max(latencies):>10.2f}'
+        )
@@ -0,0 +1,120 @@
+"""
+Aging report of receivables over a large ledger of payments.
+
+Compares bucketing every unpaid receivable in Python, as a client paging
+`/receivables` would, with the grouped query of
+`billing.aging.aging_report`, cold and cached.
+
+    python -m benchmarks.aging --size 1000000 --businesses 10
+"""
+
+import argparse
+
+from . import measure, report, setup, test_database
+
+
+def seed(businesses, contacts, count: int) -> None:
+    import ulid
+
+    from datetime import date, timedelta
+
+    from modules.billing.models import Payment
+
+    today = date.today()
+
+    def payments():
+        for n in range(count):
+            due_at = today - timedelta(days=(n % 180) - 30)
+            yield Payment(
+                id=ulid.new().str,
+                business=businesses[(n // 2) % len(businesses)],
+                contact=contacts[n % len(contacts)],
+                issued_at=due_at,
+                due_at=due_at,
+                total_amount=100,
+                outstanding_balance=100,
+                payment_type='receivable' if n % 2 else 'payable',
+                status='paid' if n % 5 == 0 else 'pending',
+                notes=f'Payment {n}',
+            )
+
+    Payment.objects.bulk_create(payments(), batch_size=5000)
+
+
+def bucket_in_python(business) -> dict:
+    from datetime import date
+
+    from modules.billing.aging import BUCKETS, UNPAID
+
+    today = date.today()
+    totals = {name: 0 for name, _, _ in BUCKETS}
+    payments = business.payments\
+        .filter(UNPAID, payment_type='receivable')\
+        .values_list('due_at', 'outstanding_balance')
+
+    for due_at, outstanding_balance in payments.iterator(chunk_size=5000):
+        days = (today - due_at).days
+        for name, least, most in BUCKETS:
+            if (least is None or days >= least) and (most is None or days <= most):
+                totals[name] += outstanding_balance
+                break
+
+    return totals
+
+
+def main(size: int, businesses: int, contacts: int, repeat: int) -> None:
+    from django.core.cache import cache
+
+    from modules.billing.aging import aging_report
+    from modules.business.models import Business
+    from modules.contacts.models import Customer
+
+    with test_database():
+        tenants = [
+            Business.objects.create(
+                legal_name=f'Business {n}',
+                trade_name=f'Business {n}',
+                cnpj=f'{n:014d}',
+            )
+            for n in range(businesses)
+        ]
+        customers = [
+            Customer.objects.create(name=f'Customer {n}')
+            for n in range(contacts)
+        ]
+        seed(tenants, customers, size)
+        business = tenants[0]
+
+        def cold(by_contact):
+            def run():
+                cache.clear()
+                aging_report(business, 'receivable', by_contact=by_contact)
+            return run
+
+        rows = [
+            ('python bucketing', measure(
+                lambda: bucket_in_python(business), max(1, repeat // 4)
+            )),
+            ('grouped query', measure(cold(False), repeat)),
+            ('grouped query by contact', measure(cold(True), repeat)),
+            ('cached', measure(
+                lambda: aging_report(business, 'receivable'), repeat
+            )),
+        ]
+
+    report(
+        f'Receivables aging, {size} payments across {businesses} businesses',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--businesses', type=int, default=10)
+    parser.add_argument('--contacts', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    main(args.size, args.businesses, args.contacts, args.repeat)
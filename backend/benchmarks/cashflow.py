@@ -0,0 +1,99 @@
+"""
+Cash-flow projection of a tenant with many open payments.
+
+Compares streaming every open payment ordered by `due_at` and adding
+them up in Python with `billing.cashflow.project_cash_flow`, which sums
+them per day in the database. The dashboard budget is 100 ms.
+
+    python -m benchmarks.cashflow --size 50000
+"""
+
+import argparse
+
+from . import measure, report, setup, test_database
+
+
+def seed(business, contact, count: int) -> None:
+    import ulid
+
+    from datetime import date, timedelta
+
+    from modules.billing.models import Payment
+
+    today = date.today()
+
+    def payments():
+        for n in range(count):
+            due_at = today + timedelta(days=(n % 120) - 20)
+            yield Payment(
+                id=ulid.new().str,
+                business=business,
+                contact=contact,
+                issued_at=due_at,
+                due_at=due_at,
+                total_amount=100,
+                outstanding_balance=100,
+                payment_type='receivable' if n % 3 else 'payable',
+                status='overdue' if due_at < today else 'pending',
+                notes=f'Payment {n}',
+            )
+
+    Payment.objects.bulk_create(payments(), batch_size=5000)
+
+
+def stream_in_python(business, days: int = 90) -> list:
+    from datetime import date, timedelta
+    from itertools import accumulate
+
+    from modules.billing.aging import UNPAID
+
+    today = date.today()
+    balance = sum(
+        business.financial_accounts.values_list('balance', flat=True)
+    )
+    deltas = [0] * (days + 1)
+
+    payments = business.payments\
+        .filter(UNPAID, due_at__lte=today + timedelta(days=days))\
+        .order_by('due_at')\
+        .values_list('due_at', 'payment_type', 'outstanding_balance')
+
+    for due_at, payment_type, amount in payments.iterator(chunk_size=5000):
+        day = max((due_at - today).days, 0)
+        deltas[day] += amount if payment_type == 'receivable' else -amount
+
+    return list(accumulate(deltas, initial=balance))[1:]
+
+
+def main(size: int, repeat: int) -> None:
+    from modules.billing.cashflow import project_cash_flow
+    from modules.business.models import Business
+    from modules.contacts.models import Customer
+
+    with test_database():
+        business = Business.objects.create(
+            legal_name='Benchmark INC', trade_name='Benchmark', cnpj='0' * 14
+        )
+        contact = Customer.objects.create(name='Customer', business=business)
+        seed(business, contact, size)
+
+        rows = [
+            ('streamed in python', measure(
+                lambda: stream_in_python(business), max(1, repeat // 4)
+            )),
+            ('grouped per day', measure(
+                lambda: project_cash_flow(business), repeat
+            )),
+        ]
+
+    report(f'Cash-flow projection, 90 days, {size} open payments', rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    main(args.size, args.repeat)
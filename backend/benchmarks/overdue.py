@@ -0,0 +1,99 @@
+"""
+Nightly overdue sweep of `billing.tasks.update_payment_status`.
+
+Compares the set-based UPDATE with the former loop that saved every
+unpaid payment one by one (run on a smaller sample, it is linear).
+
+    python -m benchmarks.overdue --size 1000000 --legacy-size 10000
+"""
+
+import argparse
+import time
+
+from . import setup, test_database
+
+
+def seed(businesses, contact, count: int) -> None:
+    import ulid
+
+    from datetime import date, timedelta
+
+    from modules.billing.models import Payment
+
+    today = date.today()
+
+    def payments():
+        for n in range(count):
+            due_at = today + timedelta(days=(n % 60) - 30)
+            yield Payment(
+                id=ulid.new().str,
+                business=businesses[n % len(businesses)],
+                contact=contact,
+                issued_at=due_at,
+                due_at=due_at,
+                total_amount=100,
+                outstanding_balance=100,
+                payment_type='receivable' if n % 2 else 'payable',
+                status='paid' if n % 5 == 0 else 'pending',
+                notes=f'Payment {n}',
+            )
+
+    Payment.objects.bulk_create(payments(), batch_size=5000)
+
+
+def legacy_sweep() -> None:
+    from datetime import date
+
+    from modules.billing.models import Payment
+
+    now = date.today()
+    for payment in Payment.objects.all():
+        if payment.status != 'paid':
+            if payment.due_at < now:
+                payment.status = 'overdue'
+            payment.save()
+
+
+def main(size: int, legacy_size: int, businesses: int) -> None:
+    from modules.billing.models import Payment
+    from modules.billing.tasks import mark_overdue_payments
+    from modules.business.models import Business
+    from modules.contacts.models import Customer
+
+    with test_database():
+        tenants = [
+            Business.objects.create(
+                legal_name=f'Business {n}',
+                trade_name=f'Business {n}',
+                cnpj=f'{n:014d}',
+            )
+            for n in range(businesses)
+        ]
+        contact = Customer.objects.create(name='Benchmark')
+
+        seed(tenants, contact, legacy_size)
+        start = time.perf_counter()
+        legacy_sweep()
+        legacy = time.perf_counter() - start
+
+        Payment.objects.all().delete()
+        seed(tenants, contact, size)
+        start = time.perf_counter()
+        updated = mark_overdue_payments()
+        set_based = time.perf_counter() - start
+
+    print(f'\nOverdue sweep across {businesses} businesses')
+    print(f'legacy loop     {legacy_size:>9} payments {legacy:>9.2f} s')
+    print(f'set-based       {size:>9} payments {set_based:>9.2f} s')
+    print(f'{updated} payments marked as overdue')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--legacy-size', type=int, default=10_000)
+    parser.add_argument('--businesses', type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+    main(args.size, args.legacy_size, args.businesses)
@@ -0,0 +1,88 @@
+"""
+Latency of the first page of `/finance/transactions` as the ledger grows.
+
+Pages are sliced in the database before serialization, so the latency of
+page 1 should stay flat while the table goes from hundreds to hundreds of
+thousands of rows.
+
+    python -m benchmarks.pagination --sizes 100 10000 200000
+"""
+
+import argparse
+
+from . import setup, test_database, measure, report
+
+
+def seed(business, account, operator, count: int) -> None:
+    import ulid
+
+    from modules.finance.models import FinancialTransaction
+
+    FinancialTransaction.objects.bulk_create(
+        (
+            FinancialTransaction(
+                id=ulid.new().str,
+                business=business,
+                account=account,
+                operator=operator,
+                amount=10,
+                description=f'Sale {n}',
+                type='credit',
+            )
+            for n in range(count)
+        ),
+        batch_size=5000,
+    )
+
+
+def main(sizes: list[int], repeat: int) -> None:
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from modules.accounts.models import User, Owner
+    from modules.business.models import Business
+    from modules.finance.models import FinancialAccount
+    from modules.finance.views import FinancialTransactionEndpoint
+
+    with test_database():
+        user = User.objects.create(
+            name='Benchmark', email='bench@depoc.com.br', is_staff=True
+        )
+        business = Business.objects.create(
+            legal_name='Benchmark INC', trade_name='Benchmark', cnpj='0' * 14
+        )
+        Owner.objects.create(user=user, business=business)
+        account = FinancialAccount.objects.create(name='Bank', business=business)
+
+        factory = APIRequestFactory()
+        auth_header = f'Bearer {AccessToken.for_user(user)}'
+        view = FinancialTransactionEndpoint.as_view()
+
+        def first_page():
+            request = factory.get(
+                'finance/transactions',
+                HTTP_AUTHORIZATION=auth_header,
+            )
+            response = view(request)
+            assert response.status_code == 200, response.data
+
+        rows = []
+        seeded = 0
+        for size in sorted(sizes):
+            seed(business, account, user, size - seeded)
+            seeded = size
+            rows.append((f'{size} transactions', measure(first_page, repeat)))
+
+        report('GET /finance/transactions (page 1 of 50)', rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[100, 10_000, 100_000]
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    main(args.sizes, args.repeat)
@@ -0,0 +1,142 @@
+"""
+Latency of `/receivables/?search=` over a large table of payments.
+
+Compares the search document of `modules.billing.search` with the former
+six-way `icontains` filter across the contact tables. Run it against
+PostgreSQL (`DATABASE_URL`) to measure the trigram index; on SQLite both
+are scans.
+
+    python -m benchmarks.payment_search --size 1000000
+"""
+
+import argparse
+import random
+
+from . import setup, test_database, measure, report
+
+
+WORDS = [
+    'aluguel', 'energia', 'agua', 'internet', 'fornecedor', 'mercadoria',
+    'servico', 'manutencao', 'transporte', 'imposto', 'comissao', 'frete',
+]
+
+TERMS = ['frete', 'conceicao', 'nf-1234']
+
+
+def seed(business, count: int) -> None:
+    import ulid
+
+    from datetime import date, timedelta
+
+    from modules.billing.models import Payment
+    from modules.billing.search import search_document
+    from modules.contacts.models import Customer, Supplier
+
+    rng = random.Random(0)
+    contacts = [
+        Customer.objects.create(name=f'Cliente {n}', business=business)
+        for n in range(200)
+    ] + [
+        Supplier.objects.create(legal_name=f'Fornecedor {n}', business=business)
+        for n in range(200)
+    ]
+    contacts.append(
+        Customer.objects.create(name='Maria da Conceição', business=business)
+    )
+    names = {contact.id: str(contact) for contact in contacts}
+
+    def payments():
+        for n in range(count):
+            contact = rng.choice(contacts)
+            due_at = date(2025, 1, 1) + timedelta(days=n % 365)
+            reference = f'NF-{n}'
+            notes = ' '.join(rng.sample(WORDS, 3))
+            yield Payment(
+                id=ulid.new().str,
+                business=business,
+                contact=contact,
+                issued_at=due_at,
+                due_at=due_at,
+                total_amount=100,
+                outstanding_balance=100,
+                payment_type='receivable',
+                reference=reference,
+                notes=notes,
+                search_document=search_document(
+                    names[contact.id], reference, notes
+                ),
+            )
+
+    Payment.objects.bulk_create(payments(), batch_size=5000)
+
+
+def main(size: int, repeat: int) -> None:
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from django.db.models import Q
+
+    from modules.accounts.models import User, Owner
+    from modules.business.models import Business
+    from modules.billing.views import ReceivableSearchEndpoint
+
+    with test_database():
+        user = User.objects.create(
+            name='Benchmark', email='bench@depoc.com.br', is_staff=True
+        )
+        business = Business.objects.create(
+            legal_name='Benchmark INC', trade_name='Benchmark', cnpj='0' * 14
+        )
+        Owner.objects.create(user=user, business=business)
+        seed(business, size)
+
+        factory = APIRequestFactory()
+        auth_header = f'Bearer {AccessToken.for_user(user)}'
+        ReceivableSearchEndpoint.throttle_classes = []
+        view = ReceivableSearchEndpoint.as_view()
+
+        def document_search(term):
+            request = factory.get(
+                f'receivables/?search={term}',
+                HTTP_AUTHORIZATION=auth_header,
+            )
+            response = view(request)
+            assert response.status_code == 200, response.data
+
+        def legacy_search(term):
+            payments = business.payments\
+                .filter(payment_type='receivable')\
+                .filter(
+                    Q(contact__customer__name__icontains=term) |
+                    Q(contact__customer__alias__icontains=term) |
+                    Q(contact__supplier__legal_name__icontains=term) |
+                    Q(contact__supplier__trade_name__icontains=term) |
+                    Q(reference__icontains=term) |
+                    Q(notes__icontains=term)
+                )\
+                .order_by('due_at', 'id')
+            payments.count()
+            list(payments[:50])
+
+        rows = []
+        for term in TERMS:
+            rows.append((
+                f'{term} (icontains)',
+                measure(lambda: legacy_search(term), repeat),
+            ))
+            rows.append((
+                f'{term} (document)',
+                measure(lambda: document_search(term), repeat),
+            ))
+
+        report(f'GET /receivables/?search= ({size} payments)', rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    main(args.size, args.repeat)
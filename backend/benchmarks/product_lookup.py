@@ -0,0 +1,94 @@
+"""
+Latency of a checkout scan over a large catalogue.
+
+Compares resolving a barcode through `/products/?search=` with
+`/products/lookup?code=`, cold (first scan of a code) and warm (the
+code is already in the lookup cache).
+
+    python -m benchmarks.product_lookup --size 200000
+"""
+
+import argparse
+
+from . import setup, test_database, measure, report
+
+
+def seed(business, count: int) -> list[str]:
+    import ulid
+
+    from modules.products.models import Product
+
+    products = [
+        Product(
+            id=ulid.new().str,
+            business=business,
+            name=f'Product {n}',
+            sku=f'SKU-{n}',
+            barcode=f'789{n:010}',
+            retail_price=10,
+        )
+        for n in range(count)
+    ]
+    Product.objects.bulk_create(products, batch_size=5000)
+    return [product.barcode for product in products]
+
+
+def main(size: int, repeat: int) -> None:
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from modules.accounts.models import User, Owner
+    from modules.business.models import Business
+    from modules.products.views import ProductSearchEndpoint, ProductLookupEndpoint
+
+    with test_database():
+        user = User.objects.create(
+            name='Benchmark', email='bench@depoc.com.br', is_staff=True
+        )
+        business = Business.objects.create(
+            legal_name='Benchmark INC', trade_name='Benchmark', cnpj='0' * 14
+        )
+        Owner.objects.create(user=user, business=business)
+        barcodes = iter(seed(business, size))
+
+        factory = APIRequestFactory()
+        auth_header = f'Bearer {AccessToken.for_user(user)}'
+        ProductSearchEndpoint.throttle_classes = []
+        ProductLookupEndpoint.throttle_classes = []
+        search_view = ProductSearchEndpoint.as_view()
+        lookup_view = ProductLookupEndpoint.as_view()
+
+        def search(barcode):
+            request = factory.get(
+                f'products/?search={barcode}',
+                HTTP_AUTHORIZATION=auth_header,
+            )
+            response = search_view(request)
+            assert response.status_code == 200, response.data
+
+        def scan(barcode):
+            request = factory.get(
+                f'products/lookup?code={barcode}',
+                HTTP_AUTHORIZATION=auth_header,
+            )
+            response = lookup_view(request)
+            assert response.status_code == 200, response.data
+
+        warm = next(barcodes)
+        scan(warm)
+
+        report(f'Scanning a barcode ({size} products)', [
+            ('search', measure(lambda: search(next(barcodes)), repeat)),
+            ('lookup (cold)', measure(lambda: scan(next(barcodes)), repeat)),
+            ('lookup (warm)', measure(lambda: scan(warm), repeat)),
+        ])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    main(args.size, args.repeat)
@@ -0,0 +1,124 @@
+"""
+Due date generation of recurring payments.
+
+Compares `modules.billing.recurrence` with the former signal path, which
+counted the occurrences left in the year by walking the calendar and
+then built every date with a fresh `relativedelta` (copied below as the
+`legacy_*` functions). Only the date arithmetic is timed; no database
+is involved.
+
+    python -m benchmarks.recurrence --schedules 10000
+"""
+
+import argparse
+import random
+
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta, MO, TU, WE, TH, FR, SA, SU
+
+from modules.billing import recurrence
+
+from . import measure, report
+
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def legacy_count_weekdays(start_date: date, weekday: str) -> int:
+    weekday_to_int = WEEKDAYS.index(weekday)
+    end_date = date(start_date.year, 12, 31)
+    count = 0
+    while start_date <= end_date:
+        if start_date.weekday() == weekday_to_int:
+            count += 1
+        start_date += timedelta(days=1)
+    return count
+
+
+def legacy_count_months(due_date: date) -> int:
+    end_date = date(due_date.year, 12, 31)
+    count = 0
+    while due_date <= end_date:
+        count += 1
+        due_date += relativedelta(months=1)
+    return count
+
+
+def legacy_next_due_date(due_date, due_day=None, due_weekday=None,
+                         weeks=None, months=None, kind='monthly'):
+    weekday_map = {
+        'monday': MO,
+        'tuesday': TU,
+        'wednesday': WE,
+        'thursday': TH,
+        'friday': FR,
+        'saturday': SA,
+        'sunday': SU,
+    }
+    if kind == 'installments':
+        return due_date.replace(day=due_day) + relativedelta(months=months)
+    if kind == 'weekly':
+        next_weekday = due_date + relativedelta(weekday=weekday_map[due_weekday])
+        return next_weekday + timedelta(weeks=weeks)
+    return due_date + relativedelta(months=months)
+
+
+def legacy(schedules) -> None:
+    for kind, due_at, weekday, due_day in schedules:
+        if kind == 'weekly':
+            for week in range(1, legacy_count_weekdays(due_at, weekday)):
+                legacy_next_due_date(
+                    due_at, due_weekday=weekday, weeks=week, kind=kind
+                )
+        elif kind == 'monthly':
+            for month in range(1, legacy_count_months(due_at)):
+                legacy_next_due_date(due_at, months=month, kind=kind)
+        else:
+            for month in range(1, 12):
+                legacy_next_due_date(
+                    due_at, due_day=due_day, months=month, kind=kind
+                )
+
+
+def closed_form(schedules) -> None:
+    for kind, due_at, weekday, due_day in schedules:
+        year_end = date(due_at.year, 12, 31)
+        if kind == 'weekly':
+            recurrence.weekly_dates(due_at, weekday, due_at, year_end)
+        elif kind == 'monthly':
+            recurrence.monthly_dates(due_at, due_at, year_end)
+        else:
+            recurrence.installment_dates(due_at, 12, due_day)
+
+
+def generate(count: int) -> list[tuple]:
+    rng = random.Random(0)
+    schedules = []
+    for n in range(count):
+        due_at = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+        schedules.append((
+            ('weekly', 'monthly', 'installments')[n % 3],
+            due_at,
+            rng.choice(WEEKDAYS),
+            # The legacy path raises on days a month lacks.
+            rng.randint(1, 28),
+        ))
+    return schedules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--schedules', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    schedules = generate(args.schedules)
+
+    report(f'{args.schedules} schedules (weekly, monthly, 12 installments)', [
+        ('signal path (legacy)', measure(lambda: legacy(schedules), args.repeat)),
+        ('closed form', measure(lambda: closed_form(schedules), args.repeat)),
+    ])
+
+
+if __name__ == '__main__':
+    main()
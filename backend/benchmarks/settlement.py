@@ -0,0 +1,119 @@
+"""
+Settlement throughput of receivables, in settlements per second.
+
+Compares settling one receivable per request through
+`receivables/<id>/settle` with settling them in batches through
+`receivables/settle`.
+
+    python -m benchmarks.settlement --size 2000 --single-size 200
+"""
+
+import argparse
+import time
+
+from . import setup, test_database
+
+
+def seed(business, contact, count: int) -> list:
+    import ulid
+
+    from datetime import date
+
+    from modules.billing.models import Payment
+
+    payments = [
+        Payment(
+            id=ulid.new().str,
+            business=business,
+            contact=contact,
+            issued_at=date.today(),
+            due_at=date.today(),
+            total_amount=100,
+            outstanding_balance=100,
+            payment_type='receivable',
+            notes=f'Receivable {n}',
+        )
+        for n in range(count)
+    ]
+    return Payment.objects.bulk_create(payments, batch_size=5000)
+
+
+def main(size: int, single_size: int) -> None:
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from modules.accounts.models import User, Owner
+    from modules.business.models import Business
+    from modules.contacts.models import Customer
+    from modules.finance.models import FinancialAccount
+    from modules.billing.services import MAX_SETTLEMENTS
+    from modules.billing.views import (
+        ReceivableSettleEndpoint,
+        ReceivableBulkSettleEndpoint,
+    )
+
+    with test_database():
+        user = User.objects.create(
+            name='Benchmark', email='bench@depoc.com.br', is_staff=True
+        )
+        business = Business.objects.create(
+            legal_name='Benchmark INC', trade_name='Benchmark', cnpj='0' * 14
+        )
+        Owner.objects.create(user=user, business=business)
+        account = FinancialAccount.objects.create(name='Bank', business=business)
+        contact = Customer.objects.create(name='Customer', business=business)
+
+        factory = APIRequestFactory()
+        auth_header = f'Bearer {AccessToken.for_user(user)}'
+
+        # Throttling would cap the one-by-one run, not the code under test.
+        ReceivableSettleEndpoint.throttle_classes = []
+        ReceivableBulkSettleEndpoint.throttle_classes = []
+        single_view = ReceivableSettleEndpoint.as_view()
+        bulk_view = ReceivableBulkSettleEndpoint.as_view()
+
+        payments = seed(business, contact, single_size)
+        start = time.perf_counter()
+        for payment in payments:
+            request = factory.post(
+                'receivables/<id>/settle',
+                data={'amount': 100, 'account': account.id},
+                HTTP_AUTHORIZATION=auth_header,
+            )
+            response = single_view(request, receivable_id=payment.id)
+            assert response.status_code == 201, response.data
+        single = time.perf_counter() - start
+
+        payments = seed(business, contact, size)
+        bulk = 0
+        for offset in range(0, size, MAX_SETTLEMENTS):
+            request = factory.post(
+                'receivables/settle',
+                data={'settlements': [
+                    {'payment': payment.id, 'account': account.id, 'amount': 100}
+                    for payment in payments[offset:offset + MAX_SETTLEMENTS]
+                ]},
+                format='json',
+                HTTP_AUTHORIZATION=auth_header,
+            )
+            start = time.perf_counter()
+            response = bulk_view(request)
+            bulk += time.perf_counter() - start
+            assert response.status_code == 201, response.data
+
+        print(f'\n{"":<32}{"settlements":>12}{"seconds":>10}{"per second":>12}')
+        for label, count, seconds in [
+            ('one per request', single_size, single),
+            (f'batches of {MAX_SETTLEMENTS}', size, bulk),
+        ]:
+            print(f'{label:<32}{count:>12}{seconds:>10.2f}{count / seconds:>12.0f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--single-size', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    main(args.size, args.single_size)
@@ -0,0 +1,322 @@
+"""
+Load test of a store day against a running server.
+
+Cashiers log in through `/token` and then ring up sales: each item is
+scanned through `/products/lookup` and taken out of stock with an
+outbound inventory transaction, and the sale is paid in with a credit
+transaction. Now and then a customer settles part of a receivable.
+Each cashier runs in its own thread, one request after the other, and
+the script reports requests per second and p50/p95/p99 latencies per
+endpoint.
+
+The script first (re)creates a `Store Day` tenant in the configured
+database, so point it at a local one the server also uses, and lift the
+throttles of the server, for instance:
+
+    export ENVIRONMENT=test  # or DATABASE_URL=postgres://localhost/depoc_load
+    export ANON_THROTTLE_RATE= USER_THROTTLE_RATE=
+    export BURST_THROTTLE_RATE= SUSTAINED_THROTTLE_RATE=
+    python manage.py migrate
+    gunicorn server.wsgi --workers 4 --bind 127.0.0.1:8000 &
+    python -m benchmarks.store_day --cashiers 8 --sales 100
+
+Every request of every cashier follows from `--seed`, so runs with the
+same arguments send the same requests and can be compared across
+commits (`--output` saves the results as JSON).
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import percentile, setup
+
+
+USERNAME = 'storeday'
+PASSWORD = 'storeday-load-test'
+CNPJ = '9' * 14
+
+
+def reset(products: int, customers: int, rng: random.Random) -> dict:
+    """
+    Replaces the `Store Day` tenant with a fresh one and returns what
+    the cashiers need to know about it.
+    """
+    import ulid
+
+    from datetime import timedelta
+
+    from django.db import transaction
+    from django.utils import timezone
+
+    from modules.accounts.models import Owner, User
+    from modules.billing.models import Payment
+    from modules.business.models import Business
+    from modules.contacts.models import Customer
+    from modules.finance.models import FinancialCategory, FinancialTransaction
+    from modules.inventory.models import Inventory
+    from modules.products.models import Product
+
+    # Rows protecting others of the tenant go first.
+    for business in Business.objects.filter(cnpj=CNPJ):
+        FinancialTransaction.objects.filter(business=business).delete()
+        Payment.objects.filter(business=business).delete()
+        Product.objects.filter(business=business).delete()
+        business.delete()
+    User.objects.filter(username=USERNAME).delete()
+
+    today = timezone.localdate()
+
+    with transaction.atomic():
+        user = User.objects.create_user(
+            username=USERNAME,
+            email='storeday@depoc.com.br',
+            password=PASSWORD,
+            name='Store Day',
+            is_staff=True,
+        )
+        business = Business.objects.create(
+            legal_name='Store Day INC', trade_name='Store Day', cnpj=CNPJ
+        )
+        Owner.objects.create(user=user, business=business)
+        account = business.financial_accounts.get()
+        # Category names are unique across businesses, so the name of
+        # this one carries the id of its business.
+        category = FinancialCategory.objects.create(
+            name=f'Store Day Sales {business.id}', business=business
+        )
+
+        catalogue = Product.objects.bulk_create(
+            (
+                Product(
+                    id=ulid.new().str,
+                    business=business,
+                    name=f'Product {n}',
+                    sku=f'SKU-{n}',
+                    barcode=f'789{n:010}',
+                    retail_price=rng.randint(100, 5000) / 100,
+                    stock=10**6,
+                )
+                for n in range(products)
+            ),
+            batch_size=5000,
+        )
+        inventories = Inventory.objects.bulk_create(
+            (
+                Inventory(id=ulid.new().str, product=product, quantity=10**6)
+                for product in catalogue
+            ),
+            batch_size=5000,
+        )
+
+        contacts = [
+            Customer.objects.create(name=f'Customer {n}', business=business)
+            for n in range(customers)
+        ]
+        receivables = Payment.objects.bulk_create(
+            Payment(
+                id=ulid.new().str,
+                business=business,
+                contact=contact,
+                issued_at=today,
+                due_at=today + timedelta(days=rng.randint(-30, 30)),
+                total_amount=10**5,
+                outstanding_balance=10**5,
+                payment_type='receivable',
+                status='pending',
+                notes=f'Tab of customer {n}',
+            )
+            for n, contact in enumerate(contacts)
+        )
+
+    return {
+        'account': account.id,
+        'category': category.id,
+        'products': [
+            (product.barcode, inventory.id, str(product.retail_price))
+            for product, inventory in zip(catalogue, inventories)
+        ],
+        'receivables': [receivable.id for receivable in receivables],
+    }
+
+
+def plan(store: dict, sales: int, settle_rate: float, rng: random.Random) -> list:
+    """
+    The requests of one cashier: `(label, method, path, data)`.
+    """
+    requests = [(
+        'login',
+        'post',
+        '/token',
+        {'username': USERNAME, 'password': PASSWORD},
+    )]
+
+    for _ in range(sales):
+        total = 0
+        for _ in range(rng.randint(1, 5)):
+            barcode, inventory_id, price = rng.choice(store['products'])
+            quantity = rng.randint(1, 3)
+            total += float(price) * quantity
+            requests.append((
+                'lookup', 'get', f'/products/lookup?code={barcode}', None
+            ))
+            requests.append((
+                'sale',
+                'post',
+                f'/products/inventory/{inventory_id}/transactions',
+                {'type': 'outbound', 'quantity': quantity, 'unit_price': price},
+            ))
+
+        requests.append(('payment', 'post', '/finance/transactions', {
+            'account': store['account'],
+            'category': store['category'],
+            'type': 'credit',
+            'amount': f'{total:.2f}',
+            'description': 'Sale',
+        }))
+
+        if rng.random() < settle_rate:
+            receivable = rng.choice(store['receivables'])
+            requests.append((
+                'settlement',
+                'post',
+                f'/receivables/{receivable}/settle',
+                {'account': store['account'], 'amount': rng.randint(5, 50)},
+            ))
+
+    return requests
+
+
+def run_cashier(url: str, requests: list, results: list, lock) -> None:
+    import requests as http
+
+    session = http.Session()
+    timings = []
+
+    for label, method, path, data in requests:
+        start = time.perf_counter()
+        response = session.request(method, url + path, json=data)
+        elapsed = (time.perf_counter() - start) * 1000
+        timings.append((label, elapsed, response.status_code < 400))
+
+        if label == 'login':
+            if response.status_code != 200:
+                raise RuntimeError(f'Login failed: {response.text}')
+            token = response.json()['access']
+            session.headers['Authorization'] = f'Bearer {token}'
+
+    with lock:
+        results.extend(timings)
+
+
+def summarize(results: list, elapsed: float) -> dict:
+    """
+    Requests, errors, requests per second and latency percentiles per
+    endpoint and in `total`, from the `(label, ms, ok)` of `results`.
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault(result[0], []).append(result)
+    groups['total'] = results
+
+    rows = {}
+    for label, group in groups.items():
+        latencies = [latency for _, latency, _ in group]
+        rows[label] = {
+            'requests': len(group),
+            'errors': sum(not ok for _, _, ok in group),
+            'rps': len(group) / elapsed,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+        }
+    return rows
+
+
+def print_results(title: str, rows: dict) -> None:
+    print(f'\n{title}')
+    print(
+        f'{"":<14}{"requests":>10}{"errors":>8}{"req/s":>10}'
+        f'{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}'
+    )
+    for label, row in rows.items():
+        print(
+            f'{label:<14}'
+            f'{row["requests"]:>10}'
+            f'{row["errors"]:>8}'
+            f'{row["rps"]:>10.1f}'
+            f'{row["p50"]:>10.2f}'
+            f'{row["p95"]:>10.2f}'
+            f'{row["p99"]:>10.2f}'
+        )
+
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    store = reset(args.products, args.customers, rng)
+    workloads = [
+        plan(store, args.sales, args.settle_rate, random.Random(rng.random()))
+        for _ in range(args.cashiers)
+    ]
+
+    results, lock = [], threading.Lock()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.cashiers) as executor:
+        futures = [
+            executor.submit(run_cashier, args.url, workload, results, lock)
+            for workload in workloads
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    rows = summarize(results, elapsed)
+    print_results(
+        f'Store day, {args.cashiers} cashiers x {args.sales} sales '
+        f'against {args.url} in {elapsed:.1f} s',
+        rows,
+    )
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(
+                {'commit': commit(), 'arguments': vars(args), 'results': rows},
+                file,
+                indent=4,
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--cashiers', type=int, default=8)
+    parser.add_argument('--sales', type=int, default=100)
+    parser.add_argument('--settle-rate', type=float, default=0.1)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--customers', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    setup()
+    main(args)
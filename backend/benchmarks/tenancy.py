@@ -0,0 +1,126 @@
+"""
+Queries spent resolving the business of the user, per request.
+
+Requests a set of read endpoints as an owner and as a member, counting
+queries with the former `hasattr` resolution, with the single-query
+resolution, with the resolution cached across requests and, on top of
+that, with a token carrying tenant claims (no user row is loaded).
+
+    python -m benchmarks.tenancy
+"""
+
+from . import setup, test_database
+
+
+ENDPOINTS = [
+    ('contacts', 'modules.contacts.views', 'ContactsEndpoint'),
+    ('products', 'modules.products.views', 'ProductEndpoint'),
+    ('receivables', 'modules.billing.views', 'ReceivablesEndpoint'),
+    ('products/categories', 'modules.products.views', 'ProductCategoryEndpoint'),
+]
+
+
+def legacy_resolution(user):
+    business = None
+    if hasattr(user, 'owner'):
+        business = getattr(user.owner, 'business')
+    elif hasattr(user, 'member'):
+        business = getattr(user.member, 'business')
+    return business
+
+
+def main() -> None:
+    import importlib
+
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext, override_settings
+
+    from modules.accounts.models import User, Owner
+    from modules.accounts.tokens import TenantTokenObtainPairSerializer
+    from modules.business.models import Business
+    from modules.members.models import Member
+
+    from shared import helpers, tenancy
+
+    with test_database():
+        business = Business.objects.create(
+            legal_name='Benchmark INC', trade_name='Benchmark', cnpj='0' * 14
+        )
+        owner = User.objects.create(
+            name='Owner', email='owner@depoc.com.br', is_staff=True
+        )
+        Owner.objects.create(user=owner, business=business)
+        member = User.objects.create(
+            name='Member', email='member@depoc.com.br', is_staff=True
+        )
+        Member.objects.create(
+            business=business,
+            credential=member,
+            name='Member',
+            phone='81999999999',
+            email='member@depoc.com.br',
+        )
+
+        factory = APIRequestFactory()
+        views = []
+        for path, module, name in ENDPOINTS:
+            endpoint = getattr(importlib.import_module(module), name)
+            endpoint.throttle_classes = []
+            views.append((path, endpoint.as_view()))
+
+        def plain_token(user):
+            return AccessToken.for_user(user)
+
+        def claims_token(user):
+            user = User.objects.get(pk=user.pk)
+            return TenantTokenObtainPairSerializer.get_token(user).access_token
+
+        def queries(user, path, view, token):
+            request = factory.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+            with CaptureQueriesContext(connection) as context:
+                response = view(request)
+            assert response.status_code == 200, response.data
+            return len(context.captured_queries)
+
+        modes = {
+            'hasattr': dict(
+                resolve=legacy_resolution, timeout=0, token=plain_token
+            ),
+            'one query': dict(
+                resolve=tenancy.resolve_business, timeout=0, token=plain_token
+            ),
+            'cached': dict(
+                resolve=tenancy.resolve_business, timeout=300, token=plain_token
+            ),
+            'claims': dict(
+                resolve=tenancy.resolve_business, timeout=300, token=claims_token
+            ),
+        }
+
+        print(f'\n{"":<28}' + ''.join(f'{mode:>12}' for mode in modes))
+        totals = dict.fromkeys(modes, 0)
+        for role, user in [('owner', owner), ('member', member)]:
+            for path, view in views:
+                counts = []
+                for mode, options in modes.items():
+                    helpers.resolve_business = options['resolve']
+                    cache.clear()
+                    token = options['token'](user)
+                    with override_settings(TENANCY_CACHE_TIMEOUT=options['timeout']):
+                        queries(user, path, view, token)
+                        count = queries(user, path, view, token)
+                    totals[mode] += count
+                    counts.append(count)
+                print(f'{role + " " + path:<28}' + ''.join(f'{n:>12}' for n in counts))
+        print(f'{"total":<28}' + ''.join(f'{total:>12}' for total in totals.values()))
+
+        helpers.resolve_business = tenancy.resolve_business
+
+
+if __name__ == '__main__':
+    setup()
+    main()
@@ -0,0 +1,70 @@
+"""
+JWT authentication without loading the user on read requests.
+
+Safe requests (GET, HEAD, OPTIONS) carrying a token with tenant claims
+(see `tokens`) are authenticated as a `TenantUser` built from the
+claims. The only lookup is the user's current token version, which is
+cached. Other requests and older tokens load the `User` row as usual,
+and the version is checked against it when the token carries one.
+
+Classes:
+- TenantUser: Stateless user backed by the claims of a token.
+- TenantJWTAuthentication: Stateless on safe requests, stateful otherwise.
+- UserJWTAuthentication: Always loads the user, for endpoints that need it.
+"""
+
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import current_token_version
+
+
+class TenantUser(TokenUser):
+    """
+    A user known only by its token: `id`, `is_staff`, `role` and
+    `business_id`. It has no row to read relations such as `owner` from.
+    """
+
+    @property
+    def business_id(self) -> str | None:
+        return self.token.get('business_id')
+
+    def __str__(self) -> str:
+        return f'TenantUser {self.id}'
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    stateless_methods = permissions.SAFE_METHODS
+
+    def authenticate(self, request):
+        self.request = request
+        return super().authenticate(request)
+
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        token_version = validated_token.get('token_version', 0)
+
+        if (
+            self.request.method in self.stateless_methods
+            and 'business_id' in validated_token
+        ):
+            if token_version != current_token_version(user_id):
+                raise InvalidToken('Token has been revoked.')
+            return TenantUser(validated_token)
+
+        user = super().get_user(validated_token)
+        if (
+            'token_version' in validated_token
+            and token_version != user.token_version
+        ):
+            raise InvalidToken('Token has been revoked.')
+
+        return user
+
+
+class UserJWTAuthentication(TenantJWTAuthentication):
+    stateless_methods = ()
@@ -28,6 +28,10 @@ class User(AbstractUser):
         null=True,
     )
 
+    # Tokens carry the version they were issued at; bumping it revokes
+    # every token of the user (see `tokens`).
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+
     REQUIRED_FIELDS = ['email']
 
     def __str__(self) -> str:
@@ -1,12 +1,78 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
 import ulid
 
+from shared.tenancy import bump_tenancy_version
+
 from .models import User, Owner
+from .tokens import forget_token_version, revoke_tokens
 
 @receiver(pre_save, sender=User)
 @receiver(pre_save, sender=Owner)
 def generate_ulids(sender, instance, **kwargs):
     if not instance.id:
         instance.id = ulid.new().str
+
+
+@receiver(post_save, sender=Owner)
+@receiver(post_delete, sender=Owner)
+def retire_cached_tenancy(sender, instance, **kwargs):
+    bump_tenancy_version()
+
+
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, **kwargs):
+    """
+    Revokes the tokens of a user whose password, staff status or active
+    status changes.
+    """
+    if instance._state.adding:
+        return
+
+    previous = User.objects\
+        .filter(pk=instance.pk)\
+        .values('password', 'is_staff', 'is_active')\
+        .first()
+
+    if previous and any(
+        previous[field] != getattr(instance, field) for field in previous
+    ):
+        instance.token_version += 1
+        instance._token_revoked = True
+
+
+@receiver(post_save, sender=User)
+def forget_revoked_token_version(sender, instance, **kwargs):
+    if getattr(instance, '_token_revoked', False):
+        forget_token_version(instance.pk)
+        instance._token_revoked = False
+
+
+@receiver(pre_save, sender=Owner)
+def remember_previous_business(sender, instance, **kwargs):
+    instance._previous_business_id = None
+    if not instance._state.adding:
+        instance._previous_business_id = Owner.objects\
+            .filter(pk=instance.pk)\
+            .values_list('business_id', flat=True)\
+            .first()
+
+
+@receiver(post_save, sender=Owner)
+def revoke_new_owner_tokens(sender, instance, created, **kwargs):
+    """
+    Revokes the tokens of a new owner and of an owner who loses or
+    changes business, as they carry the business it had.
+    """
+    previous_business_id = getattr(instance, '_previous_business_id', None)
+
+    if created or (
+        previous_business_id and previous_business_id != instance.business_id
+    ):
+        revoke_tokens(instance.user_id)
+
+
+@receiver(post_delete, sender=Owner)
+def revoke_owner_tokens(sender, instance, **kwargs):
+    revoke_tokens(instance.user_id)
@@ -0,0 +1,158 @@
+from rest_framework.test import APIRequestFactory
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from modules.accounts.models import Owner
+from modules.accounts.tokens import TenantTokenObtainPairSerializer
+from modules.accounts.views import MeEndpoint
+from modules.business.models import Business
+from modules.business.views import BusinessEndpoint
+from modules.contacts.views import CustomerEndpoint
+from modules.members.models import Member
+
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from .factories import UserFactory
+
+
+class TenantJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.factory = APIRequestFactory()
+        self.user = UserFactory(is_staff=True)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        Owner.objects.create(user=self.user, business=self.business)
+        self.user.refresh_from_db()
+
+    def tokens(self, user):
+        refresh = TenantTokenObtainPairSerializer.get_token(user)
+        return refresh, refresh.access_token
+
+    def get(self, endpoint, token, path=''):
+        request = self.factory.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+        return endpoint.as_view()(request)
+
+    def test_token_claims(self):
+        _, access = self.tokens(self.user)
+        self.assertEqual(access['business_id'], self.business.id)
+        self.assertEqual(access['role'], 'owner')
+        self.assertTrue(access['is_staff'])
+        self.assertEqual(access['token_version'], self.user.token_version)
+
+    @override_settings(TOKEN_VERSION_CACHE_TIMEOUT=300)
+    def test_safe_request_does_not_load_the_user(self):
+        _, access = self.tokens(self.user)
+        self.get(CustomerEndpoint, access, 'contacts/customers')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(CustomerEndpoint, access, 'contacts/customers')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(
+            'accounts_user' in query['sql'] or 'accounts_owner' in query['sql']
+            for query in context.captured_queries
+        ))
+
+    def test_owner_moved_to_another_business_tokens_are_revoked(self):
+        _, access = self.tokens(self.user)
+        owner = Owner.objects.get(user=self.user)
+        owner.business = None
+        owner.save()
+
+        response = self.get(CustomerEndpoint, access, 'contacts/customers')
+        self.assertEqual(response.status_code, 401)
+
+    def test_tokens_issued_before_the_business_resolve_it(self):
+        user = UserFactory(is_staff=True)
+        owner = Owner.objects.create(user=user)
+        user.refresh_from_db()
+        _, access = self.tokens(user)
+        self.assertIsNone(access['business_id'])
+
+        owner.business = Business.objects.create(
+            legal_name='The Other Business INC',
+            trade_name='Other Business',
+            cnpj=43210987654321
+        )
+        owner.save()
+
+        response = self.get(CustomerEndpoint, access, 'contacts/customers')
+        self.assertEqual(response.status_code, 200)
+
+    def test_owner_permission_from_claims(self):
+        _, access = self.tokens(self.user)
+        response = self.get(BusinessEndpoint, access, 'business')
+        self.assertEqual(response.status_code, 200)
+
+        member = UserFactory(is_staff=True)
+        Member.objects.create(
+            business=self.business,
+            credential=member,
+            name='Member',
+            phone='81999999999',
+            email='member@depoc.com.br',
+        )
+        member.refresh_from_db()
+        _, access = self.tokens(member)
+        self.assertEqual(access['role'], 'member')
+        response = self.get(BusinessEndpoint, access, 'business')
+        self.assertEqual(response.status_code, 403)
+
+    def test_endpoints_that_need_the_user_load_it(self):
+        _, access = self.tokens(self.user)
+        response = self.get(MeEndpoint, access, 'me')
+        self.assertEqual(response.status_code, 200)
+
+    def test_staff_change_revokes_tokens(self):
+        _, access = self.tokens(self.user)
+        self.get(CustomerEndpoint, access, 'contacts/customers')
+
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.get(CustomerEndpoint, access, 'contacts/customers')
+        self.assertEqual(response.status_code, 401)
+
+    def test_profile_change_keeps_tokens(self):
+        _, access = self.tokens(self.user)
+        self.user.name = 'Renamed'
+        self.user.save()
+
+        response = self.get(CustomerEndpoint, access, 'contacts/customers')
+        self.assertEqual(response.status_code, 200)
+
+    def test_removed_member_tokens_are_revoked(self):
+        member = UserFactory(is_staff=True)
+        membership = Member.objects.create(
+            business=self.business,
+            credential=member,
+            name='Member',
+            phone='81999999999',
+            email='member@depoc.com.br',
+        )
+        member.refresh_from_db()
+        _, access = self.tokens(member)
+        membership.delete()
+
+        response = self.get(CustomerEndpoint, access, 'contacts/customers')
+        self.assertEqual(response.status_code, 401)
+
+    def test_revoked_refresh_token_is_refused(self):
+        refresh, _ = self.tokens(self.user)
+        self.user.set_password('a new password')
+        self.user.save()
+
+        request = self.factory.post(
+            'token/refresh', {'refresh': str(refresh)}, format='json'
+        )
+        response = TokenRefreshView.as_view()(request)
+        self.assertEqual(response.status_code, 401)
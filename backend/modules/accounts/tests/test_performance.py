@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import ulid
+
+from modules.accounts.models import User
+from modules.accounts.views import AccountsEndpoint, MeEndpoint, OwnerEndpoint
+
+from shared.testing import PerformanceTestCase
+
+from .factories import UserFactory
+
+
+class AccountsPerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def seed_users(self, count):
+        User.objects.bulk_create(
+            (
+                User(
+                    id=(id := ulid.new().str),
+                    name=f'User {id}',
+                    username=id,
+                    email=f'{id.lower()}@depoc.com.br',
+                )
+                for _ in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def test_accounts(self):
+        self.assertWithinBudget(
+            'me',
+            self.seed_users,
+            self.request(MeEndpoint, 'me'),
+        )
+        self.assertWithinBudget(
+            'owner.detail',
+            self.seed_users,
+            self.request(OwnerEndpoint, 'owner'),
+        )
+
+        def new_user():
+            id = ulid.new().str
+            return {
+                'name': 'User',
+                'email': f'{id.lower()}@depoc.com.br',
+                'username': id,
+                'password': 'userspassword',
+            }
+
+        self.assertWithinBudget(
+            'accounts.create',
+            self.seed_users,
+            self.request(AccountsEndpoint, 'accounts', 'post', new_user),
+        )
@@ -0,0 +1,118 @@
+"""
+Tokens carrying the tenant and role of their user.
+
+Tokens issued by `/token` embed, besides the user id:
+- `business_id`: The business the user owns or works for, if any.
+- `role`: `owner`, `member` or None.
+- `is_staff`: Whether the user may use the admin endpoints.
+- `token_version`: `User.token_version` when the token was issued.
+
+The claims let read requests be authenticated without loading the user
+(see `authentication`) and resolve its business by primary key (see
+`shared.tenancy`). A token is only honoured while its version is the
+user's current one; bumping the version revokes every token of the
+user, which happens whenever its role or business changes. Current
+versions are read through the cache.
+
+Functions:
+- token_claims: Claims embedded in the tokens of a user.
+- current_token_version: The token version of a user, from the cache.
+- revoke_tokens: Revokes every token issued to a user.
+
+Classes:
+- TenantTokenObtainPairSerializer: Issues token pairs with the claims.
+- TenantTokenRefreshSerializer: Refuses refresh tokens that were revoked.
+"""
+
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from shared.tenancy import resolve_business
+
+from .models import User
+
+
+def version_key(user_id: str) -> str:
+    return f'auth:token-version:{user_id}'
+
+
+def token_claims(user: User) -> dict:
+    business = resolve_business(user)
+
+    if hasattr(user, 'owner'):
+        role = 'owner'
+    elif hasattr(user, 'member'):
+        role = 'member'
+    else:
+        role = None
+
+    return {
+        'business_id': business.id if business else None,
+        'role': role,
+        'is_staff': user.is_staff,
+        'token_version': user.token_version,
+    }
+
+
+def current_token_version(user_id: str) -> int | None:
+    """
+    The token version of the user, or None if there is no active user
+    with that id.
+    """
+    version = cache.get(version_key(user_id))
+    if version is not None:
+        return version
+
+    version = User.objects\
+        .filter(pk=user_id, is_active=True)\
+        .values_list('token_version', flat=True)\
+        .first()
+
+    timeout = settings.TOKEN_VERSION_CACHE_TIMEOUT
+    if version is not None and timeout:
+        cache.set(version_key(user_id), version, timeout)
+
+    return version
+
+
+def forget_token_version(user_id: str) -> None:
+    cache.delete(version_key(user_id))
+
+
+def revoke_tokens(user_id: str | None) -> None:
+    if not user_id:
+        return
+
+    User.objects\
+        .filter(pk=user_id)\
+        .update(token_version=F('token_version') + 1)
+    forget_token_version(user_id)
+
+
+class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user: User) -> RefreshToken:
+        token = super().get_token(user)
+        for claim, value in token_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class TenantTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+
+        if refresh.get('token_version', 0) != current_token_version(user_id):
+            raise InvalidToken('Token has been revoked.')
+
+        return super().validate(attrs)
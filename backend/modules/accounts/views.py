@@ -3,6 +3,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
 
+from .authentication import UserJWTAuthentication
 from .serializers import UserSerializer, OwnerSerializer
 
 from shared import (
@@ -15,6 +16,7 @@ from shared import (
 
 
 class MeEndpoint(APIView):
+    authentication_classes = [UserJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
 
@@ -104,6 +106,7 @@ class AccountsEndpoint(APIView):
 
 
 class OwnerEndpoint(APIView):
+    authentication_classes = [UserJWTAuthentication]
     permission_classes = [IsOwner]
     throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
 
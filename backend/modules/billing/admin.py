@@ -2,7 +2,8 @@ from django.contrib import admin
 from django.contrib.admin import register
 
 
-from .models import Payment
+from .models import Payment, PaymentSchedule
+from .services import create_payment
 
 
 @register(Payment)
@@ -20,3 +21,27 @@ class PaymentAdmin(admin.ModelAdmin):
     ]
 
     readonly_fields = ['amount_paid', 'outstanding_balance', 'status']
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            super().save_model(request, obj, form, change)
+        else:
+            create_payment(obj)
+
+
+@register(PaymentSchedule)
+class PaymentScheduleAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'recurrence',
+        'total_amount',
+        'starts_at',
+        'ends_at',
+        'materialized_until',
+        'is_active',
+        'payment_type',
+        'contact',
+        'business',
+    ]
+
+    readonly_fields = ['materialized_until']
@@ -0,0 +1,150 @@
+"""
+Aging of unpaid receivables and payables.
+
+The outstanding balance of every unpaid payment falls in a bucket by how
+many days it is past due: `current` (not due yet), `1-30`, `31-60`,
+`61-90` and `90+`. The buckets are summed in one grouped query over
+`due_at` and `outstanding_balance`, which the partial
+`(business, payment_type, due_at)` index of unpaid payments serves.
+
+Reports are cached for AGING_CACHE_TIMEOUT seconds per business and
+payment type, under a version bumped whenever one of the payments of the
+business changes or is settled.
+
+Functions:
+- aging_report: The buckets of a business, optionally per contact.
+- forget_aging: Retires the cached reports of a business.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from shared.cache import bump_version, current_version
+
+
+# Written as the condition of the partial index that serves it.
+UNPAID = ~Q(status='paid')
+
+# Bucket name, then the least and most days past due it holds.
+BUCKETS = [
+    ('current', None, 0),
+    ('1-30', 1, 30),
+    ('31-60', 31, 60),
+    ('61-90', 61, 90),
+    ('90+', 91, None),
+]
+
+
+def version_key(business_id: str) -> str:
+    return f'billing:aging:{business_id}:version'
+
+
+def bucket_filter(today: date, least: int | None, most: int | None) -> Q:
+    """
+    Payments between `least` and `most` days past due on `today`.
+    """
+    query = Q()
+    if least is not None:
+        query &= Q(due_at__lte=today - timedelta(days=least))
+    if most is not None:
+        query &= Q(due_at__gte=today - timedelta(days=most))
+    return query
+
+
+def bucket_sums(today: date) -> dict:
+    return {
+        name: Sum(
+            'outstanding_balance',
+            filter=bucket_filter(today, least, most),
+            default=Decimal('0'),
+        )
+        for name, least, most in BUCKETS
+    }
+
+
+def totals_of(row: dict) -> dict:
+    totals = {name: row[name] for name, _, _ in BUCKETS}
+    totals['total'] = sum(totals.values(), Decimal('0'))
+    totals['count'] = row['count']
+    return totals
+
+
+def aging_report(
+        business,
+        payment_type: str,
+        by_contact: bool = False,
+        today: date | None = None,
+    ) -> dict:
+    """
+    The outstanding balance of the unpaid receivables or payables of
+    `business` per bucket, with the number of payments. With
+    `by_contact`, also per contact, largest balance first; the business
+    totals are then added up from the contact rows of the same query.
+    """
+    today = today or timezone.localdate()
+    version = current_version(version_key(business.id))
+    key = (
+        f'billing:aging:{business.id}:{payment_type}:'
+        f'{int(by_contact)}:{today}:{version}'
+    )
+
+    report = cache.get(key)
+    if report is not None:
+        return report
+
+    payments = business.payments.filter(UNPAID, payment_type=payment_type)
+
+    if by_contact:
+        rows = payments\
+            .order_by()\
+            .values('contact_id')\
+            .annotate(
+                name=Coalesce(
+                    'contact__customer__name',
+                    'contact__supplier__trade_name',
+                    'contact__supplier__legal_name',
+                    output_field=CharField(),
+                ),
+                count=Count('id'),
+                **bucket_sums(today),
+            )
+
+        contacts = [
+            {'id': row['contact_id'], 'name': row['name'], **totals_of(row)}
+            for row in rows
+        ]
+        contacts.sort(key=lambda contact: (-contact['total'], contact['id']))
+
+        total = {name: Decimal('0') for name, _, _ in BUCKETS}
+        total['count'] = 0
+        for contact in contacts:
+            for name in [*total]:
+                total[name] += contact[name]
+        total = totals_of(total)
+    else:
+        contacts = None
+        total = totals_of(
+            payments.aggregate(count=Count('id'), **bucket_sums(today))
+        )
+
+    report = {
+        'date': today,
+        'buckets': [name for name, _, _ in BUCKETS],
+        'total': total,
+    }
+    if contacts is not None:
+        report['contacts'] = contacts
+
+    cache.set(key, report, settings.AGING_CACHE_TIMEOUT)
+    return report
+
+
+def forget_aging(business_id: str | None) -> None:
+    if business_id:
+        bump_version(version_key(business_id))
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0002_initial'),
+        ('business', '0001_initial'),
+        ('contacts', '0001_initial'),
+        ('finance', '0002_alter_financialtransaction_amount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentSchedule',
+            fields=[
+                ('id', models.CharField(editable=False, max_length=26, primary_key=True, serialize=False, unique=True)),
+                ('payment_type', models.CharField(choices=[('payable', 'Payable'), ('receivable', 'Receivable')], max_length=150)),
+                ('recurrence', models.CharField(choices=[('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=150)),
+                ('due_weekday', models.CharField(blank=True, choices=[('monday', 'Monday'), ('tuesday', 'Tuesday'), ('wednesday', 'Wednesday'), ('thursday', 'Thursday'), ('friday', 'Friday'), ('saturday', 'Saturday'), ('sunday', 'Sunday')], max_length=150, null=True)),
+                ('issued_at', models.DateField()),
+                ('starts_at', models.DateField()),
+                ('ends_at', models.DateField(blank=True, null=True)),
+                ('materialized_until', models.DateField()),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('payment_method', models.CharField(blank=True, max_length=150, null=True)),
+                ('reference', models.CharField(blank=True, max_length=255, null=True)),
+                ('notes', models.TextField(blank=True, max_length=500)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='payment_schedules', to='business.business')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='payment_schedules', to='finance.financialcategory')),
+                ('contact', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='payment_schedules', to='contacts.contact')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='schedule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payments', to='billing.paymentschedule'),
+        ),
+        migrations.AddConstraint(
+            model_name='payment',
+            constraint=models.UniqueConstraint(fields=('schedule', 'due_at'), name='unique_payment_schedule_occurrence'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+from shared.search import normalize, create_trigram_index
+
+
+def backfill_search_documents(apps, schema_editor):
+    names = [
+        'contact__customer__name',
+        'contact__customer__alias',
+        'contact__supplier__legal_name',
+        'contact__supplier__trade_name',
+    ]
+
+    for model_name in ('Payment', 'PaymentSchedule'):
+        model = apps.get_model('billing', model_name)
+        rows = model.objects.values_list('id', 'reference', 'notes', *names)
+
+        batch = []
+        for id, reference, notes, *contact in rows.iterator(chunk_size=1000):
+            document = normalize(*contact, reference, notes)
+            batch.append(model(id=id, search_document=document))
+            if len(batch) == 1000:
+                model.objects.bulk_update(batch, ['search_document'])
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, ['search_document'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0003_payment_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='paymentschedule',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(
+            backfill_search_documents,
+            migrations.RunPython.noop,
+        ),
+        create_trigram_index('billing_payment', 'search_document'),
+    ]
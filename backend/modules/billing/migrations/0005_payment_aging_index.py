@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0004_search_document'),
+        ('business', '0001_initial'),
+        ('contacts', '0002_search_document'),
+        ('finance', '0004_daily_financial_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['business', 'payment_type', 'status', 'due_at'], include=('contact', 'outstanding_balance'), name='payment_aging_idx'),
+        ),
+    ]
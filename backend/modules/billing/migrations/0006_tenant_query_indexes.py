@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0005_payment_aging_index'),
+        ('business', '0001_initial'),
+        ('contacts', '0002_search_document'),
+        ('finance', '0004_daily_financial_rollup'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='payment_aging_idx',
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='notes',
+            field=models.TextField(max_length=500),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['business', 'payment_type', 'due_at', 'id'], name='payment_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status', 'paid'), _negated=True), fields=['business', 'payment_type', 'due_at'], include=('contact', 'outstanding_balance'), name='payment_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status__in', ['paid', 'overdue']), _negated=True), fields=['due_at'], name='payment_overdue_sweep_idx'),
+        ),
+    ]
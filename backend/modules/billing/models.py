@@ -2,6 +2,10 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 
+from datetime import date
+
+from .recurrence import weekly_dates, monthly_dates
+
 
 class Payment(models.Model):
     PAYMENT_STATUS = [
@@ -62,6 +66,14 @@ class Payment(models.Model):
         null=True,
     )
 
+    schedule = models.ForeignKey(
+        'billing.PaymentSchedule',
+        on_delete=models.SET_NULL,
+        related_name='payments',
+        blank=True,
+        null=True,
+    )
+
     issued_at = models.DateField()
     due_at = models.DateField()
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -97,9 +109,40 @@ class Payment(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(31)],
     )
     reference = models.CharField(max_length=255, blank=True, null=True, db_index=True)
-    notes = models.TextField(max_length=500, db_index=True)
+    notes = models.TextField(max_length=500)
+    search_document = models.TextField(blank=True, default='', editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['schedule', 'due_at'],
+                name='unique_payment_schedule_occurrence',
+            ),
+        ]
+        indexes = [
+            # Receivables or payables of a business in due date order,
+            # as listed by their endpoints.
+            models.Index(
+                fields=['business', 'payment_type', 'due_at', 'id'],
+                name='payment_due_idx',
+            ),
+            # Unpaid ones only, for the aging report and the cash flow;
+            # the included columns spare them a read of the table.
+            models.Index(
+                fields=['business', 'payment_type', 'due_at'],
+                include=['contact', 'outstanding_balance'],
+                condition=~models.Q(status='paid'),
+                name='payment_open_due_idx',
+            ),
+            # Candidates of the nightly overdue sweep, across businesses.
+            models.Index(
+                fields=['due_at'],
+                condition=~models.Q(status__in=['paid', 'overdue']),
+                name='payment_overdue_sweep_idx',
+            ),
+        ]
+
 
     def clean(self):
         if self.recurrence == 'installments':
@@ -128,3 +171,117 @@ class Payment(models.Model):
 
     def __str__(self):
         return f'ID: {self.id}'
+
+
+class PaymentSchedule(models.Model):
+    """
+    A weekly or monthly recurrence stored once. Its occurrences become
+    `Payment` rows only as they enter the materialization horizon; the
+    ones beyond it can be projected on demand without touching the
+    database.
+    """
+
+    RECURRENCE_OPTIONS = [
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+    ]
+
+    id = models.CharField(
+        max_length=26,
+        primary_key=True,
+        unique=True,
+        editable=False,
+    )
+
+    contact = models.ForeignKey(
+        'contacts.Contact',
+        on_delete=models.PROTECT,
+        related_name='payment_schedules',
+    )
+
+    category = models.ForeignKey(
+        'finance.FinancialCategory',
+        on_delete=models.DO_NOTHING,
+        related_name='payment_schedules',
+        blank=True,
+        null=True,
+    )
+
+    business = models.ForeignKey(
+        'business.Business',
+        on_delete=models.CASCADE,
+        related_name='payment_schedules',
+        blank=True,
+        null=True,
+    )
+
+    payment_type = models.CharField(max_length=150, choices=Payment.PAYMENT_TYPE)
+    recurrence = models.CharField(max_length=150, choices=RECURRENCE_OPTIONS)
+    due_weekday = models.CharField(
+        max_length=150,
+        blank=True,
+        null=True,
+        choices=Payment.WEEKDAYS,
+    )
+    issued_at = models.DateField()
+    starts_at = models.DateField()
+    ends_at = models.DateField(blank=True, null=True)
+    materialized_until = models.DateField()
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    payment_method = models.CharField(max_length=150, blank=True, null=True)
+    reference = models.CharField(max_length=255, blank=True, null=True)
+    notes = models.TextField(max_length=500, blank=True)
+    search_document = models.TextField(blank=True, default='', editable=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+    def due_dates(self, after: date, until: date) -> list[date]:
+        """
+        The due dates of the occurrences falling in `(after, until]`,
+        never going past `ends_at`. The occurrence on `starts_at` belongs
+        to the payment the schedule was created from and is left out.
+        """
+        if self.ends_at:
+            until = min(until, self.ends_at)
+
+        if self.recurrence == 'weekly':
+            return weekly_dates(self.starts_at, self.due_weekday, after, until)
+
+        return monthly_dates(self.starts_at, after, until)
+
+
+    def occurrence(self, due_at: date) -> Payment:
+        """
+        An unsaved payment for the occurrence due on `due_at`.
+        """
+        return Payment(
+            id=None,
+            schedule=self,
+            contact=self.contact,
+            category=self.category,
+            business=self.business,
+            issued_at=self.issued_at,
+            due_at=due_at,
+            total_amount=self.total_amount,
+            outstanding_balance=self.total_amount,
+            payment_type=self.payment_type,
+            payment_method=self.payment_method,
+            reference=self.reference,
+            notes=self.notes,
+            search_document=self.search_document,
+        )
+
+
+    def occurrences(self, after: date, until: date) -> list[Payment]:
+        """
+        Unsaved payments for the occurrences in `(after, until]`.
+        """
+        return [
+            self.occurrence(due_at) for due_at in self.due_dates(after, until)
+        ]
+
+
+    def __str__(self):
+        return f'ID: {self.id}'
@@ -0,0 +1,91 @@
+"""
+Listings of payments with the occurrences still to be materialized.
+
+Recurring payments are materialized only up to a horizon (see
+`tasks.materialize_payment_schedules`). A listing over a later period
+merges the payments of the database with the occurrences their
+`PaymentSchedule` will create, in the order of the payments: due date,
+after the search rank when searching.
+
+The merge serves one page at a time. Only the due dates of the
+occurrences are computed for the whole period; the payments are read
+with a LIMIT up to the end of the requested page, and payments are only
+built for the occurrences that land on it.
+
+Classes:
+- ProjectedPayments: Payments and projected occurrences, for `paginate`.
+"""
+
+from django.db.models import QuerySet
+
+from datetime import date, datetime, timedelta
+from heapq import merge
+from itertools import islice
+
+from shared import apply_query_plan
+
+from .models import Payment
+from .serializers import PaymentSerializer
+
+
+def as_date(value) -> date:
+    # Periods come either as `YYYY-MM-DD` strings or as datetimes.
+    return datetime.fromisoformat(str(value)[:10]).date()
+
+
+class ProjectedPayments:
+    """
+    `payments`, ordered by due date and id (by `search_rank` first when
+    searched), merged with the occurrences of `schedules` due between
+    `start` and `end` beyond their materialization horizon. Projected
+    payments are not saved, have no `id` and come before the payments
+    due on the same day.
+
+    It counts and slices like a queryset, which is all the paginator
+    needs.
+    """
+
+    def __init__(self, payments: QuerySet, schedules: QuerySet, start, end):
+        start, end = as_date(start), as_date(end)
+
+        self.payments = apply_query_plan(payments, PaymentSerializer)
+
+        schedules = schedules\
+            .filter(materialized_until__lt=end)\
+            .select_related('category', 'contact__customer', 'contact__supplier')
+
+        self.occurrences = sorted(
+            (
+                ((getattr(schedule, 'search_rank', 0), due_at, ''), schedule)
+                for schedule in schedules
+                for due_at in schedule.due_dates(
+                    max(schedule.materialized_until, start - timedelta(days=1)),
+                    end,
+                )
+            ),
+            key=lambda occurrence: occurrence[0],
+        )
+
+    def count(self) -> int:
+        return self.payments.count() + len(self.occurrences)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, page: slice) -> list[Payment]:
+        start, stop = page.start or 0, page.stop
+
+        payments = (
+            ((getattr(payment, 'search_rank', 0), payment.due_at, payment.id), payment)
+            for payment in self.payments[:stop]
+        )
+        rows = merge(
+            payments,
+            self.occurrences[:stop],
+            key=lambda row: row[0],
+        )
+
+        return [
+            row if isinstance(row, Payment) else row.occurrence(key[1])
+            for key, row in islice(rows, start, stop)
+        ]
@@ -0,0 +1,96 @@
+"""
+Due dates of recurring payments, computed arithmetically.
+
+Every generator works out how many occurrences fit in the requested
+window up front and builds the dates from their index, instead of
+walking the calendar day by day or month by month.
+
+Functions:
+- weekly_dates: Occurrences of a weekday, one week apart.
+- monthly_dates: Occurrences on a day of the month, clamped to its end.
+- installment_dates: Due dates of a fixed number of monthly installments.
+- months_between: Whole calendar months from one date to another.
+"""
+
+from datetime import date, timedelta
+
+import calendar
+
+
+WEEKDAYS = [
+    'monday',
+    'tuesday',
+    'wednesday',
+    'thursday',
+    'friday',
+    'saturday',
+    'sunday',
+]
+
+
+def months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+def add_months(start: date, months: int, day: int | None = None) -> date:
+    """
+    The date `months` after `start`, on `day` (by default the day of
+    `start`) or on the last day of the month when it is shorter.
+    """
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    last_day = calendar.monthrange(year, month + 1)[1]
+    return date(year, month + 1, min(day or start.day, last_day))
+
+
+def weekly_dates(
+        start: date,
+        weekday: str,
+        after: date,
+        until: date,
+    ) -> list[date]:
+    """
+    Dates in `(after, until]` falling on `weekday`, counted from the
+    first one on or after `start`. That first one is occurrence 0 and
+    is left out, as it belongs to the payment the recurrence came from.
+    """
+    first = start + timedelta(days=(WEEKDAYS.index(weekday) - start.weekday()) % 7)
+
+    lower = max(1, (after - first).days // 7 + 1)
+    upper = (until - first).days // 7
+
+    return [first + timedelta(weeks=n) for n in range(lower, upper + 1)]
+
+
+def monthly_dates(
+        start: date,
+        after: date,
+        until: date,
+        day: int | None = None,
+    ) -> list[date]:
+    """
+    Dates in `(after, until]` one month apart from `start`, on `day` of
+    the month (by default the day of `start`), clamped to the last day
+    of shorter months. `start` itself is occurrence 0 and is left out.
+    """
+    lower = max(1, months_between(start, after))
+    upper = months_between(start, until)
+
+    dates = [add_months(start, n, day) for n in range(lower, upper + 1)]
+
+    return [due_at for due_at in dates if after < due_at <= until]
+
+
+def installment_dates(
+        first_due: date,
+        installments: int,
+        day: int | None = None,
+    ) -> list[date]:
+    """
+    Due dates of installments 2 to `installments`, one month apart from
+    `first_due` on `day` of the month, clamped as in `monthly_dates`.
+    """
+    start = first_due.replace(day=1)
+    day = day or first_due.day
+
+    return [add_months(start, n, day) for n in range(1, installments)]
@@ -0,0 +1,77 @@
+"""
+Search documents of receivables and payables.
+
+The document of a payment holds the names of its contact, its reference
+and its notes, normalized by `shared.search.normalize`. It is written
+with the payment and rewritten when the contact is renamed, so searching
+never joins the contact tables.
+
+Functions:
+- contact_terms: Normalized names of a contact.
+- search_document: Builds the document of a payment or schedule.
+- refresh_search_documents: Rewrites the documents of a contact's payments.
+- search_payments: Payments matching a search term, best matches first.
+"""
+
+from django.db.models import QuerySet
+
+from modules.contacts.models import Contact
+
+from shared.search import normalize, search
+
+from .models import Payment, PaymentSchedule
+
+
+CONTACT_NAMES = [
+    'customer__name',
+    'customer__alias',
+    'supplier__legal_name',
+    'supplier__trade_name',
+]
+
+BATCH_SIZE = 1000
+
+
+def contact_terms(contact_id: str) -> str:
+    names = Contact.objects\
+        .filter(pk=contact_id)\
+        .values_list(*CONTACT_NAMES)\
+        .first()
+    return normalize(*(names or ()))
+
+
+def search_document(contact: str, reference: str | None, notes: str | None) -> str:
+    return normalize(contact, reference, notes)
+
+
+def refresh_search_documents(contact_id: str) -> int:
+    """
+    Rewrites the documents of the payments and schedules of a contact,
+    BATCH_SIZE rows per UPDATE. Returns the number of rows rewritten.
+    """
+    terms = contact_terms(contact_id)
+    refreshed = 0
+
+    for model in (Payment, PaymentSchedule):
+        rows = model.objects\
+            .filter(contact_id=contact_id)\
+            .only('id', 'reference', 'notes')
+
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            row.search_document = search_document(terms, row.reference, row.notes)
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, ['search_document'])
+                refreshed += len(batch)
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, ['search_document'])
+            refreshed += len(batch)
+
+    return refreshed
+
+
+def search_payments(payments: QuerySet, term: str) -> QuerySet:
+    return search(payments, 'search_document', term)
@@ -1,13 +1,28 @@
 from rest_framework import serializers
 
 from .models import Payment
+from .services import create_payment, end_schedule
 
 
 class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payment
         fields = '__all__'
-        read_only_fields = ['outstanding_balance']
+        read_only_fields = ['outstanding_balance', 'schedule']
+        select_related = ['category', 'contact__customer', 'contact__supplier']
+
+
+    def create(self, validated_data):
+        return create_payment(Payment(**validated_data))
+
+
+    def update(self, instance, validated_data):
+        # A new recurrence replaces the schedule the payment started.
+        recurrence = validated_data.get('recurrence')
+        if recurrence and instance.schedule_id:
+            if recurrence != instance.schedule.recurrence:
+                end_schedule(instance)
+        return super().update(instance, validated_data)
 
 
     def to_representation(self, instance):
@@ -15,6 +30,7 @@ class PaymentSerializer(serializers.ModelSerializer):
         return {
             'payment': {
                 'id': instance.id,
+                'schedule': instance.schedule_id,
                 'contact': str(instance.contact),
                 'category': str(instance.category),
                 'issued_at': representation.pop('issued_at'),
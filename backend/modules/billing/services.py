@@ -0,0 +1,353 @@
+"""
+Creation and settlement of receivables and payables.
+
+A payment with a recurrence expands into several rows. All of them are
+written here in one transaction: one INSERT for the payment itself and
+one bulk INSERT for its installments or scheduled occurrences. No model
+signal saves the payment a second time.
+
+Settlements are applied as deltas: every change to the transactions of
+a payment moves its `amount_paid`, `outstanding_balance`, `status` and
+`paid_at` with conditional UPDATEs, without re-aggregating the ledger.
+
+Functions:
+- create_payment: Saves a new payment and expands its recurrence.
+- create_installment: Builds the unsaved payment of one installment.
+- end_schedule: Stops the schedule a payment was created with.
+- apply_settlement_deltas: Adds settled amounts to payments.
+- settle_payments: Settles many payments of a business in one pass.
+"""
+
+from rest_framework import serializers
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+import ulid
+
+from modules.finance.models import FinancialTransaction
+from modules.finance.rollups import apply_rollup_deltas, rollup_deltas
+from modules.finance.services import apply_balance_deltas
+
+from .aging import forget_aging
+from .models import Payment, PaymentSchedule
+from .recurrence import installment_dates
+from .search import contact_terms, search_document
+from .tasks import horizon
+
+
+MAX_SETTLEMENTS = 1000
+SETTLEMENT_CHUNK_SIZE = 500
+
+# Settled amounts must fit the amounts of the payments they add up in.
+SETTLEMENT_AMOUNT = serializers.DecimalField(
+    max_digits=Payment._meta.get_field('amount_paid').max_digits,
+    decimal_places=Payment._meta.get_field('amount_paid').decimal_places,
+)
+
+
+def create_installment(
+        payment: Payment,
+        due_at: date,
+        count: int,
+        installments: int,
+        contact: str = '',
+    ) -> Payment:
+    notes = f'{payment.notes} | instalment [{count} of {installments}]'
+
+    return Payment(
+        id=ulid.new().str,
+        contact=payment.contact,
+        category=payment.category,
+        business=payment.business,
+        issued_at=payment.issued_at,
+        due_at=due_at,
+        total_amount=payment.total_amount,
+        outstanding_balance=payment.total_amount,
+        status='pending',
+        paid_at=None,
+        payment_method=payment.payment_method,
+        reference=payment.reference,
+        notes=notes,
+        search_document=search_document(contact, payment.reference, notes),
+        recurrence='once',
+        installment_count=0,
+        payment_type=payment.payment_type,
+    )
+
+
+def schedule_for(payment: Payment, contact: str = '') -> PaymentSchedule:
+    """
+    The schedule of a weekly or monthly `payment`, already materialized
+    up to the horizon.
+    """
+    materialized_until = max(payment.due_at, horizon())
+    ends_at = date(payment.due_at.year, 12, 31)
+
+    return PaymentSchedule(
+        id=ulid.new().str,
+        contact=payment.contact,
+        category=payment.category,
+        business=payment.business,
+        payment_type=payment.payment_type,
+        recurrence=payment.recurrence,
+        due_weekday=payment.due_weekday,
+        issued_at=payment.issued_at,
+        starts_at=payment.due_at,
+        ends_at=ends_at,
+        materialized_until=materialized_until,
+        is_active=materialized_until < ends_at,
+        total_amount=payment.total_amount,
+        payment_method=payment.payment_method,
+        reference=payment.reference,
+        notes=payment.notes,
+        search_document=search_document(
+            contact,
+            payment.reference,
+            payment.notes,
+        ),
+    )
+
+
+def create_payment(payment: Payment) -> Payment:
+    """
+    Saves the unsaved `payment` and the rows its recurrence expands to.
+
+    Installments become payments of their own right away. Weekly and
+    monthly payments get a `PaymentSchedule` whose occurrences are
+    created up to the materialization horizon.
+    """
+    payment.outstanding_balance = payment.total_amount
+    contact = contact_terms(payment.contact_id)
+    children = []
+
+    with transaction.atomic():
+        if payment.recurrence == 'installments':
+            installments = payment.installment_count
+            due_dates = installment_dates(
+                payment.due_at,
+                installments,
+                payment.due_day_of_month,
+            )
+            children = [
+                create_installment(payment, due_at, count, installments, contact)
+                for count, due_at in enumerate(due_dates, start=2)
+            ]
+            payment.notes = f'{payment.notes} | instalment [1 of {installments}]'
+            payment.installment_count = 0
+            payment.recurrence = 'once'
+
+        elif payment.recurrence in ('weekly', 'monthly'):
+            schedule = schedule_for(payment, contact)
+            schedule.save(force_insert=True)
+            children = schedule.occurrences(
+                schedule.starts_at,
+                schedule.materialized_until,
+            )
+            for child in children:
+                child.id = ulid.new().str
+
+            payment.schedule = schedule
+            payment.recurrence = 'once'
+
+        payment.search_document = search_document(
+            contact,
+            payment.reference,
+            payment.notes,
+        )
+        payment.save(force_insert=True)
+
+        if children:
+            Payment.objects.bulk_create(children)
+
+    return payment
+
+
+def end_schedule(payment: Payment) -> bool:
+    """
+    Stops the schedule `payment` started, if it is the payment the
+    schedule was created from, so no more occurrences are materialized
+    or projected. Occurrences already created are kept. Returns whether
+    a schedule was stopped.
+    """
+    if not payment.schedule_id:
+        return False
+
+    return bool(
+        PaymentSchedule.objects\
+            .filter(
+                pk=payment.schedule_id,
+                starts_at=payment.due_at,
+                is_active=True,
+            )\
+            .update(
+                is_active=False,
+                ends_at=F('materialized_until'),
+                updated_at=timezone.now(),
+            )
+    )
+
+
+def apply_settlement_deltas(deltas: dict[str, Decimal], paid_at: date) -> None:
+    """
+    Adds each ledger delta to the amount paid of its payment.
+
+    Receivables are settled by credits and payables by debits, so the
+    delta of a payable counts with its sign flipped. The amounts are
+    added with `F('amount_paid') + delta`, and the balance, status and
+    `paid_at` are then derived from the new amount while the rows are
+    still locked, so concurrent settlements of one payment add up. A
+    fully paid payment takes `paid_at`; the others have none.
+
+    Payments are updated SETTLEMENT_CHUNK_SIZE at a time; each chunk
+    takes two UPDATEs whatever its size. The first adds the deltas; the
+    second reads the amounts it wrote, which spares repeating the CASE
+    of every delta in each derived column of a single UPDATE.
+    """
+    payment_ids = [
+        payment_id for payment_id in sorted(filter(None, deltas))
+        if deltas[payment_id]
+    ]
+    if not payment_ids:
+        return
+
+    amount_paid = Payment._meta.get_field('amount_paid')
+
+    with transaction.atomic():
+        for start in range(0, len(payment_ids), SETTLEMENT_CHUNK_SIZE):
+            chunk = payment_ids[start:start + SETTLEMENT_CHUNK_SIZE]
+            payments = Payment.objects.filter(pk__in=chunk)
+
+            delta = Case(
+                *[When(pk=pk, then=Value(deltas[pk])) for pk in chunk],
+                output_field=amount_paid,
+            )
+            payments.update(
+                amount_paid=F('amount_paid') + Case(
+                    When(payment_type='payable', then=-delta),
+                    default=delta,
+                ),
+            )
+
+            payments.update(
+                outstanding_balance=F('total_amount') - F('amount_paid'),
+                status=Case(
+                    When(amount_paid__lte=0, then=Value('pending')),
+                    When(
+                        amount_paid__lt=F('total_amount'),
+                        then=Value('partially_paid'),
+                    ),
+                    default=Value('paid'),
+                ),
+                paid_at=Case(
+                    When(amount_paid__gte=F('total_amount'), then=Value(paid_at)),
+                    default=None,
+                ),
+                updated_at=timezone.now(),
+            )
+
+
+def settlement_amount(value) -> tuple[Decimal | None, str | None]:
+    """
+    The absolute amount a settlement item asks for, or the error
+    explaining why it cannot be settled.
+    """
+    try:
+        amount = abs(SETTLEMENT_AMOUNT.run_validation(value))
+    except serializers.ValidationError as exception:
+        if exception.get_codes() == ['invalid']:
+            return None, 'Invalid monetary value format.'
+        return None, str(exception.detail[0])
+
+    if not amount:
+        return None, 'Invalid monetary value format.'
+
+    return amount, None
+
+
+def settle_payments(
+        business,
+        operator,
+        payment_type: str,
+        items: list[dict],
+    ) -> list[dict]:
+    """
+    Settles the receivables or payables of `business` listed in `items`,
+    each a dict with the `payment`, `account` and `amount` to settle.
+
+    Every item is validated up front against two queries (its payments
+    and its accounts). The valid ones are written in one transaction:
+    their transactions with a single bulk INSERT, then one UPDATE per
+    account and per payment with the summed amounts. Returns a result
+    for each item, in order, telling whether it was settled.
+    """
+    payment_ids = {item.get('payment') for item in items}
+    account_ids = {item.get('account') for item in items}
+
+    payments = business.payments\
+        .filter(payment_type=payment_type, id__in=payment_ids)\
+        .select_related('category', 'contact')
+    payments = {payment.id: payment for payment in payments}
+    accounts = business.financial_accounts\
+        .filter(id__in=account_ids)\
+        .in_bulk()
+
+    is_payable = payment_type == 'payable'
+    label = 'Payable' if is_payable else 'Receivable'
+
+    results, transactions = [], []
+    account_deltas, payment_deltas = defaultdict(Decimal), defaultdict(Decimal)
+
+    for index, item in enumerate(items):
+        payment = payments.get(item.get('payment'))
+        account = accounts.get(item.get('account'))
+        result = {'index': index, 'payment': item.get('payment')}
+        results.append(result)
+
+        amount, amount_error = settlement_amount(item.get('amount'))
+
+        if not payment:
+            result['error'] = f'{label} not found.'
+        elif not account:
+            result['error'] = 'Account not found.'
+        elif amount_error:
+            result['error'] = amount_error
+
+        if 'error' in result:
+            result['settled'] = False
+            continue
+
+        amount = -amount if is_payable else amount
+        entry = FinancialTransaction(
+            id=ulid.new().str,
+            business=business,
+            operator=operator,
+            account=account,
+            category=payment.category,
+            contact=payment.contact,
+            payment=payment,
+            amount=amount,
+            type='debit' if is_payable else 'credit',
+            description=f'{payment.notes} | Ref. {label} ID {payment.id}',
+        )
+        transactions.append(entry)
+        account_deltas[account.id] += amount
+        payment_deltas[payment.id] += amount
+
+        result['settled'] = True
+        result['transaction'] = entry.id
+
+    if transactions:
+        with transaction.atomic():
+            FinancialTransaction.objects.bulk_create(transactions)
+            apply_balance_deltas(account_deltas)
+            apply_rollup_deltas(rollup_deltas(transactions))
+            forget_aging(business.id)
+            apply_settlement_deltas(payment_deltas, timezone.localdate())
+
+    return results
@@ -1,255 +1,138 @@
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.db.models import Sum
+from django.utils import timezone
 
-from datetime import date, timedelta, datetime
-from dateutil.relativedelta import relativedelta, MO, TU, WE, TH, FR, SA, SU
+from collections import defaultdict
+from decimal import Decimal
 
 import ulid
 
+from modules.contacts.models import Customer, Supplier
 from modules.finance.models import FinancialTransaction
 
-from .models import Payment
-
-
-def count_weekdays(start_date: date, weekday: str):
-    weekdays = [
-        "monday",
-        "tuesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    ]
-
-    weekday_to_int = weekdays.index(weekday)
-    
-    end_date = date(start_date.year, 12, 31)
-    count = 0
-    while start_date <= end_date:
-        if start_date.weekday() == weekday_to_int:
-            count += 1
-        start_date += timedelta(days=1)
-    return count
-
-
-def count_months(due_date: date):
-    end_date = date(due_date.year, 12, 31)
-    count = 0
-    
-    while due_date <= end_date:
-        count += 1
-        due_date += relativedelta(months=1)
-
-    return count
-
-
-def create_installment(
-        payment: Payment,
-        due_date: date,
-        due_day: date | None = None,
-        due_weekday: date | None = None,
-        weeks: int | None = None,
-        months: int | None = None,
-        count: int | None = None,
-        installments: int | None = None,
-        is_weekly=False,
-        is_monthly=False,
-        is_installments=False,
-    ):
-
-    weekday_map = {
-        "monday": MO,
-        "tuesday": TU,
-        "wednesday": WE,
-        "thursday": TH,
-        "friday": FR,
-        "saturday": SA,
-        "sunday": SU,
-    }
-
-    notes = payment.notes
-
-    if is_installments:
-        notes = f'{payment.notes} | instalment [{count} of {installments}]'
-        next_due_date = due_date.replace(day=due_day) + relativedelta(months=months)
-    elif is_weekly:
-        next_weekday = due_date + relativedelta(weekday=weekday_map[due_weekday])
-        next_due_date = next_weekday + timedelta(weeks=weeks)
-    elif is_monthly:
-        next_due_date = due_date + relativedelta(months=months)
-
-    return Payment(
-        id = ulid.new().str,
-        contact=payment.contact,
-        category=payment.category,
-        business=payment.business,
-        issued_at=payment.issued_at,
-        due_at=next_due_date,
-        total_amount=payment.total_amount,
-        outstanding_balance=payment.total_amount,
-        status='pending',
-        paid_at=None,
-        payment_method=payment.payment_method,
-        reference=payment.reference,
-        notes=notes,
-        recurrence='once',
-        installment_count=0,
-        payment_type=payment.payment_type,
-    )
+from shared.search import normalize
+
+from .aging import forget_aging
+from .models import Payment, PaymentSchedule
+from .search import contact_terms, search_document, refresh_search_documents
+from .services import apply_settlement_deltas, end_schedule
+
 
+# Fields the search document of a payment is built from.
+SEARCHED_FIELDS = ['contact_id', 'reference', 'notes']
 
+
+@receiver(pre_save, sender=PaymentSchedule)
 @receiver(pre_save, sender=Payment)
 def generate_ulids(sender, instance, **kwargs):
     if not instance.id:
         instance.id = ulid.new().str
 
 
-@receiver(post_save, sender=Payment)
-def generate_installments(sender, instance, created, **kwargs):
-    recurrence = instance.recurrence
-    if created and recurrence == 'installments':
-        installment_count = instance.installment_count
-        due_day: date = instance.due_day_of_month
-        due_at: date = instance.due_at
-
-        count = 1
-        months = 0
-        installment_payments = []
-        for _ in range(1, installment_count):
-            count += 1
-            months += 1
-            installment_payments.append(
-                create_installment(
-                    payment=instance,
-                    due_date=due_at,
-                    due_day=due_day,
-                    months=months,
-                    count=count,
-                    installments=installment_count,
-                    is_installments=True,
-                )
-            )
-
-        if installment_payments:
-            Payment.objects.bulk_create(installment_payments)
-
-        note = f'{instance.notes} | instalment [{1} of {installment_count}]'
-        instance.notes = note
-        instance.installment_count = 0
-        instance.outstanding_balance = instance.total_amount
-        instance.recurrence = 'once'
-        instance.save()
+@receiver(pre_save, sender=PaymentSchedule)
+@receiver(pre_save, sender=Payment)
+def remember_previous_payment(sender, instance, **kwargs):
+    instance._previous_payment = None
+    if not instance._state.adding:
+        instance._previous_payment = sender.objects\
+            .filter(pk=instance.pk)\
+            .values(*SEARCHED_FIELDS, 'total_amount')\
+            .first()
 
 
-@receiver(post_save, sender=Payment)
-def generate_weekly_payments(sender, instance, created, **kwargs):
-    recurrence = instance.recurrence
-    if created and recurrence == 'weekly':
-        due_date = instance.due_at
-        due_weekday = instance.due_weekday
-
-        weekdays_left = count_weekdays(due_date, due_weekday)
-        weekly_payments = []
-        for week in range(1, weekdays_left):
-            weekly_payments.append(
-                create_installment(
-                    payment=instance,
-                    due_date=due_date,
-                    due_weekday=due_weekday,
-                    weeks=week,
-                    is_weekly=True,
-                )
-            )
-
-        if weekly_payments:
-            Payment.objects.bulk_create(weekly_payments)
-
-        instance.recurrence = 'once'
-        instance.save()
+@receiver(pre_save, sender=PaymentSchedule)
+@receiver(pre_save, sender=Payment)
+def update_search_document(sender, instance, **kwargs):
+    previous_payment = getattr(instance, '_previous_payment', None)
 
+    # Payments created by `create_payment` come with their document.
+    if instance._state.adding and instance.search_document:
+        return
 
-@receiver(post_save, sender=Payment)
-def generate_monthly_payments(sender, instance, created, **kwargs):
-    recurrence = instance.recurrence
-    if created and recurrence == 'monthly':
-        due_date = instance.due_at
-        months_left = count_months(due_date)
-
-        monthly_payments = []
-        for month in range(1, months_left):
-            monthly_payments.append(
-                create_installment(
-                    payment=instance,
-                    due_date=due_date,
-                    months=month,
-                    is_monthly=True
-                )
-            )
-
-        if monthly_payments:
-            Payment.objects.bulk_create(monthly_payments)
-
-        instance.recurrence = 'once'
-        instance.save()
+    unchanged = previous_payment and all(
+        previous_payment[field] == getattr(instance, field)
+        for field in SEARCHED_FIELDS
+    )
+    if unchanged:
+        return
+
+    instance.search_document = search_document(
+        contact_terms(instance.contact_id),
+        instance.reference,
+        instance.notes,
+    )
+
+
+@receiver(pre_save, sender=Customer)
+@receiver(pre_save, sender=Supplier)
+def remember_previous_names(sender, instance, **kwargs):
+    instance._previous_names = None
+    if not instance._state.adding:
+        instance._previous_names = contact_terms(instance.pk)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Supplier)
+def refresh_payment_search_documents(sender, instance, created, **kwargs):
+    previous_names = getattr(instance, '_previous_names', None)
+    if created or previous_names is None:
+        return
+
+    if isinstance(instance, Customer):
+        names = normalize(instance.name, instance.alias)
+    else:
+        names = normalize(instance.legal_name, instance.trade_name)
+
+    if names != previous_names:
+        refresh_search_documents(instance.pk)
 
 
-@receiver(post_delete, sender=FinancialTransaction)
 @receiver(post_save, sender=FinancialTransaction)
-def update_payment_balance(sender, instance, **kwargs):
-    payment = instance.payment
-    if payment:
-        total_amount = payment.total_amount
+def settle_payment(sender, instance, **kwargs):
+    deltas = defaultdict(Decimal)
+
+    previous_entry = getattr(instance, '_previous_entry', None)
+    if previous_entry:
+        deltas[previous_entry['payment_id']] -= previous_entry['amount']
+
+    deltas[instance.payment_id] += Decimal(str(instance.amount))
+    apply_settlement_deltas(deltas, timezone.localdate(instance.timestamp))
 
-        total_amount_paid = FinancialTransaction.objects\
-            .filter(payment=payment)\
-            .aggregate((Sum('amount')))['amount__sum'] or 0
-        
-        payment.amount_paid = abs(total_amount_paid)
-        payment.outstanding_balance = total_amount - abs(total_amount_paid)
-        payment.save()
+
+@receiver(post_delete, sender=FinancialTransaction)
+def revert_payment_settlement(sender, instance, **kwargs):
+    apply_settlement_deltas(
+        {instance.payment_id: -Decimal(str(instance.amount))},
+        timezone.localdate(instance.timestamp),
+    )
 
 
 @receiver(post_save, sender=Payment)
-def update_outstanding_balance_on_creation(sender, instance, created, **kwargs):
-    if created:
-        instance.outstanding_balance = instance.total_amount
-        instance.save()
+@receiver(post_delete, sender=Payment)
+def forget_payment_aging(sender, instance, **kwargs):
+    forget_aging(instance.business_id)
+
+
+@receiver(post_delete, sender=Payment)
+def end_deleted_payment_schedule(sender, instance, **kwargs):
+    end_schedule(instance)
+
+
+@receiver(post_save, sender=FinancialTransaction)
+@receiver(post_delete, sender=FinancialTransaction)
+def forget_settlement_aging(sender, instance, **kwargs):
+    previous_entry = getattr(instance, '_previous_entry', None)
+    if instance.payment_id or (previous_entry and previous_entry['payment_id']):
+        forget_aging(instance.business_id)
 
 
 @receiver(pre_save, sender=Payment)
 def update_outstanding_balance_on_update(sender, instance, **kwargs):
-    try:
-        previous_payment = Payment.objects.get(id=instance.id)
-        current_payment = instance
-        is_payment_updated = (
-            previous_payment.total_amount != current_payment.total_amount
-        )
-        if is_payment_updated:
-            current_payment.outstanding_balance = current_payment.total_amount
-    except Exception:
-        pass
-        
+    if instance._state.adding:
+        instance.outstanding_balance = instance.total_amount
+        return
+
+    previous_payment = getattr(instance, '_previous_payment', None)
+    if previous_payment and previous_payment['total_amount'] != instance.total_amount:
+        instance.outstanding_balance = instance.total_amount
 
-@receiver(post_delete, sender=FinancialTransaction)
-@receiver(post_save, sender=FinancialTransaction)
-def update_payment_status(sender, instance, **kwargs):
-    payment = instance.payment
-    if payment:
-        total_amount = payment.total_amount
-        amount_paid = payment.amount_paid
-
-        if amount_paid == 0:
-            payment.status = 'pending'
-            payment.paid_at = None
-            payment.outstanding_balance = payment.total_amount
-        elif amount_paid != 0 and amount_paid < total_amount:
-            payment.status = 'partially_paid'
-            payment.paid_at = None
-        elif amount_paid >= total_amount:
-            payment.status = 'paid'
-            date = datetime.fromisoformat(str(instance.timestamp)).date()
-            payment.paid_at = date
-
-        payment.save()
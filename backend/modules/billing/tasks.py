@@ -1,17 +1,251 @@
-from celery import shared_task
+from celery import chord, current_app, shared_task, group
 
-from datetime import date
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
 
-from .models import Payment
+from datetime import date, timedelta
 
+import logging
+import time
+import ulid
 
-@shared_task
-def update_payment_status():
-    now = date.today()
-    payments = Payment.objects.all()
+from .aging import forget_aging
+from .models import Payment, PaymentSchedule
+
+
+logger = logging.getLogger(__name__)
+
+
+def overdue_candidates(today: date):
+    return Payment.objects\
+        .filter(due_at__lt=today)\
+        .exclude(status__in=['paid', 'overdue'])
+
+
+def mark_overdue_payments(
+        today: date | None = None,
+        business_ids: list[str] | None = None,
+        batch_size: int | None = None,
+    ) -> int:
+    """
+    Marks unpaid payments due before `today` as overdue with set-based
+    UPDATEs, optionally restricted to some businesses. A None among
+    `business_ids` stands for the payments without a business.
+
+    With `batch_size`, rows are updated in chunks of that many ids so a
+    large tenant never holds its locks for long. Rows that are already
+    overdue are left untouched, and no model signals are fired. Returns
+    the number of payments that changed.
+    """
+    today = today or timezone.localdate()
+
+    payments = overdue_candidates(today)
+
+    if business_ids is not None:
+        query = Q(business_id__in=[id for id in business_ids if id])
+        if None in business_ids:
+            query |= Q(business__isnull=True)
+        payments = payments.filter(query)
+
+    if not batch_size:
+        return payments.update(status='overdue', updated_at=timezone.now())
+
+    updated = 0
+    while True:
+        ids = list(payments.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return updated
+        updated += payments.filter(pk__in=ids).update(
+            status='overdue',
+            updated_at=timezone.now(),
+        )
+
+
+def horizon(today: date | None = None) -> date:
+    """
+    Last due date recurring payments are materialized up to.
+    """
+    today = today or timezone.localdate()
+    return today + timedelta(days=settings.BILLING_RECURRENCE_HORIZON_DAYS)
+
+
+def materialize_schedule(schedule: PaymentSchedule, until: date) -> int:
+    """
+    Creates the payments of `schedule` due after its `materialized_until`
+    and up to `until` with a single bulk insert, then moves the mark.
+
+    Occurrences that already exist are skipped, so running it twice over
+    the same window is harmless. Returns the number of new occurrences.
+    """
+    if until <= schedule.materialized_until:
+        return 0
+
+    payments = schedule.occurrences(schedule.materialized_until, until)
     for payment in payments:
-        if payment.status != 'paid':
-            if payment.due_at < now:
-                payment.status = 'overdue'
-            payment.save()
-    return 'Update payment task completed'
\ No newline at end of file
+        payment.id = ulid.new().str
+
+    # Skipped occurrences leave no row under the id given to them, which
+    # tells the inserted ones apart.
+    Payment.objects.bulk_create(payments, ignore_conflicts=True)
+    created = Payment.objects\
+        .filter(pk__in=[payment.id for payment in payments])\
+        .count() if payments else 0
+
+    # A bulk insert sends no signals, so the cached aging reports of the
+    # business are retired here.
+    if created:
+        forget_aging(schedule.business_id)
+
+    schedule.materialized_until = until
+    schedule.is_active = not schedule.ends_at or until < schedule.ends_at
+    PaymentSchedule.objects\
+        .filter(pk=schedule.pk)\
+        .update(
+            materialized_until=schedule.materialized_until,
+            is_active=schedule.is_active,
+            updated_at=timezone.now(),
+        )
+
+    return created
+
+
+def plan_overdue_shards(
+        counts: list[tuple[str, int]],
+        shard_rows: int,
+    ) -> list[list[str]]:
+    """
+    Groups `(business_id, candidates)` pairs into shards of roughly
+    `shard_rows` payments. A business above the limit gets a shard of
+    its own, so it cannot hold back the smaller ones.
+    """
+    shards, shard, rows = [], [], 0
+
+    for business_id, candidates in counts:
+        if shard and rows + candidates > shard_rows:
+            shards.append(shard)
+            shard, rows = [], 0
+        shard.append(business_id)
+        rows += candidates
+
+    if shard:
+        shards.append(shard)
+
+    return shards
+
+
+def chords_supported() -> bool:
+    """
+    Whether the result backend can join the shards in a chord, which the
+    rpc:// backend cannot.
+    """
+    try:
+        current_app.backend.ensure_chords_allowed()
+    except NotImplementedError:
+        return False
+    return True
+
+
+@shared_task
+def update_payment_status(business_id: str | None = None):
+    today = timezone.localdate()
+    candidates = overdue_candidates(today)
+
+    if business_id:
+        candidates = candidates.filter(business_id=business_id)
+
+    counts = candidates\
+        .values_list('business_id')\
+        .annotate(candidates=Count('pk'))\
+        .order_by('business_id')
+
+    shards = plan_overdue_shards(
+        list(counts),
+        settings.BILLING_OVERDUE_SHARD_ROWS,
+    )
+
+    if not shards:
+        return 'Update payment task completed: 0 payments overdue'
+
+    # Shards log their counts under the id of the run; a backend with
+    # chords also sums them up in `summarize_overdue_shards`.
+    run = ulid.new().str
+    queue = settings.BILLING_OVERDUE_QUEUE
+    header = group(
+        update_overdue_shard.s(shard, today.isoformat(), run).set(queue=queue)
+        for shard in shards
+    )
+
+    if chords_supported():
+        chord(header)(summarize_overdue_shards.s(run).set(queue=queue))
+    else:
+        header.apply_async()
+
+    return f'Update payment task dispatched: {len(shards)} shards'
+
+
+@shared_task
+def update_overdue_shard(
+        business_ids: list[str],
+        today: str,
+        run: str | None = None,
+    ) -> dict:
+    started = time.perf_counter()
+    updated = 0
+
+    for business_id in business_ids:
+        updated += mark_overdue_payments(
+            today=date.fromisoformat(today),
+            business_ids=[business_id],
+            batch_size=settings.BILLING_OVERDUE_BATCH_SIZE,
+        )
+
+    seconds = round(time.perf_counter() - started, 3)
+    logger.info(
+        'Overdue run %s, shard of %d businesses: %d payments in %.3fs',
+        run,
+        len(business_ids),
+        updated,
+        seconds,
+    )
+
+    return {
+        'businesses': len(business_ids),
+        'updated': updated,
+        'seconds': seconds,
+    }
+
+
+@shared_task
+def summarize_overdue_shards(results: list[dict], run: str | None = None) -> dict:
+    """
+    Chord callback adding up the counts of the shards of one run.
+    """
+    summary = {
+        'shards': len(results),
+        'businesses': sum(result['businesses'] for result in results),
+        'updated': sum(result['updated'] for result in results),
+        'seconds': round(sum(result['seconds'] for result in results), 3),
+    }
+    logger.info(
+        'Overdue run %s: %d payments in %d shards of %d businesses',
+        run,
+        summary['updated'],
+        summary['shards'],
+        summary['businesses'],
+    )
+    return summary
+
+
+@shared_task
+def materialize_payment_schedules():
+    until = horizon()
+    schedules = PaymentSchedule.objects\
+        .filter(is_active=True, materialized_until__lt=until)\
+        .select_related('contact', 'category', 'business')
+
+    created = 0
+    for schedule in schedules.iterator():
+        created += materialize_schedule(schedule, until)
+
+    return f'Materialize payment schedules completed: {created} payments created'
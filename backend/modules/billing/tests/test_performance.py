@@ -0,0 +1,203 @@
+from django.utils import timezone
+
+from datetime import timedelta
+from pathlib import Path
+
+import ulid
+
+from modules.billing.aging import forget_aging
+from modules.billing.models import Payment
+from modules.billing.views import (
+    CashFlowEndpoint,
+    PayableSearchEndpoint,
+    PayableSettleEndpoint,
+    PayablesEndpoint,
+    ReceivableAgingEndpoint,
+    ReceivableBulkSettleEndpoint,
+    ReceivableSearchEndpoint,
+    ReceivableSettleEndpoint,
+    ReceivablesEndpoint,
+)
+from modules.finance.models import FinancialAccount
+
+from shared.testing import PerformanceTestCase
+
+from .factories import (
+    CustomerFactory,
+    PayableFactory,
+    ReceivableFactory,
+    SupplierFactory,
+    UserFactory,
+)
+
+
+class BillingPerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def setUp(self):
+        super().setUp()
+        self.account = FinancialAccount.objects.create(
+            name='Bank', business=self.business
+        )
+        self.customer = CustomerFactory(business=self.business)
+        self.receivable = ReceivableFactory(
+            business=self.business, contact=self.customer, total_amount=10**6
+        )
+
+    def seed_payments(self, count):
+        today = timezone.localdate()
+        Payment.objects.bulk_create(
+            (
+                Payment(
+                    id=ulid.new().str,
+                    business=self.business,
+                    contact=self.customer,
+                    issued_at=today,
+                    due_at=today + timedelta(days=n % 120 - 30),
+                    total_amount=100,
+                    outstanding_balance=100,
+                    payment_type='receivable' if n % 2 else 'payable',
+                    status='paid' if n % 5 == 0 else 'pending',
+                    notes=f'Rent {n}',
+                )
+                for n in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def test_receivables(self):
+        self.assertWithinBudget(
+            'receivables.list',
+            self.seed_payments,
+            self.request(ReceivablesEndpoint, 'receivables'),
+        )
+        self.assertWithinBudget(
+            'receivables.cursor',
+            self.seed_payments,
+            self.request(ReceivablesEndpoint, 'receivables?limit=50'),
+        )
+        self.assertWithinBudget(
+            'receivables.search',
+            self.seed_payments,
+            self.request(ReceivableSearchEndpoint, 'receivables/?search=Rent'),
+        )
+        self.assertWithinBudget(
+            'receivables.detail',
+            self.seed_payments,
+            self.request(
+                ReceivablesEndpoint,
+                'receivables/id',
+                receivable_id=self.receivable.id,
+            ),
+        )
+        self.assertWithinBudget(
+            'receivables.create',
+            self.seed_payments,
+            self.request(ReceivablesEndpoint, 'receivables', 'post', {
+                'contact': self.customer.id,
+                'issued_at': '2025-04-21',
+                'due_at': '2025-05-25',
+                'total_amount': '100',
+                'payment_method': 'Cash',
+                'recurrence': 'once',
+                'notes': 'Rent',
+            }),
+        )
+
+    def test_payables(self):
+        supplier = SupplierFactory(business=self.business)
+        payable = PayableFactory(
+            business=self.business, contact=supplier, total_amount=10**6
+        )
+
+        self.assertWithinBudget(
+            'payables.list',
+            self.seed_payments,
+            self.request(PayablesEndpoint, 'payables'),
+        )
+        self.assertWithinBudget(
+            'payables.search',
+            self.seed_payments,
+            self.request(PayableSearchEndpoint, 'payables/?search=Rent'),
+        )
+        self.assertWithinBudget(
+            'payables.detail',
+            self.seed_payments,
+            self.request(PayablesEndpoint, 'payables/id', payable_id=payable.id),
+        )
+        self.assertWithinBudget(
+            'payables.create',
+            self.seed_payments,
+            self.request(PayablesEndpoint, 'payables', 'post', {
+                'contact': supplier.id,
+                'issued_at': '2025-04-21',
+                'due_at': '2025-05-25',
+                'total_amount': '100',
+                'payment_method': 'Cash',
+                'recurrence': 'once',
+                'notes': 'Rent',
+            }),
+        )
+        self.assertWithinBudget(
+            'payables.settle',
+            self.seed_payments,
+            self.request(
+                PayableSettleEndpoint,
+                'payables/id/settle',
+                'post',
+                {'amount': 1, 'account': self.account.id},
+                payable_id=payable.id,
+            ),
+        )
+
+    def test_settle(self):
+        self.assertWithinBudget(
+            'receivables.settle',
+            self.seed_payments,
+            self.request(
+                ReceivableSettleEndpoint,
+                'receivables/settle/id',
+                'post',
+                {'amount': 1, 'account': self.account.id},
+                receivable_id=self.receivable.id,
+            ),
+        )
+
+    def test_bulk_settle(self):
+        receivables = ReceivableFactory.create_batch(
+            20, business=self.business, contact=self.customer
+        )
+        self.assertWithinBudget(
+            'receivables.bulk_settle',
+            self.seed_payments,
+            self.request(
+                ReceivableBulkSettleEndpoint,
+                'receivables/settle',
+                'post',
+                {'settlements': [
+                    {
+                        'payment': receivable.id,
+                        'account': self.account.id,
+                        'amount': 1,
+                    }
+                    for receivable in receivables
+                ]},
+            ),
+        )
+
+    def test_reports(self):
+        aging = self.request(ReceivableAgingEndpoint, 'receivables/aging')
+
+        def uncached_aging():
+            forget_aging(self.business.id)
+            aging()
+
+        self.assertWithinBudget(
+            'receivables.aging', self.seed_payments, uncached_aging
+        )
+        self.assertWithinBudget(
+            'cashflow',
+            self.seed_payments,
+            self.request(CashFlowEndpoint, 'cashflow'),
+        )
@@ -0,0 +1,102 @@
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from modules.accounts.models import Owner
+from modules.billing.tasks import mark_overdue_payments
+from modules.billing.views import (
+    CashFlowEndpoint,
+    PayableAgingEndpoint,
+    PayablesEndpoint,
+    ReceivableAgingEndpoint,
+    ReceivableSearchEndpoint,
+    ReceivablesEndpoint,
+)
+from modules.business.models import Business
+
+from shared.testing import QueryPlanMixin
+
+from .factories import (
+    UserFactory,
+    CustomerFactory,
+    PayableFactory,
+    ReceivableFactory,
+)
+
+
+class BillingQueryPlanTest(QueryPlanMixin, TestCase):
+    tables = ['billing_payment']
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner.business = self.business
+        self.owner.save()
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+        customer = CustomerFactory(business=self.business)
+        ReceivableFactory.create_batch(
+            3, business=self.business, contact=customer, notes='Rent'
+        )
+        PayableFactory.create_batch(
+            3, business=self.business, contact=customer, notes='Rent'
+        )
+
+    def get(self, endpoint, path, **params):
+        def call():
+            request = self.factory.get(
+                path, params, HTTP_AUTHORIZATION=self.auth_header
+            )
+            response = endpoint.as_view()(request)
+            self.assertEqual(response.status_code, 200)
+        return call
+
+    def test_lists(self):
+        self.assertIndexScans(
+            self.get(ReceivablesEndpoint, 'receivables'), self.tables
+        )
+        self.assertIndexScans(
+            self.get(PayablesEndpoint, 'payables'), self.tables
+        )
+        self.assertIndexScans(
+            self.get(ReceivablesEndpoint, 'receivables', limit=10),
+            self.tables,
+        )
+
+    def test_search(self):
+        self.assertIndexScans(
+            self.get(ReceivableSearchEndpoint, 'receivables/', search='rent'),
+            self.tables,
+        )
+
+    def test_aging(self):
+        self.assertIndexScans(
+            self.get(ReceivableAgingEndpoint, 'receivables/aging'),
+            self.tables,
+        )
+        self.assertIndexScans(
+            self.get(PayableAgingEndpoint, 'payables/aging', by='contact'),
+            self.tables,
+        )
+
+    def test_cash_flow(self):
+        self.assertIndexScans(self.get(CashFlowEndpoint, 'cashflow'), self.tables)
+
+    def test_overdue_sweep(self):
+        self.assertIndexScans(
+            lambda: mark_overdue_payments(timezone.localdate(), batch_size=2),
+            self.tables,
+        )
@@ -0,0 +1,96 @@
+from django.test import SimpleTestCase
+
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta, TH
+
+from modules.billing import recurrence
+
+
+class WeeklyDatesTest(SimpleTestCase):
+    def test_first_occurrence_is_left_out(self):
+        # 2025-05-21 is a Wednesday, so the recurrence starts on Monday 26.
+        dates = recurrence.weekly_dates(
+            date(2025, 5, 21),
+            'monday',
+            after=date(2025, 5, 21),
+            until=date(2025, 6, 16),
+        )
+        self.assertEqual(
+            dates,
+            [date(2025, 6, 2), date(2025, 6, 9), date(2025, 6, 16)],
+        )
+
+    def test_window_matches_day_by_day_walk(self):
+        start = date(2025, 1, 3)
+        first = start + relativedelta(weekday=TH)
+        occurrences = [first + timedelta(weeks=n) for n in range(1, 60)]
+        expected = [
+            due_at for due_at in occurrences
+            if date(2025, 3, 10) < due_at <= date(2025, 12, 31)
+        ]
+
+        dates = recurrence.weekly_dates(
+            start,
+            'thursday',
+            after=date(2025, 3, 10),
+            until=date(2025, 12, 31),
+        )
+        self.assertEqual(dates, expected)
+
+    def test_empty_window(self):
+        dates = recurrence.weekly_dates(
+            date(2025, 5, 19),
+            'monday',
+            after=date(2025, 5, 19),
+            until=date(2025, 5, 25),
+        )
+        self.assertEqual(dates, [])
+
+
+class MonthlyDatesTest(SimpleTestCase):
+    def test_matches_relativedelta(self):
+        start = date(2024, 1, 31)
+        expected = [start + relativedelta(months=n) for n in range(1, 24)]
+
+        dates = recurrence.monthly_dates(
+            start,
+            after=start,
+            until=date(2025, 12, 31),
+        )
+        self.assertEqual(dates, expected)
+
+    def test_end_of_month_is_clamped(self):
+        dates = recurrence.monthly_dates(
+            date(2025, 1, 15),
+            after=date(2025, 1, 15),
+            until=date(2025, 4, 30),
+            day=31,
+        )
+        self.assertEqual(
+            dates,
+            [date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)],
+        )
+
+    def test_window_bounds_are_respected(self):
+        dates = recurrence.monthly_dates(
+            date(2025, 1, 20),
+            after=date(2025, 3, 20),
+            until=date(2025, 5, 19),
+        )
+        self.assertEqual(dates, [date(2025, 4, 20)])
+
+
+class InstallmentDatesTest(SimpleTestCase):
+    def test_installments_on_due_day(self):
+        dates = recurrence.installment_dates(date(2025, 4, 21), 4, day=10)
+        self.assertEqual(
+            dates,
+            [date(2025, 5, 10), date(2025, 6, 10), date(2025, 7, 10)],
+        )
+
+    def test_installments_are_clamped_in_short_months(self):
+        dates = recurrence.installment_dates(date(2024, 1, 30), 3, day=30)
+        self.assertEqual(dates, [date(2024, 2, 29), date(2024, 3, 30)])
+
+    def test_single_installment(self):
+        self.assertEqual(recurrence.installment_dates(date(2025, 1, 1), 1), [])
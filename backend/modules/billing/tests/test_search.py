@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from modules.business.models import Business
+from modules.billing.models import Payment
+from modules.billing.search import search_payments
+
+from shared.search import normalize
+
+from .factories import CustomerFactory, SupplierFactory, ReceivableFactory
+
+
+class PaymentSearchTest(TestCase):
+    def setUp(self):
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+
+    def search(self, term):
+        payments = Payment.objects.order_by('due_at', 'id')
+        return list(search_payments(payments, term).values_list('id', flat=True))
+
+    def test_normalize_folds_accents_case_and_spaces(self):
+        self.assertEqual(
+            normalize('  João  ', None, 'AÇÚCAR\tMascavo'),
+            'joao acucar mascavo',
+        )
+
+    def test_document_is_written_on_create(self):
+        customer = CustomerFactory(name='José Conceição', alias='Zé')
+        payment = ReceivableFactory(
+            business=self.business,
+            contact=customer,
+            reference='NF-123',
+            notes='Açúcar',
+        )
+        self.assertEqual(
+            Payment.objects.get(id=payment.id).search_document,
+            'jose conceicao ze nf-123 acucar',
+        )
+
+    def test_search_is_accent_and_case_insensitive(self):
+        payment = ReceivableFactory(
+            business=self.business,
+            contact=CustomerFactory(name='Conceição'),
+        )
+        self.assertEqual(self.search('CONCEICAO'), [payment.id])
+        self.assertEqual(self.search('conceição'), [payment.id])
+
+    def test_results_are_ranked(self):
+        contact = CustomerFactory(name='Ana')
+        anywhere = ReceivableFactory(
+            business=self.business, contact=contact, notes='Bananas'
+        )
+        word = ReceivableFactory(
+            business=self.business, contact=contact, notes='Fresh nanas'
+        )
+        start = ReceivableFactory(
+            business=self.business,
+            contact=CustomerFactory(name='Nanas Store'),
+            notes='Fruit',
+        )
+        self.assertEqual(self.search('nanas'), [start.id, word.id, anywhere.id])
+
+    def test_renaming_contact_refreshes_documents(self):
+        supplier = SupplierFactory(legal_name='Old Name')
+        payment = ReceivableFactory(business=self.business, contact=supplier)
+
+        supplier.legal_name = 'Fresh Name'
+        supplier.save()
+
+        self.assertEqual(self.search('fresh'), [payment.id])
+        self.assertEqual(self.search('old name'), [])
+
+    def test_document_is_rebuilt_only_when_its_fields_change(self):
+        payment = ReceivableFactory(
+            business=self.business,
+            contact=CustomerFactory(name='Ana'),
+            notes='Rent',
+        )
+
+        payment.status = 'overdue'
+        with CaptureQueriesContext(connection) as context:
+            payment.save()
+        self.assertFalse(any(
+            'contacts_' in query['sql'] for query in context.captured_queries
+        ))
+
+        payment.notes = 'Water'
+        payment.save()
+        self.assertEqual(self.search('water'), [payment.id])
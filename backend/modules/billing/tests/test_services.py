@@ -0,0 +1,192 @@
+from django.test import TestCase, override_settings
+
+from datetime import date
+
+from modules.business.models import Business
+from modules.billing.models import Payment
+from modules.billing.services import create_payment, settle_payments
+from modules.finance.models import (
+    DailyFinancialRollup,
+    FinancialAccount,
+    FinancialTransaction,
+)
+
+from .factories import (
+    UserFactory,
+    CustomerFactory,
+    PayableFactory,
+    ReceivableFactory,
+)
+
+
+class CreatePaymentTest(TestCase):
+    def setUp(self):
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.customer = CustomerFactory()
+
+    def payment(self, **fields):
+        return Payment(
+            business=self.business,
+            contact=self.customer,
+            payment_type='receivable',
+            issued_at=date(2025, 1, 10),
+            due_at=date(2025, 1, 31),
+            total_amount=100,
+            notes='Receivable',
+            **fields,
+        )
+
+    def test_installments_are_written_with_constant_queries(self):
+        # Contact names, SAVEPOINT, INSERT parent, bulk INSERT children
+        # and RELEASE.
+        for installments in (2, 12, 36):
+            with self.assertNumQueries(5):
+                payment = create_payment(self.payment(
+                    recurrence='installments',
+                    installment_count=installments,
+                    due_day_of_month=31,
+                ))
+
+        self.assertEqual(payment.recurrence, 'once')
+        self.assertEqual(payment.outstanding_balance, 100)
+        self.assertEqual(payment.notes, 'Receivable | instalment [1 of 36]')
+        self.assertEqual(Payment.objects.count(), 2 + 12 + 36)
+        self.assertTrue(
+            Payment.objects.filter(due_at=date(2025, 2, 28)).exists()
+        )
+
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=365)
+    def test_schedule_is_written_with_constant_queries(self):
+        # Contact names, SAVEPOINT, INSERT schedule, INSERT parent, bulk
+        # INSERT and RELEASE.
+        with self.assertNumQueries(6):
+            payment = create_payment(self.payment(recurrence='monthly'))
+
+        self.assertEqual(payment.recurrence, 'once')
+        self.assertEqual(payment.schedule.payments.count(), 12)
+
+    def test_single_payment_is_one_insert(self):
+        with self.assertNumQueries(4):
+            payment = create_payment(self.payment())
+
+        self.assertIsNone(payment.schedule)
+        self.assertEqual(payment.outstanding_balance, 100)
+
+
+class SettlePaymentTest(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.account = FinancialAccount.objects.create(
+            name='Bank',
+            business=self.business,
+        )
+        self.contact = CustomerFactory()
+
+    def settle(self, payment, amount):
+        return FinancialTransaction.objects.create(
+            business=self.business,
+            operator=self.user,
+            account=self.account,
+            payment=payment,
+            amount=amount,
+            description='Settlement',
+            type='credit' if amount > 0 else 'debit',
+        )
+
+    def test_partial_then_full_settlement(self):
+        receivable = ReceivableFactory(contact=self.contact, business=self.business)
+
+        self.settle(receivable, 40)
+        receivable.refresh_from_db()
+        self.assertEqual(receivable.amount_paid, 40)
+        self.assertEqual(receivable.outstanding_balance, 60)
+        self.assertEqual(receivable.status, 'partially_paid')
+        self.assertIsNone(receivable.paid_at)
+
+        self.settle(receivable, 60)
+        receivable.refresh_from_db()
+        self.assertEqual(receivable.amount_paid, 100)
+        self.assertEqual(receivable.outstanding_balance, 0)
+        self.assertEqual(receivable.status, 'paid')
+        self.assertIsNotNone(receivable.paid_at)
+
+    def test_payable_is_settled_by_debits(self):
+        payable = PayableFactory(contact=self.contact, business=self.business)
+
+        self.settle(payable, -100)
+        payable.refresh_from_db()
+        self.assertEqual(payable.amount_paid, 100)
+        self.assertEqual(payable.status, 'paid')
+
+    def test_deleting_settlement_reverts_payment(self):
+        receivable = ReceivableFactory(contact=self.contact, business=self.business)
+        transaction = self.settle(receivable, 100)
+
+        transaction.delete()
+        receivable.refresh_from_db()
+        self.assertEqual(receivable.amount_paid, 0)
+        self.assertEqual(receivable.outstanding_balance, 100)
+        self.assertEqual(receivable.status, 'pending')
+        self.assertIsNone(receivable.paid_at)
+
+    def test_moving_settlement_between_payments(self):
+        first, second = ReceivableFactory.create_batch(
+            2,
+            contact=self.contact,
+            business=self.business,
+        )
+        transaction = self.settle(first, 100)
+
+        transaction.payment = second
+        transaction.save()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, 'pending')
+        self.assertEqual(second.status, 'paid')
+
+    def test_settlement_does_not_aggregate_ledger(self):
+        receivable = ReceivableFactory(contact=self.contact, business=self.business)
+        for _ in range(5):
+            self.settle(receivable, 1)
+
+        # INSERT, the account balance (SAVEPOINT, UPDATE, RELEASE), the
+        # payment settlement (SAVEPOINT, two UPDATEs, RELEASE) and the
+        # daily rollup (UPDATE).
+        with self.assertNumQueries(9):
+            self.settle(receivable, 1)
+
+    def test_bulk_settlement_of_payables(self):
+        payables = PayableFactory.create_batch(
+            3,
+            contact=self.contact,
+            business=self.business,
+        )
+        items = [
+            {'payment': payable.id, 'account': self.account.id, 'amount': 100}
+            for payable in payables
+        ]
+
+        results = settle_payments(self.business, self.user, 'payable', items)
+
+        self.account.refresh_from_db()
+        self.assertTrue(all(result['settled'] for result in results))
+        self.assertEqual(self.account.balance, -300)
+        self.assertEqual(
+            set(Payment.objects.values_list('status', flat=True)),
+            {'paid'},
+        )
+        self.assertEqual(
+            FinancialTransaction.objects.filter(amount=-100).count(),
+            3,
+        )
+        rollup = DailyFinancialRollup.objects.get(type='debit')
+        self.assertEqual((rollup.amount, rollup.count), (-300, 3))
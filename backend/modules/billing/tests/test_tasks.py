@@ -1,18 +1,226 @@
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from unittest.mock import patch
 
+from datetime import timedelta
+
+from server.celery import app
+
+from modules.business.models import Business
+from modules.billing.models import Payment, PaymentSchedule
+
+from .factories import CustomerFactory, ReceivableFactory
+
 from .. import tasks
 
 
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
 class UpdatePaymentStatus(TestCase):
+    def setUp(self):
+        # Run the shards inline instead of reaching for a broker.
+        eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, 'task_always_eager', eager)
+
     def test_update_payment_status_execution(self):
         result = tasks.update_payment_status.apply()
         self.assertTrue(result.successful())
-        self.assertEqual(result.result, 'Update payment task completed')
+        self.assertEqual(
+            result.result,
+            'Update payment task completed: 0 payments overdue'
+        )
 
     @patch('modules.billing.tasks.update_payment_status.delay')
     def test_update_payment_status_scheduling(self, mocked_test):
         tasks.update_payment_status.delay()
         mocked_test.assert_called_once()
+
+    def test_only_unpaid_past_due_payments_become_overdue(self):
+        business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        yesterday = timezone.localdate() - timedelta(days=1)
+        tomorrow = timezone.localdate() + timedelta(days=1)
+
+        pending, paid, upcoming = ReceivableFactory.create_batch(
+            3,
+            business=business,
+            contact=CustomerFactory(),
+            due_at=yesterday,
+        )
+        Payment.objects.filter(id=paid.id).update(status='paid')
+        Payment.objects.filter(id=upcoming.id).update(due_at=tomorrow)
+
+        result = tasks.update_payment_status.apply()
+        self.assertEqual(
+            result.result,
+            'Update payment task dispatched: 1 shards'
+        )
+
+        statuses = dict(Payment.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[pending.id], 'overdue')
+        self.assertEqual(statuses[paid.id], 'paid')
+        self.assertEqual(statuses[upcoming.id], 'pending')
+
+    @override_settings(BILLING_OVERDUE_BATCH_SIZE=2)
+    def test_overdue_shard_updates_in_batches(self):
+        business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        ReceivableFactory.create_batch(
+            5,
+            business=business,
+            contact=CustomerFactory(),
+            due_at=timezone.localdate() - timedelta(days=1),
+        )
+
+        result = tasks.update_overdue_shard.apply(
+            args=([business.id], timezone.localdate().isoformat())
+        )
+
+        self.assertEqual(result.result['businesses'], 1)
+        self.assertEqual(result.result['updated'], 5)
+        self.assertIn('seconds', result.result)
+
+    def test_payments_without_business_become_overdue(self):
+        payment = ReceivableFactory(
+            contact=CustomerFactory(),
+            due_at=timezone.localdate() - timedelta(days=1),
+        )
+
+        with self.assertLogs('modules.billing.tasks', 'INFO') as logs:
+            result = tasks.update_payment_status.apply()
+
+        self.assertEqual(
+            result.result,
+            'Update payment task dispatched: 1 shards'
+        )
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, 'overdue')
+        self.assertIn('1 payments', logs.output[0])
+
+    def test_shards_are_summed_when_chords_are_supported(self):
+        business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        ReceivableFactory.create_batch(
+            2,
+            business=business,
+            contact=CustomerFactory(),
+            due_at=timezone.localdate() - timedelta(days=1),
+        )
+        ReceivableFactory(
+            contact=CustomerFactory(),
+            due_at=timezone.localdate() - timedelta(days=1),
+        )
+
+        with (
+            override_settings(BILLING_OVERDUE_SHARD_ROWS=1),
+            patch.object(tasks, 'chords_supported', return_value=True),
+            self.assertLogs('modules.billing.tasks', 'INFO') as logs,
+        ):
+            result = tasks.update_payment_status.apply()
+
+        self.assertEqual(
+            result.result,
+            'Update payment task dispatched: 2 shards'
+        )
+        self.assertIn('3 payments in 2 shards of 2 businesses', logs.output[-1])
+
+    def test_rpc_backend_does_not_support_chords(self):
+        self.assertFalse(tasks.chords_supported())
+
+    def test_shards_are_dispatched_without_eager_mode(self):
+        app.conf.task_always_eager = False
+        ReceivableFactory(
+            business=Business.objects.create(
+                legal_name='The Test Business INC',
+                trade_name='Test Business',
+                cnpj=12345678901234
+            ),
+            contact=CustomerFactory(),
+            due_at=timezone.localdate() - timedelta(days=1),
+        )
+
+        with patch('celery.canvas.group.apply_async') as apply_async:
+            result = tasks.update_payment_status.apply()
+
+        self.assertEqual(
+            result.result,
+            'Update payment task dispatched: 1 shards'
+        )
+        apply_async.assert_called_once_with()
+
+
+class PlanOverdueShards(TestCase):
+    def test_large_business_runs_in_its_own_shard(self):
+        counts = [('a', 10), ('b', 500), ('c', 20), ('d', 30)]
+        shards = tasks.plan_overdue_shards(counts, shard_rows=100)
+        self.assertEqual(shards, [['a'], ['b'], ['c', 'd']])
+
+    def test_no_candidates_means_no_shards(self):
+        self.assertEqual(tasks.plan_overdue_shards([], shard_rows=100), [])
+
+
+class MaterializePaymentSchedules(TestCase):
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=40)
+    def test_schedules_are_materialized_up_to_the_horizon_once(self):
+        today = timezone.localdate()
+        schedule = PaymentSchedule.objects.create(
+            contact=CustomerFactory(),
+            payment_type='payable',
+            recurrence='monthly',
+            issued_at=today,
+            starts_at=today,
+            materialized_until=today,
+            total_amount=100,
+        )
+
+        result = tasks.materialize_payment_schedules.apply()
+        self.assertEqual(
+            result.result,
+            'Materialize payment schedules completed: 1 payments created'
+        )
+
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.materialized_until, tasks.horizon())
+        self.assertEqual(schedule.payments.count(), 1)
+
+        result = tasks.materialize_payment_schedules.apply()
+        self.assertEqual(
+            result.result,
+            'Materialize payment schedules completed: 0 payments created'
+        )
+
+    def test_existing_occurrences_are_not_counted(self):
+        today = timezone.localdate()
+        schedule = PaymentSchedule.objects.create(
+            contact=CustomerFactory(),
+            payment_type='payable',
+            recurrence='monthly',
+            issued_at=today,
+            starts_at=today,
+            materialized_until=today,
+            total_amount=100,
+        )
+        until = today + timedelta(days=70)
+        schedule.occurrences(today, until)[0].save()
+
+        with patch.object(tasks, 'forget_aging') as forget_aging:
+            created = tasks.materialize_schedule(schedule, until)
+
+        self.assertEqual(created, 1)
+        self.assertEqual(schedule.payments.count(), 2)
+        forget_aging.assert_called_once_with(schedule.business_id)
+
+        schedule.materialized_until = today
+        with patch.object(tasks, 'forget_aging') as forget_aging:
+            self.assertEqual(tasks.materialize_schedule(schedule, until), 0)
+        forget_aging.assert_not_called()
@@ -3,23 +3,37 @@ import factory
 from rest_framework.test import APIRequestFactory
 from rest_framework_simplejwt.tokens import AccessToken
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from datetime import datetime
+from unittest.mock import patch
+
+from datetime import datetime, date, timedelta
+from decimal import Decimal
 
 from modules.billing.views import (
     ReceivableSearchEndpoint,
     ReceivablesEndpoint,
     ReceivableSettleEndpoint,
+    ReceivableBulkSettleEndpoint,
+    ReceivableAgingEndpoint,
     PayableSearchEndpoint,
     PayablesEndpoint,
     PayableSettleEndpoint,
+    CashFlowEndpoint,
 )
 
 from modules.accounts.models import Owner
 from modules.business.models import Business
-from modules.finance.models import FinancialAccount
-from modules.billing.models import Payment
+from modules.finance.models import FinancialAccount, FinancialTransaction
+from modules.billing.aging import aging_report
+from modules.billing.cashflow import project_cash_flow
+from modules.billing.models import Payment, PaymentSchedule
+from modules.billing.projection import ProjectedPayments
+from modules.billing.tasks import materialize_payment_schedules
 
 from .factories import (
     UserFactory,
@@ -30,6 +44,7 @@ from .factories import (
 )
 
 from shared.helpers import get_start_and_end_date
+from shared.testing import QueryCountMixin
 
 
 class ReceivableSearchEndpointViewTest(TestCase):
@@ -166,7 +181,7 @@ class ReceivableSearchEndpointViewTest(TestCase):
         self.assertEqual(receivable_notes, 'Customer Recivable Notes')
 
 
-class ReceivablesEndpointViewTest(TestCase):
+class ReceivablesEndpointViewTest(QueryCountMixin, TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
         self.user = UserFactory()
@@ -255,6 +270,203 @@ class ReceivablesEndpointViewTest(TestCase):
         response = ReceivablesEndpoint.as_view()(request)
         self.assertEqual(response.status_code, 201)
 
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=14)
+    @patch('django.utils.timezone.localdate', return_value=date(2025, 5, 19))
+    def test_weekly_receivable_is_materialized_within_horizon(self, _):
+        data = {
+            'contact': self.customer.id,
+            'issued_at': '2025-05-19',
+            'due_at': '2025-05-19',
+            'total_amount': '1000',
+            'recurrence': 'weekly',
+            'due_weekday': 'monday',
+            'notes': 'Weekly Receivable',
+        }
+        request = self.factory.post(
+            'receivables',
+            data=data,
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivablesEndpoint.as_view()(request)
+
+        schedule = PaymentSchedule.objects.get()
+        due_dates = Payment.objects\
+            .filter(schedule=schedule)\
+            .order_by('due_at')\
+            .values_list('due_at', flat=True)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['payment']['schedule'], schedule.id)
+        self.assertEqual(schedule.materialized_until, date(2025, 6, 2))
+        self.assertEqual(
+            list(due_dates),
+            [date(2025, 5, 19), date(2025, 5, 26), date(2025, 6, 2)],
+        )
+
+        request = self.factory.get(
+            'receivables/?start_date=2025-05-19&end_date=2025-06-30'
+            '&projected=true',
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivableSearchEndpoint.as_view()(request)
+
+        results = [result['payment'] for result in response.data['results']]
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(
+            [result['due_at'] for result in results[3:]],
+            ['2025-06-09', '2025-06-16', '2025-06-23', '2025-06-30'],
+        )
+        self.assertTrue(all(result['id'] is None for result in results[3:]))
+        self.assertEqual(Payment.objects.count(), 3)
+
+    def create_weekly_receivable(self):
+        request = self.factory.post(
+            'receivables',
+            data={
+                'contact': self.customer.id,
+                'issued_at': '2025-05-19',
+                'due_at': '2025-05-19',
+                'total_amount': '1000',
+                'recurrence': 'weekly',
+                'due_weekday': 'monday',
+                'notes': 'Weekly Receivable',
+            },
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivablesEndpoint.as_view()(request)
+        self.assertEqual(response.status_code, 201)
+        return response.data['payment']['id']
+
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=14)
+    def test_deleting_the_recurring_payment_ends_its_schedule(self):
+        with patch('django.utils.timezone.localdate', return_value=date(2025, 5, 19)):
+            receivable_id = self.create_weekly_receivable()
+
+        # Deleting an occurrence leaves the schedule running.
+        occurrence = Payment.objects.get(due_at=date(2025, 5, 26))
+        request = self.factory.delete(
+            'receivables/<id>', HTTP_AUTHORIZATION=self.auth_header
+        )
+        ReceivablesEndpoint.as_view()(request, receivable_id=occurrence.id)
+        self.assertTrue(PaymentSchedule.objects.get().is_active)
+
+        request = self.factory.delete(
+            'receivables/<id>', HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ReceivablesEndpoint.as_view()(
+            request, receivable_id=receivable_id
+        )
+        self.assertEqual(response.status_code, 200)
+
+        schedule = PaymentSchedule.objects.get()
+        self.assertFalse(schedule.is_active)
+        self.assertEqual(schedule.ends_at, date(2025, 6, 2))
+
+        with patch('django.utils.timezone.localdate', return_value=date(2025, 7, 1)):
+            result = materialize_payment_schedules.apply()
+        self.assertEqual(
+            result.result,
+            'Materialize payment schedules completed: 0 payments created'
+        )
+
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=14)
+    def test_changing_the_recurrence_ends_the_schedule(self):
+        with patch('django.utils.timezone.localdate', return_value=date(2025, 5, 19)):
+            receivable_id = self.create_weekly_receivable()
+
+        request = self.factory.patch(
+            'receivables/<id>',
+            data={'recurrence': 'once'},
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivablesEndpoint.as_view()(
+            request, receivable_id=receivable_id
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(PaymentSchedule.objects.get().is_active)
+
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=14)
+    def test_materializing_retires_the_cached_aging_report(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        today = date(2025, 5, 19)
+
+        with patch('django.utils.timezone.localdate', return_value=today):
+            self.create_weekly_receivable()
+        business = self.account.business
+        report = aging_report(business, 'receivable', today=today)
+
+        with patch('django.utils.timezone.localdate', return_value=date(2025, 5, 26)):
+            materialize_payment_schedules()
+
+        self.assertEqual(Payment.objects.count(), 4)
+        self.assertNotEqual(
+            aging_report(business, 'receivable', today=today), report
+        )
+
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=14)
+    def test_projected_page_reads_only_the_payments_it_needs(self):
+        with patch('django.utils.timezone.localdate', return_value=date(2025, 5, 19)):
+            self.create_weekly_receivable()
+
+        business = self.account.business
+        projected = ProjectedPayments(
+            business.payments.order_by('due_at', 'id'),
+            business.payment_schedules.all(),
+            '2025-05-19',
+            '2025-06-30',
+        )
+        self.assertEqual(projected.count(), 7)
+
+        with CaptureQueriesContext(connection) as context:
+            page = projected[2:4]
+
+        self.assertEqual(
+            [payment.due_at for payment in page],
+            [date(2025, 6, 2), date(2025, 6, 9)],
+        )
+        self.assertIsNotNone(page[0].id)
+        self.assertIsNone(page[1].id)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn('LIMIT 4', context.captured_queries[0]['sql'])
+
+    @override_settings(BILLING_RECURRENCE_HORIZON_DAYS=14)
+    def test_projected_search_keeps_best_matches_first(self):
+        with patch('django.utils.timezone.localdate', return_value=date(2025, 5, 19)):
+            self.create_weekly_receivable()
+
+        ReceivableFactory(
+            business=self.account.business,
+            contact=CustomerFactory(name='Weekly Foods'),
+            issued_at='2025-06-25',
+            due_at='2025-06-25',
+        )
+
+        request = self.factory.get(
+            'receivables/?search=weekly&start_date=2025-05-19'
+            '&end_date=2025-06-30&projected=true',
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivableSearchEndpoint.as_view()(request)
+
+        results = [result['payment'] for result in response.data['results']]
+        self.assertEqual(response.data['count'], 8)
+        self.assertEqual(
+            [result['due_at'] for result in results],
+            [
+                '2025-06-25', '2025-05-19', '2025-05-26', '2025-06-02',
+                '2025-06-09', '2025-06-16', '2025-06-23', '2025-06-30',
+            ],
+        )
+
+    def test_projected_search_requires_date_range(self):
+        request = self.factory.get(
+            'receivables/?search=Weekly&projected=true',
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivableSearchEndpoint.as_view()(request)
+        self.assertEqual(response.status_code, 400)
+
     def test_create_receivable_recurrence_installments(self):
         data = {
             'contact': self.customer.id,
@@ -333,6 +545,58 @@ class ReceivablesEndpointViewTest(TestCase):
         self.assertEqual(payment['status'], 'pending')
         self.assertEqual(payment['amount_paid'], '0.00')
 
+    def test_list_receivables_by_cursor(self):
+        receivables = ReceivableFactory.create_batch(
+            3,
+            business=self.account.business,
+            contact=self.customer,
+        )
+        ids = sorted((receivable.id for receivable in receivables), reverse=True)
+
+        request = self.factory.get(
+            'receivables?limit=2',
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivablesEndpoint.as_view()(request)
+        first_page = [result['payment']['id'] for result in response.data['results']]
+        self.assertEqual(first_page, ids[:2])
+        self.assertIn(f'cursor={ids[1]}', response.data['next'])
+
+        request = self.factory.get(
+            f'receivables?limit=2&cursor={ids[1]}',
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivablesEndpoint.as_view()(request)
+        second_page = [result['payment']['id'] for result in response.data['results']]
+        self.assertEqual(second_page, ids[2:])
+        self.assertIsNone(response.data['next'])
+
+    def test_list_receivables_constant_queries(self):
+        def seed(count):
+            ReceivableFactory.create_batch(
+                count,
+                business=self.account.business,
+                contact=factory.Iterator([CustomerFactory(), SupplierFactory()]),
+            )
+
+        def list_receivables():
+            request = self.factory.get(
+                'receivables',
+                HTTP_AUTHORIZATION=self.auth_header,
+            )
+            response = ReceivablesEndpoint.as_view()(request)
+            self.assertEqual(response.status_code, 200)
+
+        self.assertConstantQueries(seed, list_receivables)
+
+    def test_list_receivables_invalid_cursor(self):
+        request = self.factory.get(
+            'receivables?cursor=not-a-ulid',
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = ReceivablesEndpoint.as_view()(request)
+        self.assertEqual(response.status_code, 400)
+
     def test_receivable_partially_paid_status(self):
         data = {
             'contact': self.customer.id,
@@ -422,6 +686,240 @@ class ReceivablesEndpointViewTest(TestCase):
         )
 
 
+class ReceivableBulkSettleEndpointViewTest(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.customer = CustomerFactory()
+
+        owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        owner.business = self.business
+        owner.save()
+        self.account = FinancialAccount.objects.create(
+            name='Bank', business=self.business
+        )
+
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+    def settle(self, settlements):
+        request = self.factory.post(
+            'receivables/settle',
+            data={'settlements': settlements},
+            format='json',
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        return ReceivableBulkSettleEndpoint.as_view()(request)
+
+    def test_settle_many_receivables(self):
+        paid, partial = ReceivableFactory.create_batch(
+            2,
+            business=self.business,
+            contact=self.customer,
+        )
+        payable = PayableFactory(business=self.business, contact=self.customer)
+
+        response = self.settle([
+            {'payment': paid.id, 'account': self.account.id, 'amount': 100},
+            {'payment': partial.id, 'account': self.account.id, 'amount': '30'},
+            {'payment': payable.id, 'account': self.account.id, 'amount': 10},
+            {'payment': partial.id, 'account': self.account.id, 'amount': 'x'},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['settled'], 2)
+        self.assertEqual(response.data['failed'], 2)
+        self.assertEqual(
+            response.data['results'][2]['error'], 'Receivable not found.'
+        )
+
+        paid.refresh_from_db()
+        partial.refresh_from_db()
+        self.account.refresh_from_db()
+        self.assertEqual(paid.status, 'paid')
+        self.assertEqual(partial.status, 'partially_paid')
+        self.assertEqual(partial.outstanding_balance, 70)
+        self.assertEqual(self.account.balance, 130)
+        self.assertEqual(paid.financial_transactions.get().type, 'credit')
+
+    def test_settle_with_no_valid_item(self):
+        response = self.settle([
+            {'payment': 'missing', 'account': self.account.id, 'amount': 1},
+        ])
+        self.assertEqual(response.status_code, 400)
+
+    def test_settle_with_amounts_out_of_range(self):
+        receivable = ReceivableFactory(
+            business=self.business, contact=self.customer
+        )
+
+        response = self.settle([
+            {
+                'payment': receivable.id,
+                'account': self.account.id,
+                'amount': '99999999999999999',
+            },
+            {'payment': receivable.id, 'account': self.account.id, 'amount': '1.234'},
+            {'payment': receivable.id, 'account': self.account.id, 'amount': '1.23'},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['settled'], 1)
+        self.assertEqual(
+            [result.get('error') for result in response.data['results']],
+            [
+                'Ensure that there are no more than 10 digits in total.',
+                'Ensure that there are no more than 2 decimal places.',
+                None,
+            ],
+        )
+        receivable.refresh_from_db()
+        self.assertEqual(receivable.amount_paid, Decimal('1.23'))
+
+    def test_settle_with_malformed_items(self):
+        response = self.settle(['not-an-item'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error']['invalid'], [0])
+
+    def test_settle_queries_do_not_grow_with_batch(self):
+        receivables = []
+
+        def seed(size):
+            receivables[:] = ReceivableFactory.create_batch(
+                size,
+                business=self.business,
+                contact=self.customer,
+            )
+
+        def settle():
+            response = self.settle([
+                {'payment': receivable.id, 'account': self.account.id, 'amount': 1}
+                for receivable in receivables
+            ])
+            self.assertEqual(response.status_code, 201)
+
+        # The first settlement of the day creates its daily rollup.
+        seed(1)
+        settle()
+
+        self.assertConstantQueries(seed, settle, sizes=(1, 20))
+
+
+class ReceivableAgingEndpointViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.customer = CustomerFactory(name='Ana')
+        self.other_customer = CustomerFactory(name='Bruno')
+
+        owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        owner.business = self.business
+        owner.save()
+
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+        today = timezone.localdate()
+        for days, amount, contact in [
+            (-5, 10, self.customer),
+            (0, 20, self.customer),
+            (10, 30, self.customer),
+            (45, 40, self.other_customer),
+            (75, 50, self.other_customer),
+            (120, 60, self.other_customer),
+        ]:
+            due_at = today - timedelta(days=days)
+            ReceivableFactory(
+                business=self.business,
+                contact=contact,
+                issued_at=due_at,
+                due_at=due_at,
+                total_amount=amount,
+            )
+
+        ReceivableFactory(
+            business=self.business,
+            contact=self.customer,
+            total_amount=70,
+            status='paid',
+        )
+        PayableFactory(business=self.business, contact=self.customer)
+
+    def aging(self, **params):
+        request = self.factory.get(
+            'receivables/aging',
+            params,
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        return ReceivableAgingEndpoint.as_view()(request)
+
+    def test_buckets(self):
+        response = self.aging()
+        self.assertEqual(response.status_code, 200)
+
+        total = response.data['total']
+        self.assertEqual(
+            [total[bucket] for bucket in response.data['buckets']],
+            [30, 30, 40, 50, 60],
+        )
+        self.assertEqual(total['total'], 210)
+        self.assertEqual(total['count'], 6)
+        self.assertNotIn('contacts', response.data)
+
+    def test_buckets_by_contact(self):
+        response = self.aging(by='contact')
+        self.assertEqual(response.status_code, 200)
+
+        contacts = response.data['contacts']
+        self.assertEqual(
+            [(contact['name'], contact['total']) for contact in contacts],
+            [('Bruno', 150), ('Ana', 60)],
+        )
+        self.assertEqual(contacts[1]['current'], 30)
+        self.assertEqual(response.data['total']['total'], 210)
+
+    def test_report_is_one_query(self):
+        with self.assertNumQueries(1):
+            aging_report(self.business, 'receivable', by_contact=True)
+
+        with self.assertNumQueries(0):
+            aging_report(self.business, 'receivable', by_contact=True)
+
+    def test_settlement_retires_cached_report(self):
+        self.aging()
+
+        receivable = self.business.payments.get(total_amount=60)
+        FinancialTransaction.objects.create(
+            business=self.business,
+            operator=self.user,
+            account=self.business.financial_accounts.get(),
+            payment=receivable,
+            amount=25,
+            description='Settlement',
+            type='credit',
+        )
+
+        response = self.aging()
+        self.assertEqual(response.data['total']['90+'], 35)
+
+    def test_invalid_grouping(self):
+        response = self.aging(by='category')
+        self.assertEqual(response.status_code, 400)
+
+
 class PayableSearchEndpointViewTest(TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
@@ -831,3 +1329,99 @@ class PayablesEndpointViewTest(TestCase):
             delete_payaable_response.data['error']['message'], error_message
         )
 
+
+class CashFlowEndpointViewTest(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.customer = CustomerFactory()
+
+        owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        owner.business = self.business
+        owner.save()
+        self.business.financial_accounts.update(balance=1000)
+
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+        self.today = timezone.localdate()
+
+    def create_payment(self, factory, days, amount):
+        due_at = self.today + timedelta(days=days)
+        return factory(
+            business=self.business,
+            contact=self.customer,
+            issued_at=due_at,
+            due_at=due_at,
+            total_amount=amount,
+        )
+
+    def cash_flow(self, **params):
+        request = self.factory.get(
+            'cashflow',
+            params,
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        return CashFlowEndpoint.as_view()(request)
+
+    def test_projected_balance(self):
+        self.create_payment(ReceivableFactory, -10, 30)
+        self.create_payment(ReceivableFactory, 2, 100)
+        self.create_payment(PayableFactory, 5, 40)
+        self.create_payment(PayableFactory, 120, 500)
+
+        response = self.cash_flow()
+        self.assertEqual(response.status_code, 200)
+
+        data = response.data
+        self.assertEqual(data['start'], self.today)
+        self.assertEqual(len(data['balance']), 91)
+        self.assertEqual(data['opening_balance'], 1000)
+        self.assertEqual(data['receivables'][0], 30)
+        self.assertEqual(data['balance'][0], 1030)
+        self.assertEqual(data['balance'][2], 1130)
+        self.assertEqual(data['payables'][5], 40)
+        self.assertEqual(data['balance'][5], 1090)
+        self.assertEqual(data['balance'][-1], 1090)
+
+    def test_schedules_beyond_the_horizon_are_projected(self):
+        schedule = PaymentSchedule.objects.create(
+            contact=self.customer,
+            business=self.business,
+            payment_type='payable',
+            recurrence='weekly',
+            due_weekday='monday',
+            issued_at=self.today,
+            starts_at=self.today,
+            materialized_until=self.today + timedelta(days=60),
+            total_amount=10,
+        )
+        occurrences = schedule.due_dates(
+            self.today + timedelta(days=60), self.today + timedelta(days=90)
+        )
+
+        data = project_cash_flow(self.business, 90, self.today)
+        self.assertEqual(sum(data['payables']), 10 * len(occurrences))
+        self.assertEqual(data['balance'][-1], 1000 - 10 * len(occurrences))
+
+    def test_query_count_does_not_grow_with_payments(self):
+        for days in range(30):
+            self.create_payment(ReceivableFactory, days, 10)
+
+        # Account balances, due payments per day and schedules.
+        with self.assertNumQueries(3):
+            project_cash_flow(self.business, 90, self.today)
+
+    def test_invalid_days(self):
+        for days in ['0', '400', 'x']:
+            response = self.cash_flow(days=days)
+            self.assertEqual(response.status_code, 400)
+
+    def test_permission_is_owner(self):
+        self.user.owner.delete()
+        response = self.cash_flow()
+        self.assertEqual(response.status_code, 403)
@@ -6,6 +6,8 @@ from . import views
 urlpatterns = [
     path('receivables', views.ReceivablesEndpoint.as_view()),
     path('receivables/', views.ReceivableSearchEndpoint.as_view()),
+    path('receivables/settle', views.ReceivableBulkSettleEndpoint.as_view()),
+    path('receivables/aging', views.ReceivableAgingEndpoint.as_view()),
     path('receivables/<str:receivable_id>', views.ReceivablesEndpoint.as_view()),
     path(
         'receivables/<str:receivable_id>/settle',
@@ -13,9 +15,12 @@ urlpatterns = [
     ),
     path('payables', views.PayablesEndpoint.as_view()),
     path('payables/', views.PayableSearchEndpoint.as_view()),
+    path('payables/settle', views.PayableBulkSettleEndpoint.as_view()),
+    path('payables/aging', views.PayableAgingEndpoint.as_view()),
     path('payables/<str:payable_id>', views.PayablesEndpoint.as_view()),
     path(
         'payables/<str:payable_id>/settle',
         views.PayableSettleEndpoint.as_view()
     ),
+    path('cashflow', views.CashFlowEndpoint.as_view()),
 ]
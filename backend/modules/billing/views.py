@@ -8,7 +8,13 @@ from datetime import datetime
 
 from decimal import Decimal, InvalidOperation
 
+from .aging import aging_report
+from .cashflow import MAX_DAYS, project_cash_flow
+from .models import Payment
+from .projection import ProjectedPayments
 from .serializers import PaymentSerializer
+from .search import search_payments
+from .services import MAX_SETTLEMENTS, settle_payments
 
 from modules.finance.serializers import FinancialTransactionSerializer
 
@@ -16,6 +22,7 @@ from shared import (
     error,
     validate,
     paginate,
+    IsOwner,
     BurstRateThrottle,
     SustainedRateThrottle,
     get_user_business,
@@ -23,6 +30,63 @@ from shared import (
 )
 
 
+def bulk_settle(request, business, payment_type: str) -> Response:
+    """
+    Validates a batch of settlements and settles the valid ones at once.
+    Responds with the outcome of every item, in the order they were sent.
+    """
+    settlements = request.data.get('settlements')
+
+    invalid_items = None
+    if isinstance(settlements, list):
+        invalid_items = [
+            index for index, item in enumerate(settlements)
+            if not isinstance(item, dict)
+            or not isinstance(item.get('payment'), str)
+            or not isinstance(item.get('account'), str)
+        ]
+
+    if not settlements or not isinstance(settlements, list) or invalid_items:
+        message = 'Required parameter missing or invalid.'
+        error_response = error.builder(400, message, invalid=invalid_items)
+        return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+    if len(settlements) > MAX_SETTLEMENTS:
+        message = f'Settle at most {MAX_SETTLEMENTS} payments at once.'
+        error_response = error.builder(400, message)
+        return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+    results = settle_payments(business, request.user, payment_type, settlements)
+    settled = sum(result['settled'] for result in results)
+
+    if not settled:
+        message = 'Validation failed.'
+        error_response = error.builder(400, message, details=results)
+        return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+    data = {
+        'settled': settled,
+        'failed': len(results) - settled,
+        'results': results,
+    }
+    return Response(data, status.HTTP_201_CREATED)
+
+
+def aging(request, business, payment_type: str) -> Response:
+    """
+    Responds with the aging buckets of the unpaid payments of
+    `payment_type`, per contact too with `?by=contact`.
+    """
+    by = request.query_params.get('by')
+
+    if by not in (None, 'contact'):
+        error_response = error.builder(400, "Group by 'contact' or nothing.")
+        return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+    report = aging_report(business, payment_type, by_contact=by == 'contact')
+    return Response(report, status.HTTP_200_OK)
+
+
 class ReceivableSearchEndpoint(APIView):
     permission_classes = [permissions.IsAdminUser]
     throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
@@ -33,12 +97,18 @@ class ReceivableSearchEndpoint(APIView):
         if got_no_business:
             return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
         
-        payments = business.payments.filter(payment_type='receivable')
+        payments = business.payments\
+            .filter(payment_type='receivable')\
+            .order_by('due_at', 'id')
+        schedules = business.payment_schedules\
+            .filter(payment_type='receivable', is_active=True)
 
         search = request.query_params.get('search')
         date = request.query_params.get('date')
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
+        projected = request.query_params.get('projected') == 'true'
+        period = None
 
         if not any([search, date, start_date, end_date]):
             message = 'Search term missing or invalid.'
@@ -50,14 +120,8 @@ class ReceivableSearchEndpoint(APIView):
                 error_response = error.builder(400, 'Enter at least 3 characters.')
                 return Response(error_response, status.HTTP_400_BAD_REQUEST)
             
-            payments = payments.filter(
-                Q(contact__customer__name__icontains=search) |
-                Q(contact__customer__alias__icontains=search) |
-                Q(contact__supplier__legal_name__icontains=search) |
-                Q(contact__supplier__trade_name__icontains=search) |
-                Q(reference__icontains=search) |
-                Q(notes__icontains=search)
-            )
+            payments = search_payments(payments, search)
+            schedules = search_payments(schedules, search)
 
         if date:
             today = datetime.now()
@@ -70,15 +134,19 @@ class ReceivableSearchEndpoint(APIView):
                 return Response(error_response, status.HTTP_400_BAD_REQUEST)
             
             query = Q(due_at=date)
+            period = (date, date)
 
             if date == 'today':
                 query = Q(due_at__exact=today)
+                period = (today, today)
             elif date == 'week':
                 start_week, end_week = get_start_and_end_date(today, week=True)
                 query = Q(due_at__range=[start_week, end_week])
+                period = (start_week, end_week)
             elif date == 'month':
                 start_month, end_month = get_start_and_end_date(today, month=True)
                 query = Q(due_at__range=[start_month, end_month])
+                period = (start_month, end_month)
 
             payments = payments.filter(query)
 
@@ -94,9 +162,17 @@ class ReceivableSearchEndpoint(APIView):
             payments = payments.filter(
                 Q(due_at__range=[start_date, end_date])
             )
+            period = (start_date, end_date)
+
+        if projected:
+            if not period:
+                message = 'Projecting occurrences requires a date range.'
+                error_response = error.builder(400, message)
+                return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+            payments = ProjectedPayments(payments, schedules, *period)
    
-        serializer = PaymentSerializer(payments, many=True)
-        paginated_data = paginate(serializer.data, request, 50)
+        paginated_data = paginate(payments, request, 50, PaymentSerializer)
 
         return paginated_data
 
@@ -111,7 +187,9 @@ class ReceivablesEndpoint(APIView):
         if got_no_business:
             return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
         
-        payments = business.payments.filter(payment_type='receivable')
+        payments = business.payments\
+            .filter(payment_type='receivable')\
+            .order_by('due_at', 'id')
 
         if receivable_id:
             payment = payments.filter(id=receivable_id).first()
@@ -123,8 +201,9 @@ class ReceivablesEndpoint(APIView):
             serializer = PaymentSerializer(payment)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = PaymentSerializer(payments, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(
+                payments, request, 50, PaymentSerializer, cursor=True
+            )
             return paginated_data
         
 
@@ -274,6 +353,7 @@ class ReceivableSettleEndpoint(APIView):
         post_data['description'] = f'{payment.notes} | Ref. Receivable ID {payment.id}'
         post_data['contact'] = payment.contact.id
         post_data['business'] = payment.business.id
+        post_data['payment'] = payment.id
 
         serializer = FinancialTransactionSerializer(
             data=post_data,
@@ -287,14 +367,35 @@ class ReceivableSettleEndpoint(APIView):
         
         serializer.save()
 
-        transaction_id = serializer.data['transaction']['id']
-        transaction = business.financial_transactions.get(id=transaction_id)
-        transaction.payment = payment
-        transaction.save()
-
         return Response(serializer.data, status.HTTP_201_CREATED)
 
 
+class ReceivableBulkSettleEndpoint(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
+
+    def post(self, request):
+        business, got_no_business = get_user_business(request.user)
+
+        if got_no_business:
+            return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
+
+        return bulk_settle(request, business, 'receivable')
+
+
+class ReceivableAgingEndpoint(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
+
+    def get(self, request):
+        business, got_no_business = get_user_business(request.user)
+
+        if got_no_business:
+            return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
+
+        return aging(request, business, 'receivable')
+
+
 class PayableSettleEndpoint(APIView):
     permission_classes = [permissions.IsAdminUser]
     throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
@@ -336,6 +437,7 @@ class PayableSettleEndpoint(APIView):
         post_data['description'] = f'{payment.notes} | Ref. Payable ID {payment.id}'
         post_data['contact'] = payment.contact.id
         post_data['business'] = payment.business.id
+        post_data['payment'] = payment.id
 
         serializer = FinancialTransactionSerializer(
             data=post_data,
@@ -349,14 +451,35 @@ class PayableSettleEndpoint(APIView):
         
         serializer.save()
 
-        transaction_id = serializer.data['transaction']['id']
-        transaction = business.financial_transactions.get(id=transaction_id)
-        transaction.payment = payment
-        transaction.save()
-
         return Response(serializer.data, status.HTTP_201_CREATED)
 
 
+class PayableBulkSettleEndpoint(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
+
+    def post(self, request):
+        business, got_no_business = get_user_business(request.user)
+
+        if got_no_business:
+            return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
+
+        return bulk_settle(request, business, 'payable')
+
+
+class PayableAgingEndpoint(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
+
+    def get(self, request):
+        business, got_no_business = get_user_business(request.user)
+
+        if got_no_business:
+            return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
+
+        return aging(request, business, 'payable')
+
+
 class PayableSearchEndpoint(APIView):
     permission_classes = [permissions.IsAdminUser]
     throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
@@ -367,12 +490,18 @@ class PayableSearchEndpoint(APIView):
         if got_no_business:
             return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
         
-        payments = business.payments.filter(payment_type='payable')
+        payments = business.payments\
+            .filter(payment_type='payable')\
+            .order_by('due_at', 'id')
+        schedules = business.payment_schedules\
+            .filter(payment_type='payable', is_active=True)
 
         search = request.query_params.get('search')
         date = request.query_params.get('date')
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
+        projected = request.query_params.get('projected') == 'true'
+        period = None
 
         if not any([search, date, start_date, end_date]):
             message = 'Search term missing or invalid.'
@@ -384,14 +513,8 @@ class PayableSearchEndpoint(APIView):
                 error_response = error.builder(400, 'Enter at least 3 characters.')
                 return Response(error_response, status.HTTP_400_BAD_REQUEST)
             
-            payments = payments.filter(
-                Q(contact__customer__name__icontains=search) |
-                Q(contact__customer__alias__icontains=search) |
-                Q(contact__supplier__legal_name__icontains=search) |
-                Q(contact__supplier__trade_name__icontains=search) |
-                Q(reference__icontains=search) |
-                Q(notes__icontains=search)
-            )
+            payments = search_payments(payments, search)
+            schedules = search_payments(schedules, search)
 
         if date:
             today = datetime.now()
@@ -404,15 +527,19 @@ class PayableSearchEndpoint(APIView):
                 return Response(error_response, status.HTTP_400_BAD_REQUEST)
             
             query = Q(due_at=date)
+            period = (date, date)
 
             if date == 'today':
                 query = Q(due_at__exact=today)
+                period = (today, today)
             elif date == 'week':
                 start_week, end_week = get_start_and_end_date(today, week=True)
                 query = Q(due_at__range=[start_week, end_week])
+                period = (start_week, end_week)
             elif date == 'month':
                 start_month, end_month = get_start_and_end_date(today, month=True)
                 query = Q(due_at__range=[start_month, end_month])
+                period = (start_month, end_month)
 
             payments = payments.filter(query)
 
@@ -428,9 +555,17 @@ class PayableSearchEndpoint(APIView):
             payments = payments.filter(
                 Q(due_at__range=[start_date, end_date])
             )
+            period = (start_date, end_date)
+
+        if projected:
+            if not period:
+                message = 'Projecting occurrences requires a date range.'
+                error_response = error.builder(400, message)
+                return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+            payments = ProjectedPayments(payments, schedules, *period)
    
-        serializer = PaymentSerializer(payments, many=True)
-        paginated_data = paginate(serializer.data, request, 50)
+        paginated_data = paginate(payments, request, 50, PaymentSerializer)
 
         return paginated_data
 
@@ -445,7 +580,9 @@ class PayablesEndpoint(APIView):
         if got_no_business:
             return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
         
-        payments = business.payments.filter(payment_type='payable')
+        payments = business.payments\
+            .filter(payment_type='payable')\
+            .order_by('due_at', 'id')
 
         if payable_id:
             payment = payments.filter(id=payable_id).first()
@@ -457,8 +594,9 @@ class PayablesEndpoint(APIView):
             serializer = PaymentSerializer(payment)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = PaymentSerializer(payments, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(
+                payments, request, 50, PaymentSerializer, cursor=True
+            )
             return paginated_data
         
 
@@ -565,3 +703,24 @@ class PayablesEndpoint(APIView):
             return Response(error_response, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         return Response(data, status.HTTP_200_OK)
+
+
+class CashFlowEndpoint(APIView):
+    permission_classes = [IsOwner]
+    throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
+
+    def get(self, request):
+        business, got_no_business = get_user_business(request.user)
+
+        if got_no_business:
+            return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
+
+        days = request.query_params.get('days', '90')
+
+        if not days.isdigit() or not 1 <= int(days) <= MAX_DAYS:
+            message = f'Project between 1 and {MAX_DAYS} days.'
+            error_response = error.builder(400, message)
+            return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+        projection = project_cash_flow(business, int(days))
+        return Response(projection, status.HTTP_200_OK)
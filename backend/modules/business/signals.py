@@ -1,8 +1,10 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
 import ulid
 
+from shared.tenancy import bump_tenancy_version
+
 from .models import Business
 
 
@@ -10,3 +12,9 @@ from .models import Business
 def generate_ulids(sender, instance, **kwargs):
     if not instance.id:
         instance.id = ulid.new().str
+
+
+@receiver(post_save, sender=Business)
+@receiver(post_delete, sender=Business)
+def retire_cached_tenancy(sender, instance, **kwargs):
+    bump_tenancy_version()
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import ulid
+
+from modules.business.views import BusinessEndpoint
+from modules.products.models import Product
+
+from shared.testing import PerformanceTestCase
+
+from .factories import UserFactory
+
+
+class BusinessPerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def seed_products(self, count):
+        # Rows of the tenant must not weigh on reading the business.
+        Product.objects.bulk_create(
+            (
+                Product(
+                    id=ulid.new().str,
+                    name=f'Product {ulid.new().str}',
+                    business=self.business,
+                )
+                for _ in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def test_business(self):
+        self.assertWithinBudget(
+            'business.detail',
+            self.seed_products,
+            self.request(BusinessEndpoint, 'business'),
+        )
+        self.assertWithinBudget(
+            'business.update',
+            self.seed_products,
+            self.request(
+                BusinessEndpoint, 'business', 'patch', {'trade_name': 'Renamed'}
+            ),
+        )
@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from modules.accounts.models import User, Owner
+from modules.business.models import Business
+from modules.members.models import Member
+
+from shared import get_user_business
+
+from .factories import UserFactory
+
+
+class TenancyResolutionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.user = UserFactory()
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner = Owner.objects.create(user=self.user, business=self.business)
+
+    def resolve(self, user):
+        # A fresh instance, as each request authenticates the user anew.
+        return get_user_business(User.objects.get(pk=user.pk))
+
+    def test_resolve_owner_business(self):
+        business, error = self.resolve(self.user)
+        self.assertEqual(business, self.business)
+        self.assertIsNone(error)
+
+    def test_resolve_member_business(self):
+        user = UserFactory()
+        Member.objects.create(
+            business=self.business,
+            credential=user,
+            name='Member',
+            phone='81999999999',
+            email='member@depoc.com.br',
+        )
+        business, _ = self.resolve(user)
+        self.assertEqual(business, self.business)
+
+    def test_user_without_business(self):
+        business, error = self.resolve(UserFactory())
+        self.assertIsNone(business)
+        self.assertEqual(error['error']['status'], 404)
+
+    def test_resolution_is_memoized_on_the_user(self):
+        user = User.objects.get(pk=self.user.pk)
+        get_user_business(user)
+        with self.assertNumQueries(0):
+            business, _ = get_user_business(user)
+        self.assertEqual(business, self.business)
+
+    @override_settings(TENANCY_CACHE_TIMEOUT=300)
+    def test_resolution_is_cached_across_requests(self):
+        self.resolve(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            business, _ = get_user_business(user)
+        self.assertEqual(business.legal_name, 'The Test Business INC')
+        self.assertEqual(business.customers.count(), 0)
+
+    def test_business_change_retires_the_cache(self):
+        self.resolve(self.user)
+        self.business.trade_name = 'Renamed'
+        self.business.save()
+
+        business, _ = self.resolve(self.user)
+        self.assertEqual(business.trade_name, 'Renamed')
+
+    def test_owner_change_retires_the_cache(self):
+        self.resolve(self.user)
+        self.owner.business = None
+        self.owner.save()
+
+        business, _ = self.resolve(self.user)
+        self.assertIsNone(business)
+
+    def test_member_removal_retires_the_cache(self):
+        user = UserFactory()
+        member = Member.objects.create(
+            business=self.business,
+            credential=user,
+            name='Member',
+            phone='81999999999',
+            email='member@depoc.com.br',
+        )
+        self.resolve(user)
+        member.credential = None
+        member.save()
+
+        business, _ = self.resolve(user)
+        self.assertIsNone(business)
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:03
+
+from django.db import migrations, models
+
+from shared.search import normalize, create_trigram_index
+
+import re
+
+
+def backfill_search_fields(apps, schema_editor):
+    fields = {
+        'Customer': ('code', 'name', 'alias', 'cpf'),
+        'Supplier': ('code', 'legal_name', 'trade_name', 'cnpj'),
+    }
+
+    for model_name, (code, name, alias, number) in fields.items():
+        model = apps.get_model('contacts', model_name)
+        rows = model.objects.values_list('pk', code, name, alias, number)
+
+        batch = []
+        for pk, *names, number in rows.iterator(chunk_size=1000):
+            batch.append(model(
+                pk=pk,
+                search_document=normalize(*names),
+                document_digits=re.sub(r'\D', '', number or ''),
+            ))
+            if len(batch) == 1000:
+                model.objects.bulk_update(
+                    batch, ['search_document', 'document_digits']
+                )
+                batch = []
+
+        if batch:
+            model.objects.bulk_update(batch, ['search_document', 'document_digits'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0001_initial'),
+        ('contacts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='document_digits',
+            field=models.CharField(blank=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='document_digits',
+            field=models.CharField(blank=True, default='', editable=False, max_length=14),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['business', 'document_digits'], name='customer_business_digits_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['business', 'document_digits'], name='supplier_business_digits_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+        migrations.RunPython(backfill_search_fields, migrations.RunPython.noop),
+        create_trigram_index('contacts_customer', 'search_document'),
+        create_trigram_index('contacts_supplier', 'search_document'),
+    ]
@@ -74,6 +74,23 @@ class Customer(Contact):
         null=True
     )
 
+    search_document = models.TextField(blank=True, default='', editable=False)
+    document_digits = models.CharField(
+        max_length=14,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['business', 'document_digits'],
+                name='customer_business_digits_idx',
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops'],
+            ),
+        ]
+
 
     def __str__(self):
         return self.name 
@@ -109,6 +126,23 @@ class Supplier(Contact):
         null=True
     )
 
+    search_document = models.TextField(blank=True, default='', editable=False)
+    document_digits = models.CharField(
+        max_length=14,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['business', 'document_digits'],
+                name='supplier_business_digits_idx',
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops'],
+            ),
+        ]
+
 
     def __str__(self):
         return self.legal_name 
@@ -0,0 +1,83 @@
+"""
+Search over the customers and suppliers of a business.
+
+Each contact stores a search document (its code and names, normalized by
+`shared.search.normalize`) and the digits of its CPF or CNPJ. A search
+is a single `UNION ALL` of both tables, filtered by business on each
+side, ranked, ordered and paginated in the database.
+
+Functions:
+- search_fields: Search document and document digits of a contact.
+- contacts: Contacts of a business, optionally matching a search term.
+"""
+
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models import CharField, IntegerField
+
+import re
+
+from shared.search import normalize, rank
+
+from .models import Customer, Supplier
+
+
+NON_DIGITS = re.compile(r'\D')
+DOCUMENT_NUMBER = re.compile(r'^[\d\s./-]+$')
+
+COLUMNS = ['id', 'kind', 'sort_name', 'search_rank']
+
+
+def search_fields(contact: Customer | Supplier) -> tuple[str, str]:
+    if isinstance(contact, Customer):
+        document = normalize(contact.code, contact.name, contact.alias)
+        number = contact.cpf
+    else:
+        document = normalize(contact.code, contact.legal_name, contact.trade_name)
+        number = contact.cnpj
+
+    return document, NON_DIGITS.sub('', number or '')
+
+
+def branch(queryset: QuerySet, kind: str, name: str, term: str) -> QuerySet:
+    queryset = queryset.annotate(
+        kind=Value(kind, output_field=CharField()),
+        sort_name=F(name),
+    )
+
+    if not term:
+        queryset = queryset.annotate(
+            search_rank=Value(0, output_field=IntegerField())
+        )
+        return queryset.values(*COLUMNS)
+
+    matches = Q(search_document__contains=term)
+    if DOCUMENT_NUMBER.match(term):
+        digits = NON_DIGITS.sub('', term)
+        if digits:
+            matches |= Q(document_digits__startswith=digits)
+
+    return queryset\
+        .filter(matches)\
+        .annotate(search_rank=rank('search_document', term))\
+        .values(*COLUMNS)
+
+
+def contacts(business, term: str | None = None) -> QuerySet:
+    """
+    Rows of `{id, kind, sort_name, search_rank}` for the customers and
+    suppliers of `business`, best matches first, then by name. A term
+    made only of digits and punctuation also matches CPFs and CNPJs by
+    prefix.
+    """
+    term = normalize(term)
+
+    customers = branch(
+        Customer.objects.filter(business=business), 'customer', 'name', term
+    )
+    suppliers = branch(
+        Supplier.objects.filter(business=business), 'supplier', 'legal_name', term
+    )
+
+    return customers\
+        .union(suppliers, all=True)\
+        .order_by('search_rank', 'sort_name', 'id')
@@ -84,3 +84,39 @@ class SupplierSerializer(serializers.ModelSerializer):
         supplier.save()
 
         return supplier
+
+
+class ContactListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        """
+        Loads the customers and suppliers of a page of `contacts` rows
+        with one query per table and serializes them in page order.
+        """
+        rows = list(data)
+        ids = {'customer': [], 'supplier': []}
+        for row in rows:
+            ids[row['kind']].append(row['id'])
+
+        instances = {
+            'customer': Customer.objects.in_bulk(ids['customer']),
+            'supplier': Supplier.objects.in_bulk(ids['supplier']),
+        }
+        representations = {
+            'customer': CustomerSerializer(),
+            'supplier': SupplierSerializer(),
+        }
+
+        return [
+            representations[row['kind']].to_representation(
+                instances[row['kind']][row['id']]
+            )
+            for row in rows
+        ]
+
+
+class ContactSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer of the rows returned by `search.contacts`.
+    """
+    class Meta:
+        list_serializer_class = ContactListSerializer
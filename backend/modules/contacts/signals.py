@@ -4,6 +4,7 @@ from django.dispatch import receiver
 import ulid
 
 from .models import Customer, Supplier
+from .search import search_fields
 
 
 @receiver(pre_save, sender=Customer)
@@ -11,3 +12,9 @@ from .models import Customer, Supplier
 def generate_ulids(sender, instance, **kwargs):
     if not instance.id:
         instance.id = ulid.new().str
+
+
+@receiver(pre_save, sender=Customer)
+@receiver(pre_save, sender=Supplier)
+def update_search_fields(sender, instance, **kwargs):
+    instance.search_document, instance.document_digits = search_fields(instance)
@@ -10,3 +10,17 @@ class UserFactory(factory.django.DjangoModelFactory):
     email = factory.Faker('email')
     password = factory.django.Password('password')
     is_staff = True
+
+
+class CustomerFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'contacts.Customer'
+
+    name = factory.Faker('name')
+
+
+class SupplierFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = 'contacts.Supplier'
+
+    legal_name = factory.Faker('name')
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from modules.contacts.views import (
+    ContactsEndpoint,
+    ContactsSearchEndpoint,
+    CustomerEndpoint,
+)
+
+from shared.testing import PerformanceTestCase
+
+from .factories import UserFactory, CustomerFactory, SupplierFactory
+
+
+class ContactsPerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def setUp(self):
+        super().setUp()
+        # The search finds a customer and a supplier at every scale, so
+        # random names cannot change the queries it makes.
+        self.customer = CustomerFactory(business=self.business, name='Ana')
+        SupplierFactory(business=self.business, legal_name='Ana Supplies')
+
+    def seed_contacts(self, count):
+        # Customers and suppliers inherit from Contact, which rules out
+        # bulk_create.
+        CustomerFactory.create_batch(count - count // 2, business=self.business)
+        SupplierFactory.create_batch(count // 2, business=self.business)
+
+    def test_contacts(self):
+        self.assertWithinBudget(
+            'contacts.list',
+            self.seed_contacts,
+            self.request(ContactsEndpoint, 'contacts'),
+        )
+        self.assertWithinBudget(
+            'contacts.search',
+            self.seed_contacts,
+            self.request(ContactsSearchEndpoint, 'contacts/?search=ana'),
+        )
+
+    def test_customers(self):
+        self.assertWithinBudget(
+            'customers.list',
+            self.seed_contacts,
+            self.request(CustomerEndpoint, 'contacts/customers'),
+        )
+        self.assertWithinBudget(
+            'customers.detail',
+            self.seed_contacts,
+            self.request(
+                CustomerEndpoint,
+                'contacts/customers/id',
+                customer_id=self.customer.id,
+            ),
+        )
+        self.assertWithinBudget(
+            'customers.create',
+            self.seed_contacts,
+            self.request(CustomerEndpoint, 'contacts/customers', 'post', {
+                'name': 'Ana',
+            }),
+        )
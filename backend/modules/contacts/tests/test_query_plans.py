@@ -0,0 +1,49 @@
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.test import TestCase
+
+from modules.contacts.views import ContactsEndpoint, ContactsSearchEndpoint
+
+from shared.testing import QueryPlanMixin
+
+from .factories import UserFactory, CustomerFactory, SupplierFactory
+from .test_views import create_business
+
+
+class ContactsQueryPlanTest(QueryPlanMixin, TestCase):
+    tables = ['contacts_customer', 'contacts_supplier']
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+        business = create_business(self.user)
+        CustomerFactory.create_batch(3, business=business)
+        SupplierFactory.create_batch(3, business=business)
+
+    def get(self, endpoint, path, **params):
+        def call():
+            request = self.factory.get(
+                path, params, HTTP_AUTHORIZATION=self.auth_header
+            )
+            response = endpoint.as_view()(request)
+            self.assertEqual(response.status_code, 200)
+        return call
+
+    def test_list(self):
+        self.assertIndexScans(
+            self.get(ContactsEndpoint, 'contacts'), self.tables
+        )
+
+    def test_search(self):
+        self.assertIndexScans(
+            self.get(ContactsSearchEndpoint, 'contacts/', search='ana'),
+            self.tables,
+        )
+        self.assertIndexScans(
+            self.get(ContactsSearchEndpoint, 'contacts/', search='123.456'),
+            self.tables,
+        )
@@ -3,6 +3,8 @@ from rest_framework_simplejwt.tokens import AccessToken
 
 from django.test import TestCase
 
+from modules.accounts.models import Owner
+from modules.business.models import Business
 from modules.contacts.views import (
     ContactsSearchEndpoint,
     ContactsEndpoint,
@@ -10,7 +12,21 @@ from modules.contacts.views import (
     SupplierEndpoint,
 )
 
-from .factories import UserFactory
+from shared.testing import QueryCountMixin
+
+from .factories import UserFactory, CustomerFactory, SupplierFactory
+
+
+def create_business(user, cnpj='12345678901234'):
+    owner = Owner.objects.create(user=user)
+    business = Business.objects.create(
+        legal_name='The Test Business INC',
+        trade_name='Test Business',
+        cnpj=cnpj,
+    )
+    owner.business = business
+    owner.save()
+    return business
 
 
 class ContactsSearchEndpointViewTest(TestCase):
@@ -46,8 +62,74 @@ class ContactsSearchEndpointViewTest(TestCase):
         response = ContactsSearchEndpoint.as_view()(request)
         self.assertEqual(response.status_code, 400)
 
+    def search(self, term):
+        request = self.factory.get(
+            f'contacts/?search={term}',
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ContactsSearchEndpoint.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_search_is_scoped_to_the_business(self):
+        business = create_business(self.user)
+        other_business = Business.objects.create(
+            legal_name='Other Business INC',
+            trade_name='Other Business',
+            cnpj='98765432109876',
+        )
+        customer = CustomerFactory(name='Ana Conceição', business=business)
+        CustomerFactory(name='Ana Conceição', business=other_business)
+        CustomerFactory(name='Outra', alias='Ana', business=other_business)
+        SupplierFactory(legal_name='Conceição LTDA', business=other_business)
+
+        data = self.search('conceicao')
+
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['customer']['id'], customer.id)
+
+    def test_search_customers_and_suppliers_ranked(self):
+        business = create_business(self.user)
+        anywhere = CustomerFactory(name='Rosamaria', business=business)
+        word = SupplierFactory(legal_name='Casa Maria', business=business)
+        start = CustomerFactory(name='Maria Silva', business=business)
+        CustomerFactory(name='João', business=business)
+
+        data = self.search('MARIA')
 
-class ContactsEndpointViewTest(TestCase):
+        self.assertEqual(
+            [next(iter(row.values()))['id'] for row in data['results']],
+            [start.id, word.id, anywhere.id],
+        )
+
+    def test_search_document_number_by_prefix(self):
+        business = create_business(self.user)
+        customer = CustomerFactory(
+            name='Ana', cpf='12345678900', business=business
+        )
+        supplier = SupplierFactory(
+            legal_name='Ana LTDA', cnpj='12345000000199', business=business
+        )
+
+        data = self.search('123.450')
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['supplier']['id'], supplier.id)
+
+        data = self.search('123.456.789-00')
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['customer']['id'], customer.id)
+
+    def test_search_document_is_updated_on_save(self):
+        business = create_business(self.user)
+        customer = CustomerFactory(name='Ana', business=business)
+        customer.alias = 'Zezinha'
+        customer.save()
+
+        data = self.search('zezinha')
+        self.assertEqual(data['count'], 1)
+
+
+class ContactsEndpointViewTest(QueryCountMixin, TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
         self.user = UserFactory()
@@ -64,6 +146,42 @@ class ContactsEndpointViewTest(TestCase):
         response = ContactsEndpoint.as_view()(request)
         self.assertEqual(response.status_code, 403)
 
+    def list_contacts(self, page=1):
+        request = self.factory.get(
+            f'contacts?page={page}',
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ContactsEndpoint.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_list_is_paginated_in_the_database(self):
+        business = create_business(self.user)
+        for n in range(30):
+            CustomerFactory(name=f'Customer {n:02}', business=business)
+            SupplierFactory(legal_name=f'Supplier {n:02}', business=business)
+
+        first_page = self.list_contacts()
+        second_page = self.list_contacts(page=2)
+
+        self.assertEqual(first_page['count'], 60)
+        self.assertEqual(len(first_page['results']), 50)
+        self.assertEqual(len(second_page['results']), 10)
+        self.assertEqual(
+            second_page['results'][-1]['supplier']['legal_name'],
+            'Supplier 29',
+        )
+
+    def test_list_query_count_is_constant(self):
+        business = create_business(self.user)
+
+        def seed(size):
+            for _ in range(size):
+                CustomerFactory(business=business)
+                SupplierFactory(business=business)
+
+        self.assertConstantQueries(seed, self.list_contacts)
+
 
 class CustomerEndpointViewTest(TestCase):
     def setUp(self):
@@ -2,10 +2,12 @@ from rest_framework import permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from django.db.models import Q
-
-from .models import Customer, Supplier
-from .serializers import CustomerSerializer, SupplierSerializer
+from .search import contacts
+from .serializers import (
+    ContactSerializer,
+    CustomerSerializer,
+    SupplierSerializer,
+)
 
 from shared import (
     error,
@@ -37,27 +39,8 @@ class ContactsSearchEndpoint(APIView):
         if got_no_business:
             return Response(got_no_business, status.HTTP_404_NOT_FOUND)
 
-        search_customers = Customer.objects.filter(
-            Q(business=business) &
-            Q(code__icontains=search) |
-            Q(name__icontains=search) |
-            Q(alias__icontains=search) |
-            Q(cpf__icontains=search)
-        )
-
-        search_suppliers = Supplier.objects.filter(
-            Q(business=business) &
-            Q(code__icontains=search) |
-            Q(legal_name__icontains=search) |
-            Q(trade_name__icontains=search) |
-            Q(cnpj__icontains=search)
-        )
-
-        customers = CustomerSerializer(search_customers, many=True)
-        suppliers = SupplierSerializer(search_suppliers, many=True)
-        contacts = customers.data + suppliers.data
-
-        paginated_data = paginate(contacts, request, 50)
+        search_contacts = contacts(business, search)
+        paginated_data = paginate(search_contacts, request, 50, ContactSerializer)
 
         return paginated_data
 
@@ -72,11 +55,8 @@ class ContactsEndpoint(APIView):
         if got_no_business:
             return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
 
-        customers = CustomerSerializer(business.customers, many=True)
-        suppliers = SupplierSerializer(business.suppliers, many=True)   
-        contacts = customers.data + suppliers.data
-
-        paginated_data = paginate(contacts, request, 50)
+        all_contacts = contacts(business)
+        paginated_data = paginate(all_contacts, request, 50, ContactSerializer)
         
         return paginated_data
 
@@ -102,8 +82,7 @@ class CustomerEndpoint(APIView):
             serializer = CustomerSerializer(customer)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = CustomerSerializer(customers, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(customers.all(), request, 50, CustomerSerializer)
             return paginated_data
 
 
@@ -211,8 +190,7 @@ class SupplierEndpoint(APIView):
             return Response(serializer.data, status.HTTP_200_OK)
 
         else:
-            serializer = SupplierSerializer(suppliers, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(suppliers.all(), request, 50, SupplierSerializer)
             return paginated_data
 
 
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.business.models import Business
+
+from ...rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the daily financial rollups '
+        'from the financial transactions.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--business',
+            help='ID of the business to rebuild. Defaults to all businesses.',
+        )
+
+    def handle(self, *args, **options):
+        business = None
+
+        if business_id := options['business']:
+            business = Business.objects.filter(id=business_id).first()
+            if not business:
+                raise CommandError(f'Business {business_id} not found.')
+
+        rebuilt = rebuild_rollups(business)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {rebuilt} daily financial rollups.')
+        )
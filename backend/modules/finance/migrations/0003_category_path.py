@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+from shared.categories import rebuild_paths
+
+
+def fill_category_paths(apps, schema_editor):
+    rebuild_paths(apps.get_model('finance', 'FinancialCategory'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0001_initial'),
+        ('finance', '0002_alter_financialtransaction_amount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='financialcategory',
+            name='path',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='financialcategory',
+            index=models.Index(fields=['path'], name='financial_category_path_idx', opclasses=['text_pattern_ops']),
+        ),
+        migrations.RunPython(fill_category_paths, migrations.RunPython.noop),
+    ]
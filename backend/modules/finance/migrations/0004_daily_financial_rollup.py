@@ -0,0 +1,67 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+import ulid
+
+
+def fill_financial_rollups(apps, schema_editor):
+    FinancialTransaction = apps.get_model('finance', 'FinancialTransaction')
+    DailyFinancialRollup = apps.get_model('finance', 'DailyFinancialRollup')
+
+    totals = FinancialTransaction.objects\
+        .annotate(day=TruncDate('timestamp'))\
+        .order_by()\
+        .values('business_id', 'day', 'account_id', 'category_id', 'type')\
+        .annotate(total=Sum('amount'), entries=Count('id'))
+
+    DailyFinancialRollup.objects.bulk_create(
+        [
+            DailyFinancialRollup(
+                id=ulid.new().str,
+                business_id=row['business_id'],
+                date=row['day'],
+                account_id=row['account_id'],
+                category_id=row['category_id'],
+                type=row['type'],
+                amount=row['total'],
+                count=row['entries'],
+            )
+            for row in totals.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0001_initial'),
+        ('finance', '0003_category_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyFinancialRollup',
+            fields=[
+                ('id', models.CharField(editable=False, max_length=26, primary_key=True, serialize=False, unique=True)),
+                ('date', models.DateField()),
+                ('type', models.CharField(choices=[('credit', 'Credit'), ('debit', 'Debit'), ('transfer', 'Transfer')], max_length=255)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='finance.financialaccount')),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='financial_rollups', to='business.business')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='rollups', to='finance.financialcategory')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['business', 'date'], name='financial_rollup_date_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('business', 'date', 'account', 'category', 'type'), name='financial_rollup_unique'), models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('business', 'date', 'account', 'type'), name='financial_rollup_uncategorized_unique')],
+            },
+        ),
+        migrations.RunPython(
+            fill_financial_rollups, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0006_tenant_query_indexes'),
+        ('business', '0001_initial'),
+        ('contacts', '0002_search_document'),
+        ('finance', '0004_daily_financial_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='financialtransaction',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='financialtransaction',
+            name='description',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='financialtransaction',
+            name='timestamp',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AddIndex(
+            model_name='financialaccount',
+            index=models.Index(fields=['business', '-balance'], name='financial_account_balance_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='financialtransaction',
+            index=models.Index(fields=['business', '-timestamp'], name='transaction_business_time_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_tenant_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyfinancialrollup',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='finance.financialcategory'),
+        ),
+    ]
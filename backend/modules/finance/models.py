@@ -21,6 +21,15 @@ class FinancialAccount(models.Model):
     is_active = models.BooleanField(default=True)
 
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['business', '-balance'],
+                name='financial_account_balance_idx',
+            ),
+        ]
+
+
     def __str__(self):
         return self.name
 
@@ -50,6 +59,19 @@ class FinancialCategory(models.Model):
     name = models.CharField(max_length=150, unique=True)
     is_active = models.BooleanField(default=True)
 
+    # Ids from the root category down to this one, each followed by '/'.
+    path = models.TextField(blank=True, default='', editable=False)
+
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['path'],
+                name='financial_category_path_idx',
+                opclasses=['text_pattern_ops'],
+            ),
+        ]
+
     
     def __str__(self):
         return self.name
@@ -117,11 +139,88 @@ class FinancialTransaction(models.Model):
         blank=True,
         null=True,
     )    
-    amount = models.DecimalField(max_digits=12, decimal_places=2, db_index=True)
-    description = models.CharField(max_length=255, db_index=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    description = models.CharField(max_length=255)
     type = models.CharField(max_length=255, choices=TRANSACTION_TYPES)
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+
+    class Meta:
+        indexes = [
+            # The ledger of a business, newest first.
+            models.Index(
+                fields=['business', '-timestamp'],
+                name='transaction_business_time_idx',
+            ),
+        ]
 
 
     def __str__(self):
         return self.description
+
+
+class DailyFinancialRollup(models.Model):
+    """
+    Totals of the transactions of one day, account, category and type,
+    kept in step with the ledger (see `rollups.apply_rollup_deltas`).
+    """
+
+    id = models.CharField(
+        max_length=26,
+        primary_key=True,
+        unique=True,
+        editable=False,
+    )
+
+    business = models.ForeignKey(
+        'business.Business',
+        on_delete=models.CASCADE,
+        related_name='financial_rollups',
+    )
+
+    account = models.ForeignKey(
+        FinancialAccount,
+        on_delete=models.CASCADE,
+        related_name='rollups',
+    )
+
+    category = models.ForeignKey(
+        FinancialCategory,
+        on_delete=models.CASCADE,
+        related_name='rollups',
+        blank=True,
+        null=True,
+    )
+
+    date = models.DateField()
+    type = models.CharField(
+        max_length=255,
+        choices=FinancialTransaction.TRANSACTION_TYPES,
+    )
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business', 'date', 'account', 'category', 'type'],
+                condition=models.Q(category__isnull=False),
+                name='financial_rollup_unique',
+            ),
+            models.UniqueConstraint(
+                fields=['business', 'date', 'account', 'type'],
+                condition=models.Q(category__isnull=True),
+                name='financial_rollup_uncategorized_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['business', 'date'],
+                name='financial_rollup_date_idx',
+            ),
+        ]
+
+
+    def __str__(self):
+        return f'{self.date} {self.type} {self.amount}'
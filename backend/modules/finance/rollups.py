@@ -0,0 +1,313 @@
+"""
+Daily totals of the ledger.
+
+`DailyFinancialRollup` holds, per business, day, account, category and
+transaction type, the sum and number of its transactions. Like account
+balances, the rollups are maintained incrementally: every change to the
+ledger is applied as a delta to the rows it touches, and they can be
+recomputed from the ledger with the `rebuild_financial_rollups` command.
+
+Summaries are read from the rollups, so their cost grows with the number
+of days, accounts and categories asked for, not with the ledger.
+
+Functions:
+- rollup_key: The rollup a transaction is counted in.
+- rollup_deltas: The deltas adding transactions to their rollups.
+- apply_rollup_deltas: Adds amounts and counts to rollups.
+- rebuild_rollups: Recomputes the rollups from the ledger.
+- summarize: Totals of a business by period, account and category.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import ulid
+
+from shared.categories import in_subtree
+
+from .models import DailyFinancialRollup, FinancialTransaction
+
+
+PERIODS = ['day', 'week', 'month']
+GROUPS = ['account', 'category']
+TYPES = [type for type, _ in FinancialTransaction.TRANSACTION_TYPES]
+
+# Batches of deltas up to this size are applied one rollup at a time.
+SMALL_BATCH = 2
+
+RollupKey = tuple[str, date, str, str | None, str]
+
+
+def rollup_key(entry: FinancialTransaction | dict) -> RollupKey:
+    """
+    `(business_id, date, account_id, category_id, type)` of a
+    transaction, or of a dict with those fields and its `timestamp`.
+    """
+    if isinstance(entry, dict):
+        get = entry.get
+    else:
+        get = lambda field: getattr(entry, field)
+
+    return (
+        get('business_id'),
+        timezone.localdate(get('timestamp')),
+        get('account_id'),
+        get('category_id'),
+        get('type'),
+    )
+
+
+def rollup_deltas(
+        transactions: list[FinancialTransaction],
+    ) -> dict[RollupKey, tuple[Decimal, int]]:
+    deltas = {}
+    for entry in transactions:
+        key = rollup_key(entry)
+        amount, count = deltas.get(key, (Decimal('0'), 0))
+        deltas[key] = (amount + Decimal(str(entry.amount)), count + 1)
+    return deltas
+
+
+def apply_rollup_deltas(deltas: dict[RollupKey, tuple[Decimal, int]]) -> None:
+    """
+    Adds each `(amount, count)` delta to its rollup, creating it the
+    first time its day, account, category and type are seen.
+
+    A few deltas, as from saving one transaction, take one UPDATE each.
+    Larger batches lock and read their rollups in one query and are
+    written in bulk, so their cost does not grow with the number of
+    rollups. If another caller creates one of the new rollups first,
+    they are added one rollup at a time instead.
+    """
+    deltas = {
+        key: (amount, count)
+        for key, (amount, count) in deltas.items()
+        if amount or count
+    }
+    if len(deltas) <= SMALL_BATCH:
+        with transaction.atomic(savepoint=False):
+            for key in sorted(deltas, key=repr):
+                add_to_rollup(new_rollup(key, *deltas[key]))
+        return
+
+    business_ids, days, account_ids, _, _ = zip(*deltas)
+
+    with transaction.atomic(savepoint=False):
+        rollups = DailyFinancialRollup.objects\
+            .select_for_update()\
+            .filter(
+                business_id__in=set(business_ids),
+                date__in=set(days),
+                account_id__in=set(account_ids),
+            )\
+            .order_by('pk')
+        rollups = {rollup_key_of(rollup): rollup for rollup in rollups}
+
+        changed, created = [], []
+        for key, (amount, count) in deltas.items():
+            rollup = rollups.get(key)
+            if rollup:
+                rollup.amount += amount
+                rollup.count += count
+                changed.append(rollup)
+            else:
+                created.append(new_rollup(key, amount, count))
+
+        DailyFinancialRollup.objects.bulk_update(changed, ['amount', 'count'])
+
+        if not created:
+            return
+
+        try:
+            with transaction.atomic():
+                DailyFinancialRollup.objects.bulk_create(created)
+        except IntegrityError:
+            for rollup in created:
+                add_to_rollup(rollup)
+
+
+def rollup_key_of(rollup: DailyFinancialRollup) -> RollupKey:
+    return (
+        rollup.business_id,
+        rollup.date,
+        rollup.account_id,
+        rollup.category_id,
+        rollup.type,
+    )
+
+
+def new_rollup(
+        key: RollupKey,
+        amount: Decimal,
+        count: int,
+    ) -> DailyFinancialRollup:
+    business_id, day, account_id, category_id, type = key
+    return DailyFinancialRollup(
+        id=ulid.new().str,
+        business_id=business_id,
+        date=day,
+        account_id=account_id,
+        category_id=category_id,
+        type=type,
+        amount=amount,
+        count=count,
+    )
+
+
+def add_to_rollup(rollup: DailyFinancialRollup) -> None:
+    """
+    Adds the amount and count of the unsaved `rollup` to the stored one
+    with the same key, creating it if there is none.
+    """
+    business_id, day, account_id, category_id, type = rollup_key_of(rollup)
+    rollups = DailyFinancialRollup.objects.filter(
+        business_id=business_id,
+        date=day,
+        account_id=account_id,
+        category_id=category_id,
+        type=type,
+    )
+    change = {
+        'amount': F('amount') + rollup.amount,
+        'count': F('count') + rollup.count,
+    }
+
+    if rollups.update(**change):
+        return
+
+    try:
+        with transaction.atomic():
+            rollup.save(force_insert=True)
+    except IntegrityError:
+        rollups.update(**change)
+
+
+def rebuild_rollups(business=None, batch_size: int = 1000) -> int:
+    """
+    Replaces the rollups of `business`, or of every business, with
+    totals recomputed from the ledger in one aggregate query. Returns the
+    number of rollups written.
+
+    Transactions recorded while the rebuild runs may be counted twice or
+    not at all, so it is meant for repairs and backfills.
+    """
+    transactions = FinancialTransaction.objects.all()
+    rollups = DailyFinancialRollup.objects.all()
+    if business:
+        transactions = transactions.filter(business=business)
+        rollups = rollups.filter(business=business)
+
+    totals = transactions\
+        .annotate(day=TruncDate('timestamp'))\
+        .order_by()\
+        .values('business_id', 'day', 'account_id', 'category_id', 'type')\
+        .annotate(total=Sum('amount'), entries=Count('id'))
+
+    with transaction.atomic():
+        rollups.delete()
+        created = DailyFinancialRollup.objects.bulk_create(
+            [
+                new_rollup(
+                    (
+                        row['business_id'],
+                        row['day'],
+                        row['account_id'],
+                        row['category_id'],
+                        row['type'],
+                    ),
+                    row['total'],
+                    row['entries'],
+                )
+                for row in totals.iterator()
+            ],
+            batch_size=batch_size,
+        )
+
+    return len(created)
+
+
+def period_start(day: date, period: str) -> date:
+    """
+    First day of the `period` containing `day`. Weeks start on Sunday,
+    as in `get_start_and_end_date`.
+    """
+    if period == 'week':
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def summarize(
+        business,
+        period: str = 'day',
+        group_by: list[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        account=None,
+        category=None,
+    ) -> list[dict]:
+    """
+    Credits, debits and transfers of `business` per `period`, and per
+    account and/or category when listed in `group_by`, between `start`
+    and `end` inclusive. A `category` includes its subcategories.
+
+    Rows are aggregated per day in the database and folded into weeks or
+    months here, so weeks can start on Sunday on every backend.
+    """
+    group_by = [field for field in GROUPS if field in (group_by or [])]
+
+    rollups = business.financial_rollups.all()
+    if start:
+        rollups = rollups.filter(date__gte=start)
+    if end:
+        rollups = rollups.filter(date__lte=end)
+    if account:
+        rollups = rollups.filter(account=account)
+    if category:
+        rollups = rollups.filter(in_subtree(category))
+
+    fields = [f'{field}_id' for field in group_by]
+    rows = rollups\
+        .order_by()\
+        .values('date', *fields)\
+        .annotate(
+            entries=Sum('count'),
+            **{
+                type: Sum('amount', filter=Q(type=type), default=Decimal('0'))
+                for type in TYPES
+            },
+        )
+
+    summary = {}
+    for row in rows:
+        start_of_period = period_start(row['date'], period)
+        key = (start_of_period, *(row[field] for field in fields))
+
+        totals = summary.get(key)
+        if totals is None:
+            totals = summary[key] = {
+                'period': start_of_period,
+                **{group: row[f'{group}_id'] for group in group_by},
+                **{type: Decimal('0') for type in TYPES},
+                'total': Decimal('0'),
+                'count': 0,
+            }
+
+        for type in TYPES:
+            totals[type] += row[type]
+            totals['total'] += row[type]
+        totals['count'] += row['entries']
+
+    return sorted(
+        (totals for totals in summary.values() if totals['count']),
+        key=lambda totals: (
+            totals['period'],
+            *(totals[group] or '' for group in group_by),
+        ),
+    )
@@ -4,6 +4,8 @@ from django.db import transaction
 
 from .models import FinancialAccount, FinancialCategory, FinancialTransaction
 
+from shared.categories import serialize_category, validate_parent
+
 
 def complete_transfer(business, data, request, transaction):
     send_to = data.get('send_to', None)
@@ -31,26 +33,20 @@ def complete_transfer(business, data, request, transaction):
 
     return None
 
-def serialize_with_parents(category):
-    if category.parent:
-        return {
-            'id': category.id,
-            'name': category.name,
-            'is_active': category.is_active,
-            'parent': serialize_with_parents(category.parent)
-        }
-    return {
-        'id': category.id,
-        'name': category.name,
-        'is_active': category.is_active,
-        'parent': None
-    }
-
 
 class FinancialAccountSerializer(serializers.ModelSerializer):
     class Meta:
         model = FinancialAccount
         fields = '__all__'
+        # The balance is moved as deltas by the transactions.
+        read_only_fields = ['balance']
+
+
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=[*validated_data])
+        return instance
 
     
     def to_representation(self, instance):
@@ -71,10 +67,13 @@ class FinancialCategorySerializer(serializers.ModelSerializer):
         model = FinancialCategory
         fields = '__all__'
 
+
+    def validate(self, attrs):
+        return validate_parent(attrs, self.instance)
+
     def to_representation(self, instance):
-        super().to_representation(instance)
         return {
-            'category': serialize_with_parents(instance)
+            'category': serialize_category(instance, self.context)
         }
 
 
@@ -83,6 +82,13 @@ class FinancialTransactionSerializer(serializers.ModelSerializer):
         model = FinancialTransaction
         fields = '__all__'
         read_only_fields = ['timestamp', 'linked']
+        select_related = [
+            'category',
+            'operator',
+            'account',
+            'contact__customer',
+            'contact__supplier',
+        ]
 
     
     def to_representation(self, instance):
@@ -0,0 +1,80 @@
+"""
+Running balances of financial accounts.
+
+`FinancialAccount.balance` is maintained incrementally: every change to
+the ledger is applied as a delta with `F('balance') + delta`, which is
+O(1) and safe under concurrent writes. The reconciliation recomputes the
+balances from the ledger to catch any drift.
+
+Functions:
+- apply_balance_deltas: Adds the given amounts to the accounts' balances.
+- reconcile_balances: Finds (and optionally fixes) balances that drifted.
+"""
+
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from decimal import Decimal
+
+from .models import FinancialAccount, FinancialTransaction
+
+
+def apply_balance_deltas(deltas: dict[str, Decimal]) -> None:
+    """
+    Adds each delta to the balance of its account.
+
+    Accounts are updated in a stable order so that concurrent callers
+    touching the same accounts lock them in the same sequence.
+    """
+    with transaction.atomic():
+        for account_id in sorted(deltas):
+            delta = deltas[account_id]
+            if account_id and delta:
+                FinancialAccount.objects\
+                    .filter(pk=account_id)\
+                    .update(balance=F('balance') + delta)
+
+
+def ledger_total(account) -> Coalesce:
+    """
+    Expression with the sum of the ledger of `account` (an `OuterRef`
+    or an account id).
+    """
+    total = FinancialTransaction.objects\
+        .filter(account=account)\
+        .order_by()\
+        .values('account')\
+        .annotate(total=Sum('amount'))\
+        .values('total')
+
+    return Coalesce(
+        Subquery(total),
+        Value(Decimal('0')),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def reconcile_balances(fix: bool = False) -> list[dict]:
+    """
+    Compares every running balance with the sum of its ledger.
+
+    Returns the accounts that drifted as dicts with `id`, `balance` and
+    `ledger`. With `fix=True` their balance is reset to the ledger total
+    in a single UPDATE per account, so transactions inserted meanwhile are
+    not lost.
+    """
+    drifted = list(
+        FinancialAccount.objects
+            .annotate(ledger=ledger_total(OuterRef('pk')))
+            .exclude(balance=F('ledger'))
+            .values('id', 'balance', 'ledger')
+    )
+
+    if fix:
+        for account in drifted:
+            FinancialAccount.objects\
+                .filter(pk=account['id'])\
+                .update(balance=ledger_total(account['id']))
+
+    return drifted
@@ -1,11 +1,22 @@
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.db.models import Sum
 from django.apps import apps
 
+from collections import defaultdict
+from decimal import Decimal
+
 import ulid
 
-from .models import FinancialAccount, FinancialCategory, FinancialTransaction
+from .models import (
+    DailyFinancialRollup,
+    FinancialAccount,
+    FinancialCategory,
+    FinancialTransaction,
+)
+from .rollups import apply_rollup_deltas, rollup_key
+from .services import apply_balance_deltas
+
+from shared.categories import forget_category_tree, move_subtree, update_path
 
 
 Business = apps.get_model('business', 'Business')
@@ -19,21 +30,67 @@ def create_standard_financial_account(sender, instance, created, **kwargs):
 @receiver(pre_save, sender=FinancialAccount)
 @receiver(pre_save, sender=FinancialCategory)
 @receiver(pre_save, sender=FinancialTransaction)
+@receiver(pre_save, sender=DailyFinancialRollup)
 def generate_ulids(sender, instance, **kwargs):
     if not instance.id:
         instance.id = ulid.new().str
 
 @receiver(pre_save, sender=FinancialTransaction)
+def remember_previous_entry(sender, instance, **kwargs):
+    instance._previous_entry = None
+    if not instance._state.adding:
+        instance._previous_entry = FinancialTransaction.objects\
+            .filter(pk=instance.pk)\
+            .values(
+                'business_id',
+                'account_id',
+                'category_id',
+                'payment_id',
+                'amount',
+                'type',
+                'timestamp',
+            )\
+            .first()
+
+
 @receiver(post_save, sender=FinancialTransaction)
-@receiver(post_delete, sender=FinancialTransaction)
 def update_financial_account_balance(sender, instance, **kwargs):
-    financial_account = instance.account
-    total_amount = FinancialTransaction.objects\
-        .filter(account=financial_account)\
-        .aggregate(Sum('amount'))['amount__sum'] or 0
+    deltas = defaultdict(Decimal)
+
+    previous_entry = getattr(instance, '_previous_entry', None)
+    if previous_entry:
+        deltas[previous_entry['account_id']] -= previous_entry['amount']
+
+    deltas[instance.account_id] += Decimal(str(instance.amount))
+    apply_balance_deltas(deltas)
+
+
+@receiver(post_delete, sender=FinancialTransaction)
+def revert_financial_account_balance(sender, instance, **kwargs):
+    apply_balance_deltas(
+        {instance.account_id: -Decimal(str(instance.amount))}
+    )
+
+
+@receiver(post_save, sender=FinancialTransaction)
+def update_financial_rollups(sender, instance, **kwargs):
+    deltas = {}
+
+    previous_entry = getattr(instance, '_previous_entry', None)
+    if previous_entry:
+        deltas[rollup_key(previous_entry)] = (-previous_entry['amount'], -1)
+
+    key = rollup_key(instance)
+    amount, count = deltas.get(key, (Decimal('0'), 0))
+    deltas[key] = (amount + Decimal(str(instance.amount)), count + 1)
+    apply_rollup_deltas(deltas)
 
-    financial_account.balance = total_amount
-    financial_account.save()
+
+@receiver(post_delete, sender=FinancialTransaction)
+def revert_financial_rollups(sender, instance, **kwargs):
+    apply_rollup_deltas(
+        {rollup_key(instance): (-Decimal(str(instance.amount)), -1)}
+    )
 
 
 @receiver(post_save, sender=FinancialTransaction)
@@ -42,3 +99,24 @@ def link_transactions(sender, instance, created, **kwargs):
     if created and linked_transaction:
         linked_transaction.linked = instance
         linked_transaction.save()
+
+
+@receiver(pre_save, sender=FinancialCategory)
+def update_category_path(sender, instance, update_fields=None, **kwargs):
+    instance._previous_path = None
+    if update_fields is None or 'parent' in update_fields:
+        instance._previous_path = update_path(instance)
+
+
+@receiver(post_save, sender=FinancialCategory)
+def move_category_subtree(sender, instance, **kwargs):
+    previous_path = getattr(instance, '_previous_path', None)
+    if previous_path:
+        move_subtree(sender, previous_path, instance.path)
+        instance._previous_path = None
+
+
+@receiver(post_save, sender=FinancialCategory)
+@receiver(post_delete, sender=FinancialCategory)
+def forget_financial_category_tree(sender, instance, **kwargs):
+    forget_category_tree(FinancialCategory, instance.business_id)
@@ -0,0 +1,21 @@
+from celery import shared_task
+
+import logging
+
+from .services import reconcile_balances
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_financial_account_balances():
+    drifted = reconcile_balances(fix=True)
+    for account in drifted:
+        logger.warning(
+            'Financial account %s drifted: balance %s, ledger %s',
+            account['id'],
+            account['balance'],
+            account['ledger'],
+        )
+    return f'Reconciled {len(drifted)} financial accounts'
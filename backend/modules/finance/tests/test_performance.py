@@ -0,0 +1,167 @@
+from django.utils import timezone
+
+from datetime import timedelta
+from pathlib import Path
+
+import ulid
+
+from modules.finance.models import (
+    DailyFinancialRollup,
+    FinancialAccount,
+    FinancialCategory,
+    FinancialTransaction,
+)
+from modules.finance.views import (
+    FinancialAccountEndpoint,
+    FinancialCategoryEndpoint,
+    FinancialSummaryEndpoint,
+    FinancialTransactionEndpoint,
+)
+
+from shared.testing import PerformanceTestCase
+
+from .factories import UserFactory
+
+
+class FinancePerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def setUp(self):
+        super().setUp()
+        self.account = self.business.financial_accounts.get()
+        self.category = FinancialCategory.objects.create(
+            name='Sales', business=self.business
+        )
+        self.transaction = self.seed_transactions(1)[0]
+
+    def seed_accounts(self, count):
+        FinancialAccount.objects.bulk_create(
+            FinancialAccount(
+                id=ulid.new().str,
+                name=f'Account {n}',
+                business=self.business,
+                balance=n,
+            )
+            for n in range(count)
+        )
+
+    def seed_categories(self, count):
+        parents = []
+        categories = []
+        for n in range(count):
+            category = FinancialCategory(
+                id=ulid.new().str,
+                name=f'Category {ulid.new().str}',
+                business=self.business,
+                parent=parents[n % len(parents)] if n % 10 else None,
+            )
+            if n % 10 == 0:
+                parents.append(category)
+            categories.append(category)
+        FinancialCategory.objects.bulk_create(categories)
+
+    def seed_transactions(self, count):
+        return FinancialTransaction.objects.bulk_create(
+            FinancialTransaction(
+                id=ulid.new().str,
+                business=self.business,
+                operator=self.user,
+                account=self.account,
+                category=self.category,
+                amount=n % 100 + 1,
+                description=f'Sale {n}',
+                type='credit',
+            )
+            for n in range(count)
+        )
+
+    def seed_rollups(self, count):
+        today = timezone.localdate()
+        seeded = DailyFinancialRollup.objects.count()
+        DailyFinancialRollup.objects.bulk_create(
+            DailyFinancialRollup(
+                id=ulid.new().str,
+                business=self.business,
+                account=self.account,
+                category=self.category,
+                date=today - timedelta(days=seeded + n),
+                type='credit',
+                amount=100,
+                count=1,
+            )
+            for n in range(count)
+        )
+
+    def test_accounts(self):
+        self.assertWithinBudget(
+            'accounts.list',
+            self.seed_accounts,
+            self.request(FinancialAccountEndpoint, 'finance/accounts'),
+        )
+        self.assertWithinBudget(
+            'accounts.detail',
+            self.seed_accounts,
+            self.request(
+                FinancialAccountEndpoint,
+                'finance/accounts/id',
+                account_id=self.account.id,
+            ),
+        )
+
+    def test_categories(self):
+        self.assertWithinBudget(
+            'categories.list',
+            self.seed_categories,
+            self.request(FinancialCategoryEndpoint, 'finance/categories'),
+        )
+
+    def test_transactions(self):
+        endpoint = FinancialTransactionEndpoint
+        path = 'finance/transactions'
+
+        self.assertWithinBudget(
+            'transactions.list',
+            self.seed_transactions,
+            self.request(endpoint, path),
+        )
+        self.assertWithinBudget(
+            'transactions.cursor',
+            self.seed_transactions,
+            self.request(endpoint, f'{path}?limit=50'),
+        )
+        self.assertWithinBudget(
+            'transactions.search',
+            self.seed_transactions,
+            self.request(endpoint, f'{path}?search=Sale'),
+        )
+        self.assertWithinBudget(
+            'transactions.detail',
+            self.seed_transactions,
+            self.request(
+                endpoint, f'{path}/id', transaction_id=self.transaction.id
+            ),
+        )
+        self.assertWithinBudget(
+            'transactions.create',
+            self.seed_transactions,
+            self.request(endpoint, path, 'post', {
+                'account': self.account.id,
+                'category': self.category.id,
+                'amount': '10.00',
+                'type': 'credit',
+                'description': 'Sale',
+            }),
+        )
+
+    def test_summary(self):
+        start = timezone.localdate() - timedelta(days=90)
+        self.assertWithinBudget(
+            'summary',
+            self.seed_rollups,
+            self.request(
+                FinancialSummaryEndpoint,
+                'finance/summary?period=week&group_by=account,category'
+                f'&start_date={start:%Y-%m-%d}',
+            ),
+        )
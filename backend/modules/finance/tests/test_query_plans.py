@@ -0,0 +1,88 @@
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.test import TestCase
+
+from modules.accounts.models import Owner
+from modules.business.models import Business
+from modules.finance.models import FinancialCategory, FinancialTransaction
+from modules.finance.views import (
+    FinancialAccountEndpoint,
+    FinancialSummaryEndpoint,
+    FinancialTransactionEndpoint,
+)
+
+from shared.testing import QueryPlanMixin
+
+from .factories import UserFactory
+
+
+class FinanceQueryPlanTest(QueryPlanMixin, TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner.business = self.business
+        self.owner.save()
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+        self.account = self.business.financial_accounts.get()
+        self.category = FinancialCategory.objects.create(
+            name='Sales', business=self.business
+        )
+        for amount in [10, 20, -5]:
+            FinancialTransaction.objects.create(
+                business=self.business,
+                operator=self.user,
+                account=self.account,
+                category=self.category,
+                amount=amount,
+                description='Query Plan Test',
+                type='credit' if amount > 0 else 'debit',
+            )
+
+    def get(self, endpoint, path, **params):
+        def call():
+            request = self.factory.get(
+                path, params, HTTP_AUTHORIZATION=self.auth_header
+            )
+            response = endpoint.as_view()(request)
+            self.assertEqual(response.status_code, 200)
+        return call
+
+    def test_transaction_list(self):
+        tables = ['finance_financialtransaction']
+        endpoint = FinancialTransactionEndpoint
+
+        self.assertIndexScans(self.get(endpoint, 'transactions'), tables)
+        self.assertIndexScans(
+            self.get(endpoint, 'transactions', limit=10), tables
+        )
+        self.assertIndexScans(
+            self.get(endpoint, 'transactions', date='month'), tables
+        )
+        self.assertIndexScans(
+            self.get(endpoint, 'transactions', search='Query'), tables
+        )
+        self.assertIndexScans(
+            self.get(endpoint, 'transactions', category=self.category.id),
+            tables,
+        )
+
+    def test_account_list(self):
+        self.assertIndexScans(
+            self.get(FinancialAccountEndpoint, 'accounts'),
+            ['finance_financialaccount'],
+        )
+
+    def test_summary(self):
+        self.assertIndexScans(
+            self.get(FinancialSummaryEndpoint, 'summary', period='month'),
+            ['finance_dailyfinancialrollup'],
+        )
@@ -0,0 +1,241 @@
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from datetime import timedelta
+from io import StringIO
+
+from modules.accounts.models import Owner
+from modules.business.models import Business
+from modules.finance.models import (
+    DailyFinancialRollup,
+    FinancialAccount,
+    FinancialCategory,
+    FinancialTransaction,
+)
+from modules.finance.rollups import apply_rollup_deltas
+from modules.finance.views import FinancialSummaryEndpoint
+
+from .factories import UserFactory
+
+
+class DailyFinancialRollupTest(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.account = FinancialAccount.objects.create(
+            name='Bank',
+            business=self.business,
+        )
+        self.account2 = FinancialAccount.objects.create(
+            name='New Bank',
+            business=self.business,
+        )
+
+    def create_transaction(self, amount, account=None, category=None):
+        return FinancialTransaction.objects.create(
+            business=self.business,
+            operator=self.user,
+            account=account or self.account,
+            category=category,
+            amount=amount,
+            description='Rollup Test',
+            type='credit' if amount > 0 else 'debit',
+        )
+
+    def rollups(self):
+        return set(
+            DailyFinancialRollup.objects
+                .filter(count__gt=0)
+                .values_list('account_id', 'category_id', 'type', 'amount', 'count')
+        )
+
+    def test_rollups_on_create(self):
+        self.create_transaction(90)
+        self.create_transaction(10)
+        self.create_transaction(-15)
+        self.assertEqual(self.rollups(), {
+            (self.account.id, None, 'credit', 100, 2),
+            (self.account.id, None, 'debit', -15, 1),
+        })
+
+    def test_rollups_on_update(self):
+        category = FinancialCategory.objects.create(
+            name='Sales', business=self.business
+        )
+        transaction = self.create_transaction(90)
+        self.create_transaction(10)
+
+        transaction.account = self.account2
+        transaction.category = category
+        transaction.amount = 40
+        transaction.save()
+
+        self.assertEqual(self.rollups(), {
+            (self.account.id, None, 'credit', 10, 1),
+            (self.account2.id, category.id, 'credit', 40, 1),
+        })
+
+    def test_rollups_on_delete(self):
+        self.create_transaction(90)
+        self.create_transaction(30).delete()
+        self.assertEqual(self.rollups(), {
+            (self.account.id, None, 'credit', 90, 1),
+        })
+
+    def test_rollups_of_deleted_category_are_deleted(self):
+        category = FinancialCategory.objects.create(
+            name='Sales', business=self.business
+        )
+        self.create_transaction(100, category=category).delete()
+        category.delete()
+
+        self.assertFalse(
+            DailyFinancialRollup.objects.filter(category_id=category.id).exists()
+        )
+
+    def test_batches_of_deltas_are_applied_in_bulk(self):
+        today = timezone.localdate()
+        deltas = {
+            (self.business.id, today, account.id, None, type): (amount, 1)
+            for account in [self.account, self.account2]
+            for type, amount in [('credit', 10), ('debit', -5)]
+        }
+
+        apply_rollup_deltas(deltas)
+        with self.assertNumQueries(2):
+            # SELECT ... FOR UPDATE and one bulk UPDATE.
+            apply_rollup_deltas(deltas)
+
+        self.assertEqual(self.rollups(), {
+            (self.account.id, None, 'credit', 20, 2),
+            (self.account.id, None, 'debit', -10, 2),
+            (self.account2.id, None, 'credit', 20, 2),
+            (self.account2.id, None, 'debit', -10, 2),
+        })
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self.create_transaction(90)
+        self.create_transaction(-15, account=self.account2)
+        expected = self.rollups()
+
+        DailyFinancialRollup.objects.update(amount=0)
+        call_command('rebuild_financial_rollups', stdout=StringIO())
+
+        self.assertEqual(self.rollups(), expected)
+
+
+class FinancialSummaryEndpointViewTest(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner.business = self.business
+        self.owner.save()
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+        self.account = self.business.financial_accounts.get()
+
+        self.sales = FinancialCategory.objects.create(
+            name='Sales', business=self.business
+        )
+        self.online = FinancialCategory.objects.create(
+            name='Online', parent=self.sales, business=self.business
+        )
+        self.rent = FinancialCategory.objects.create(
+            name='Rent', business=self.business
+        )
+
+        today = timezone.localdate()
+        self.today = today
+        self.yesterday = today - timedelta(days=1)
+        for amount, category, day in [
+            (100, self.sales, today),
+            (50, self.online, today),
+            (30, self.online, self.yesterday),
+            (-70, self.rent, today),
+        ]:
+            transaction = FinancialTransaction.objects.create(
+                business=self.business,
+                operator=self.user,
+                account=self.account,
+                category=category,
+                amount=amount,
+                description='Summary Test',
+                type='credit' if amount > 0 else 'debit',
+            )
+            if day != today:
+                transaction.timestamp -= timedelta(days=1)
+                transaction.save()
+
+    def summary(self, **params):
+        request = self.factory.get(
+            'finance/summary',
+            params,
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        return FinancialSummaryEndpoint.as_view()(request)
+
+    def test_summary_by_day(self):
+        response = self.summary()
+        self.assertEqual(response.status_code, 200)
+
+        results = response.data['results']
+        self.assertEqual(
+            [(row['period'], row['credit'], row['debit'], row['count']) for row in results],
+            [(self.yesterday, 30, 0, 1), (self.today, 150, -70, 3)],
+        )
+
+    def test_summary_by_month_and_category(self):
+        response = self.summary(period='month', group_by='category')
+        self.assertEqual(response.status_code, 200)
+
+        totals = {}
+        for row in response.data['results']:
+            totals[row['category']] = totals.get(row['category'], 0) + row['total']
+        self.assertEqual(totals, {
+            self.sales.id: 100,
+            self.online.id: 80,
+            self.rent.id: -70,
+        })
+
+    def test_summary_of_category_includes_subcategories(self):
+        response = self.summary(category=self.sales.id, start_date=str(self.today))
+        self.assertEqual(response.status_code, 200)
+
+        results = response.data['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['credit'], 150)
+        self.assertEqual(results[0]['debit'], 0)
+
+    def test_invalid_parameters(self):
+        response = self.summary(period='year')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.summary(group_by='contact')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.summary(start_date='18/10/2026')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.summary(account='missing')
+        self.assertEqual(response.status_code, 404)
+
+    def test_user_without_business(self):
+        self.owner.business = None
+        self.owner.save()
+
+        response = self.summary()
+        self.assertEqual(response.status_code, 400)
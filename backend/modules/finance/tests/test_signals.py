@@ -0,0 +1,88 @@
+from django.test import TestCase
+
+from modules.business.models import Business
+from modules.finance.models import FinancialAccount, FinancialTransaction
+from modules.finance.serializers import FinancialAccountSerializer
+
+from .factories import UserFactory
+
+
+class FinancialAccountBalanceTest(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.account = FinancialAccount.objects.create(
+            name='Bank',
+            business=self.business,
+        )
+        self.account2 = FinancialAccount.objects.create(
+            name='New Bank',
+            business=self.business,
+        )
+
+    def create_transaction(self, amount, account=None):
+        return FinancialTransaction.objects.create(
+            business=self.business,
+            operator=self.user,
+            account=account or self.account,
+            amount=amount,
+            description='Balance Test',
+            type='credit' if amount > 0 else 'debit',
+        )
+
+    def balance(self, account):
+        return FinancialAccount.objects.get(id=account.id).balance
+
+    def test_balance_on_create(self):
+        self.create_transaction(90)
+        self.create_transaction(-15)
+        self.assertEqual(self.balance(self.account), 75)
+
+    def test_balance_on_amount_update(self):
+        transaction = self.create_transaction(90)
+        transaction.amount = 40
+        transaction.save()
+        self.assertEqual(self.balance(self.account), 40)
+
+    def test_balance_on_account_update(self):
+        transaction = self.create_transaction(90)
+        transaction.account = self.account2
+        transaction.save()
+        self.assertEqual(self.balance(self.account), 0)
+        self.assertEqual(self.balance(self.account2), 90)
+
+    def test_balance_on_delete(self):
+        self.create_transaction(90)
+        transaction = self.create_transaction(30)
+        transaction.delete()
+        self.assertEqual(self.balance(self.account), 90)
+
+    def test_account_update_keeps_concurrent_balance_changes(self):
+        account = FinancialAccount.objects.get(id=self.account.id)
+        self.create_transaction(90)
+
+        serializer = FinancialAccountSerializer(
+            instance=account,
+            data={'name': 'Renamed', 'balance': 1000},
+            partial=True,
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        account.is_active = False
+        account.save(update_fields=['is_active'])
+
+        account = FinancialAccount.objects.get(id=self.account.id)
+        self.assertEqual(account.name, 'Renamed')
+        self.assertEqual(account.balance, 90)
+
+    def test_balance_update_does_not_aggregate_ledger(self):
+        self.create_transaction(90)
+        with self.assertNumQueries(5):
+            # INSERT, then SAVEPOINT, balance UPDATE and RELEASE, and
+            # the UPDATE of the daily rollup.
+            self.create_transaction(10)
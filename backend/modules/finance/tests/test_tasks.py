@@ -0,0 +1,49 @@
+from django.test import TestCase, override_settings
+
+from modules.business.models import Business
+from modules.finance.models import FinancialAccount, FinancialTransaction
+
+from .factories import UserFactory
+
+from .. import tasks
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+class ReconcileFinancialAccountBalances(TestCase):
+    def setUp(self):
+        business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.account = FinancialAccount.objects.create(
+            name='Bank',
+            business=business,
+        )
+        FinancialTransaction.objects.create(
+            business=business,
+            operator=UserFactory(),
+            account=self.account,
+            amount=90,
+            description='Reconciliation Test',
+            type='credit',
+        )
+
+    def test_balances_in_sync(self):
+        result = tasks.reconcile_financial_account_balances.apply()
+        self.assertTrue(result.successful())
+        self.assertEqual(result.result, 'Reconciled 0 financial accounts')
+
+    def test_drifted_balance_is_fixed(self):
+        FinancialAccount.objects.filter(id=self.account.id).update(balance=7)
+
+        with self.assertLogs('modules.finance.tasks', 'WARNING') as logs:
+            result = tasks.reconcile_financial_account_balances.apply()
+        self.assertEqual(result.result, 'Reconciled 1 financial accounts')
+        self.assertIn(
+            f'Financial account {self.account.id} drifted: balance 7.00',
+            logs.output[0],
+        )
+
+        account = FinancialAccount.objects.get(id=self.account.id)
+        self.assertEqual(account.balance, 90)
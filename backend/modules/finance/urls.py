@@ -28,4 +28,8 @@ urlpatterns = [
         '/transactions/<str:transaction_id>',
         views.FinancialTransactionEndpoint.as_view()
     ),
+    path(
+        '/summary',
+        views.FinancialSummaryEndpoint.as_view()
+    ),
 ]
@@ -14,6 +14,7 @@ from .serializers import (
     FinancialCategorySerializer,
     FinancialTransactionSerializer,
 )
+from .rollups import GROUPS, PERIODS, summarize
 
 from shared import (
     error,
@@ -25,6 +26,7 @@ from shared import (
     get_user_business,
     get_start_and_end_date
 )
+from shared.categories import in_subtree
 
 
 class FinancialAccountEndpoint(APIView):
@@ -48,8 +50,7 @@ class FinancialAccountEndpoint(APIView):
             serializer = FinancialAccountSerializer(account)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = FinancialAccountSerializer(accounts, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(accounts, request, 50, FinancialAccountSerializer)
             return paginated_data
 
 
@@ -141,7 +142,7 @@ class FinancialAccountEndpoint(APIView):
             return Response(error_response, status.HTTP_404_NOT_FOUND)
         
         account.is_active = False
-        account.save()
+        account.save(update_fields=['is_active'])
 
         data = {
             'account': {
@@ -174,8 +175,9 @@ class FinancialCategoryEndpoint(APIView):
             serializer = FinancialCategorySerializer(category)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = FinancialCategorySerializer(categories, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(
+                categories.all(), request, 50, FinancialCategorySerializer
+            )
             return paginated_data
 
 
@@ -294,6 +296,7 @@ class FinancialTransactionEndpoint(APIView):
         else:
             search = request.query_params.get('search')
             bank = request.query_params.get('bank')
+            category_id = request.query_params.get('category')
             date = request.query_params.get('date')
             start_date = request.query_params.get('start_date')
             end_date = request.query_params.get('end_date')
@@ -313,6 +316,18 @@ class FinancialTransactionEndpoint(APIView):
                     Q(id__exact=search)
                 )
 
+            if category_id:
+                category = business.financial_categories\
+                    .filter(id=category_id)\
+                    .first()
+
+                if not category:
+                    message = 'Financial category not found.'
+                    error_response = error.builder(404, message)
+                    return Response(error_response, status.HTTP_404_NOT_FOUND)
+
+                transactions = transactions.filter(in_subtree(category))
+
             if bank:
                 if len(bank) < 3:
                     error_response = error.builder(400, 'Enter at least 3 characters.')
@@ -372,8 +387,13 @@ class FinancialTransactionEndpoint(APIView):
                     Q(timestamp__range=[start_date, end_date])
                 )
 
-            serializer = FinancialTransactionSerializer(transactions, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(
+                transactions,
+                request,
+                50,
+                FinancialTransactionSerializer,
+                cursor=True,
+            )
 
             return paginated_data
 
@@ -458,3 +478,83 @@ class FinancialTransactionEndpoint(APIView):
         transaction.delete()
 
         return Response(data, status.HTTP_200_OK)
+
+
+class FinancialSummaryEndpoint(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
+
+    def get(self, request):
+        business, got_no_business = get_user_business(request.user)
+
+        if got_no_business:
+            return Response(got_no_business, status.HTTP_400_BAD_REQUEST)
+
+        period = request.query_params.get('period', 'day')
+        group_by = request.query_params.get('group_by', '')
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        account_id = request.query_params.get('account')
+        category_id = request.query_params.get('category')
+
+        group_by = [group for group in group_by.split(',') if group]
+
+        if period not in PERIODS:
+            message = f'Pick a period among: {", ".join(PERIODS)}.'
+            error_response = error.builder(400, message)
+            return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+        if any(group not in GROUPS for group in group_by):
+            message = f'Group by any of: {", ".join(GROUPS)}.'
+            error_response = error.builder(400, message)
+            return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+        dates = {}
+        for name, value in [('start', start_date), ('end', end_date)]:
+            if not value:
+                continue
+
+            try:
+                if not validate.date(value):
+                    raise ValueError
+                dates[name] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                message = 'Make sure the date is in the format: YYYY-MM-DD.'
+                error_response = error.builder(400, message)
+                return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+        account = None
+        if account_id:
+            account = business.financial_accounts.filter(id=account_id).first()
+
+            if not account:
+                error_response = error.builder(404, 'Account not found.')
+                return Response(error_response, status.HTTP_404_NOT_FOUND)
+
+        category = None
+        if category_id:
+            category = business.financial_categories\
+                .filter(id=category_id)\
+                .first()
+
+            if not category:
+                message = 'Financial category not found.'
+                error_response = error.builder(404, message)
+                return Response(error_response, status.HTTP_404_NOT_FOUND)
+
+        results = summarize(
+            business,
+            period=period,
+            group_by=group_by,
+            account=account,
+            category=category,
+            **dates,
+        )
+
+        data = {
+            'period': period,
+            'group_by': [group for group in GROUPS if group in group_by],
+            'results': results,
+        }
+
+        return Response(data, status.HTTP_200_OK)
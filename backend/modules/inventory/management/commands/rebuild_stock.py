@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.business.models import Business
+
+from ...services import rebuild_stock
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes inventory quantities and product stock '
+        'from the inventory movement log.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--business',
+            help='ID of the business to rebuild. Defaults to all businesses.',
+        )
+
+    def handle(self, *args, **options):
+        business = None
+
+        if business_id := options['business']:
+            business = Business.objects.filter(id=business_id).first()
+            if not business:
+                raise CommandError(f'Business {business_id} not found.')
+
+        rebuilt = rebuild_stock(business)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt stock of {rebuilt} inventories.')
+        )
@@ -8,6 +8,16 @@ class InventorySerializer(serializers.ModelSerializer):
         model = Inventory
         fields = '__all__'
         read_only_fields = ['quantity', 'reserved', 'product']
+        select_related = ['product']
+
+
+    def update(self, instance, validated_data):
+        # The quantity is moved as deltas by the inventory movements,
+        # so it is left out of the row written back here.
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=[*validated_data])
+        return instance
 
     
     def to_representation(self, instance):
@@ -33,6 +43,7 @@ class InventoryTransactionSerializer(serializers.ModelSerializer):
         model = InventoryTransaction
         fields = '__all__'
         read_only_fields = ['date']
+        select_related = ['inventory__product']
 
 
     def to_representation(self, instance):
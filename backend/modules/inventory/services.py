@@ -0,0 +1,93 @@
+"""
+Stock counters of inventories and products.
+
+`Inventory.quantity` and `Product.stock` are maintained incrementally:
+every inventory movement is applied to both as a delta with
+`F(...) + delta` inside one transaction. `rebuild_stock` recomputes them
+from the movement log when drift is suspected.
+
+Functions:
+- apply_stock_deltas: Adds the given quantities to inventories and products.
+- rebuild_stock: Resets drifted counters to the sum of their movements.
+"""
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from modules.products.lookup import forget_inventories
+from modules.products.models import Product
+
+from .models import Inventory, InventoryTransaction
+
+
+def apply_stock_deltas(deltas: dict[str, int]) -> None:
+    """
+    Adds each delta to the quantity of its inventory and to the stock of
+    the inventory's product.
+    """
+    with transaction.atomic():
+        for inventory_id in sorted(deltas):
+            delta = deltas[inventory_id]
+            if not inventory_id or not delta:
+                continue
+
+            Inventory.objects\
+                .filter(pk=inventory_id)\
+                .update(quantity=F('quantity') + delta)
+            Product.objects\
+                .filter(inventory__pk=inventory_id)\
+                .update(stock=F('stock') + delta)
+
+    forget_inventories(deltas)
+
+
+def movements_total(inventory) -> Coalesce:
+    """
+    Expression with the sum of the movements of `inventory` (an
+    `OuterRef` or an inventory id).
+    """
+    total = InventoryTransaction.objects\
+        .filter(inventory=inventory)\
+        .order_by()\
+        .values('inventory')\
+        .annotate(total=Sum('quantity'))\
+        .values('total')
+
+    return Coalesce(Subquery(total), Value(0))
+
+
+def rebuild_stock(business=None) -> int:
+    """
+    Recomputes the counters whose inventory quantity or product stock
+    differs from the movement log, optionally for a single business.
+
+    Returns the number of inventories that were rebuilt.
+    """
+    inventories = Inventory.objects.annotate(
+        movements=movements_total(OuterRef('pk'))
+    )
+
+    if business:
+        inventories = inventories.filter(product__business=business)
+
+    drifted = inventories\
+        .filter(
+            ~Q(quantity=F('movements')) |
+            ~Q(product__stock=F('movements'))
+        )\
+        .values_list('id', 'product_id')
+
+    rebuilt = 0
+    for inventory_id, product_id in drifted:
+        with transaction.atomic():
+            Inventory.objects\
+                .filter(pk=inventory_id)\
+                .update(quantity=movements_total(inventory_id))
+            Product.objects\
+                .filter(pk=product_id)\
+                .update(stock=movements_total(inventory_id))
+        forget_inventories([inventory_id])
+        rebuilt += 1
+
+    return rebuilt
@@ -2,10 +2,11 @@ import ulid
 
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.db import transaction
-from django.db.models import Sum
+
+from collections import defaultdict
 
 from .models import Inventory, InventoryTransaction
+from .services import apply_stock_deltas
 
 
 @receiver(pre_save, sender=Inventory)
@@ -16,18 +17,27 @@ def generate_ulids(sender, instance, **kwargs):
 
 
 @receiver(pre_save, sender=InventoryTransaction)
+def remember_previous_movement(sender, instance, **kwargs):
+    instance._previous_movement = None
+    if not instance._state.adding:
+        instance._previous_movement = InventoryTransaction.objects\
+            .filter(pk=instance.pk)\
+            .values('inventory_id', 'quantity')\
+            .first()
+
+
 @receiver(post_save, sender=InventoryTransaction)
-@receiver(post_delete, sender=InventoryTransaction)
 def update_inventory_quantity(sender, instance, **kwargs):
-    with transaction.atomic():
-        inventory = instance.inventory
-        product = inventory.product
-
-        total_quantity = InventoryTransaction.objects\
-            .filter(inventory=inventory)\
-            .aggregate(Sum('quantity'))['quantity__sum'] or 0
-
-        inventory.quantity = total_quantity
-        product.stock = total_quantity
-        inventory.save()
-        product.save()
+    deltas = defaultdict(int)
+
+    previous_movement = getattr(instance, '_previous_movement', None)
+    if previous_movement:
+        deltas[previous_movement['inventory_id']] -= previous_movement['quantity']
+
+    deltas[instance.inventory_id] += int(instance.quantity)
+    apply_stock_deltas(deltas)
+
+
+@receiver(post_delete, sender=InventoryTransaction)
+def revert_inventory_quantity(sender, instance, **kwargs):
+    apply_stock_deltas({instance.inventory_id: -int(instance.quantity)})
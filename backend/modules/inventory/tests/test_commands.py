@@ -0,0 +1,45 @@
+from django.core.management import call_command
+from django.test import TestCase
+
+from io import StringIO
+
+from modules.business.models import Business
+from modules.products.models import Product
+from modules.inventory.models import Inventory, InventoryTransaction
+
+
+class RebuildStockCommandTest(TestCase):
+    def setUp(self):
+        business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.product = Product.objects.create(
+            name='Test Product',
+            business=business,
+        )
+        self.inventory = Inventory.objects.create(product=self.product)
+
+        InventoryTransaction.objects.create(
+            inventory=self.inventory,
+            type='inbound',
+            quantity=7,
+        )
+
+    def test_rebuild_drifted_stock(self):
+        Inventory.objects.filter(id=self.inventory.id).update(quantity=2)
+        Product.objects.filter(id=self.product.id).update(stock=9)
+
+        output = StringIO()
+        call_command('rebuild_stock', stdout=output)
+
+        inventory = Inventory.objects.get(id=self.inventory.id)
+        self.assertIn('Rebuilt stock of 1 inventories.', output.getvalue())
+        self.assertEqual(inventory.quantity, 7)
+        self.assertEqual(inventory.product.stock, 7)
+
+    def test_rebuild_stock_in_sync(self):
+        output = StringIO()
+        call_command('rebuild_stock', stdout=output)
+        self.assertIn('Rebuilt stock of 0 inventories.', output.getvalue())
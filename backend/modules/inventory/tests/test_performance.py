@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import ulid
+
+from modules.inventory.models import Inventory, InventoryTransaction
+from modules.inventory.views import InventoryEndpoint, InventoryTransactionEndpoint
+from modules.products.models import Product
+
+from shared.testing import PerformanceTestCase
+
+from .factories import UserFactory
+
+
+class InventoryPerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def setUp(self):
+        super().setUp()
+        product = Product.objects.create(name='Rice', business=self.business)
+        self.inventory = Inventory.objects.create(product=product)
+
+    def seed_inventory(self, count):
+        # Inventory rows come with their products, which the products
+        # suite creates through its endpoint (`products.create`).
+        products = Product.objects.bulk_create(
+            (
+                Product(
+                    id=ulid.new().str,
+                    name=f'Product {ulid.new().str}',
+                    business=self.business,
+                )
+                for _ in range(count)
+            ),
+            batch_size=5000,
+        )
+        Inventory.objects.bulk_create(
+            (
+                Inventory(id=ulid.new().str, product=product)
+                for product in products
+            ),
+            batch_size=5000,
+        )
+
+    def test_inventory(self):
+        self.assertWithinBudget(
+            'inventory.list',
+            self.seed_inventory,
+            self.request(InventoryEndpoint, 'inventory'),
+        )
+        self.assertWithinBudget(
+            'inventory.detail',
+            self.seed_inventory,
+            self.request(
+                InventoryEndpoint,
+                'inventory/id',
+                inventory_id=self.inventory.id,
+            ),
+        )
+        self.assertWithinBudget(
+            'inventory.update',
+            self.seed_inventory,
+            self.request(
+                InventoryEndpoint,
+                'inventory/id',
+                'patch',
+                {'location': 'Shelf 1'},
+                inventory_id=self.inventory.id,
+            ),
+        )
+
+    def seed_transactions(self, count):
+        InventoryTransaction.objects.bulk_create(
+            (
+                InventoryTransaction(
+                    id=ulid.new().str,
+                    inventory=self.inventory,
+                    type='inbound',
+                    quantity=1,
+                )
+                for _ in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def test_transactions(self):
+        endpoint = InventoryTransactionEndpoint
+        path = 'inventory/id/transactions'
+
+        self.assertWithinBudget(
+            'transactions.list',
+            self.seed_transactions,
+            self.request(endpoint, path, inventory_id=self.inventory.id),
+        )
+        transaction = InventoryTransaction.objects.create(
+            inventory=self.inventory, type='inbound', quantity=1
+        )
+        self.assertWithinBudget(
+            'transactions.detail',
+            self.seed_transactions,
+            self.request(
+                endpoint,
+                'inventory/transactions/id',
+                transaction_id=transaction.id,
+            ),
+        )
+        self.assertWithinBudget(
+            'transactions.outbound',
+            self.seed_transactions,
+            self.request(
+                endpoint,
+                path,
+                'post',
+                {'type': 'outbound', 'quantity': 1, 'unit_price': 10},
+                inventory_id=self.inventory.id,
+            ),
+        )
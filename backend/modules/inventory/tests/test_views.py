@@ -5,10 +5,12 @@ from django.test import TestCase
 
 from .factories import UserFactory
 
+from shared.testing import QueryCountMixin
+
 from modules.accounts.models import Owner
 from modules.business.models import Business
 from modules.products.models import Product
-from modules.inventory.models import Inventory
+from modules.inventory.models import Inventory, InventoryTransaction
 
 from modules.inventory.views import (
     InventoryEndpoint,
@@ -44,7 +46,7 @@ class InventoryEndpointViewTest(TestCase):
 
 
 
-class InventoryTransactionEndpointViewTest(TestCase):
+class InventoryTransactionEndpointViewTest(QueryCountMixin, TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
         self.user = UserFactory()
@@ -114,6 +116,29 @@ class InventoryTransactionEndpointViewTest(TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(inventory.product.stock, -1)
 
+    def test_update_inventory_transaction_quantity(self):
+        inventory = self.product.inventory
+        transaction = InventoryTransaction.objects.create(
+            inventory=inventory,
+            type='inbound',
+            quantity=3,
+        )
+
+        request = self.factory.patch(
+            'inventory/transactions/<transaction_id>',
+            data={'quantity': 5},
+            HTTP_AUTHORIZATION=self.auth_header,
+        )
+        response = InventoryTransactionEndpoint.as_view()(
+            request,
+            transaction_id=transaction.id,
+        )
+
+        inventory = Inventory.objects.get(id=inventory.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(inventory.quantity, 5)
+        self.assertEqual(inventory.product.stock, 5)
+
     def test_delete_inventory_transaction(self):
         data = {'type': 'inbound', 'quantity': 3}
         request = self.factory.post(
@@ -148,3 +173,28 @@ class InventoryTransactionEndpointViewTest(TestCase):
         inventory = Inventory.objects.get(id=inventory_id)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['transaction']['deleted'], True)
+        self.assertEqual(inventory.product.stock, 0)
+
+    def test_list_inventory_transactions_constant_queries(self):
+        inventory = self.product.inventory
+
+        def seed(count):
+            for _ in range(count):
+                InventoryTransaction.objects.create(
+                    inventory=inventory,
+                    type='inbound',
+                    quantity=1,
+                )
+
+        def list_transactions():
+            request = self.factory.get(
+                'inventory/<inventory_id>/transactions',
+                HTTP_AUTHORIZATION=self.auth_header,
+            )
+            response = InventoryTransactionEndpoint.as_view()(
+                request,
+                inventory_id=inventory.id,
+            )
+            self.assertEqual(response.status_code, 200)
+
+        self.assertConstantQueries(seed, list_transactions)
@@ -38,8 +38,7 @@ class InventoryEndpoint(APIView):
             serializer = InventorySerializer(inventory)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = InventorySerializer(fetch_inventory, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(fetch_inventory, request, 50, InventorySerializer)
             return paginated_data
 
 
@@ -114,8 +113,13 @@ class InventoryTransactionEndpoint(APIView):
             serializer = InventoryTransactionSerializer(transaction)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = InventoryTransactionSerializer(transactions, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(
+                transactions,
+                request,
+                50,
+                InventoryTransactionSerializer,
+                cursor=True,
+            )
             return paginated_data
 
 
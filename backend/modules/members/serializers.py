@@ -12,6 +12,7 @@ class MemberSerializer(serializers.ModelSerializer):
     class Meta:
         model = Member
         fields = '__all__'
+        select_related = ['credential']
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -1,8 +1,12 @@
-from django.db.models.signals import pre_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
 import ulid
 
+from modules.accounts.tokens import revoke_tokens
+
+from shared.tenancy import bump_tenancy_version
+
 from .models import Member
 
 
@@ -18,3 +22,43 @@ def delete_member_credentials(sender, instance, **kwargs):
     credential = member.credential
     if credential:
         credential.delete()
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def retire_cached_tenancy(sender, instance, **kwargs):
+    bump_tenancy_version()
+
+
+@receiver(pre_save, sender=Member)
+def remember_previous_credential(sender, instance, **kwargs):
+    instance._previous_membership = None
+    if not instance._state.adding:
+        instance._previous_membership = Member.objects\
+            .filter(pk=instance.pk)\
+            .values_list('credential_id', 'business_id')\
+            .first()
+
+
+@receiver(post_save, sender=Member)
+def revoke_member_tokens(sender, instance, created, **kwargs):
+    """
+    Revokes the tokens of the users who gain or lose the member role, and
+    of the member moved to another business.
+    """
+    previous_credential_id, previous_business_id = getattr(
+        instance, '_previous_membership', None
+    ) or (None, None)
+
+    if created:
+        revoke_tokens(instance.credential_id)
+    elif previous_credential_id != instance.credential_id:
+        revoke_tokens(previous_credential_id)
+        revoke_tokens(instance.credential_id)
+    elif previous_business_id != instance.business_id:
+        revoke_tokens(instance.credential_id)
+
+
+@receiver(post_delete, sender=Member)
+def revoke_deleted_member_tokens(sender, instance, **kwargs):
+    revoke_tokens(instance.credential_id)
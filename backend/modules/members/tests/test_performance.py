@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import itertools
+import ulid
+
+from modules.members.models import Member
+from modules.members.views import MemberEndpoint
+
+from shared.testing import PerformanceTestCase
+
+from .factories import UserFactory
+
+
+class MembersPerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def setUp(self):
+        super().setUp()
+        # Phones and emails are unique, so every member gets a number.
+        self.numbers = itertools.count()
+        self.member = Member.objects.create(**self.member_data())
+
+    def member_data(self):
+        n = next(self.numbers)
+        return {
+            'business': self.business,
+            'name': f'Member {n}',
+            'phone': f'{n:011}',
+            'email': f'member{n}@depoc.com.br',
+        }
+
+    def seed_members(self, count):
+        Member.objects.bulk_create(
+            (
+                Member(id=ulid.new().str, **self.member_data())
+                for _ in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def test_members(self):
+        self.assertWithinBudget(
+            'members.list',
+            self.seed_members,
+            self.request(MemberEndpoint, 'members'),
+        )
+        self.assertWithinBudget(
+            'members.detail',
+            self.seed_members,
+            self.request(MemberEndpoint, 'members/id', member_id=self.member.id),
+        )
+
+        def new_member():
+            data = self.member_data()
+            data['business'] = self.business.id
+            data['has_access'] = True
+            return data
+
+        self.assertWithinBudget(
+            'members.create',
+            self.seed_members,
+            self.request(MemberEndpoint, 'members', 'post', new_member),
+        )
@@ -37,8 +37,7 @@ class MemberEndpoint(APIView):
             serializer = MemberSerializer(member)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = MemberSerializer(members, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(members.all(), request, 50, MemberSerializer)
             return paginated_data
 
 
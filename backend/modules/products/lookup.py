@@ -0,0 +1,70 @@
+"""
+Barcode and SKU lookups for point-of-sale scanning.
+
+A scan resolves `(business, barcode)` or `(business, sku)` through the
+composite indexes of `Product` and is answered from a per-tenant LRU
+cache afterwards. An entry is dropped when its product is saved or
+deleted, or its stock moves, within this process; other processes see
+the change once the entry expires (`PRODUCT_LOOKUP_CACHE_TTL`).
+
+Functions:
+- lookup_product: Compact payload of the product with a barcode or SKU.
+- forget_products: Drops the cached lookups of products.
+- forget_inventories: Drops the cached lookups of the products of inventories.
+"""
+
+from django.conf import settings
+from django.db.models import F, Q
+
+from shared.cache import TenantLRUCache
+
+from .models import Product
+from .serializers import ProductLookupSerializer
+
+
+cache = TenantLRUCache(
+    maxsize=settings.PRODUCT_LOOKUP_CACHE_SIZE,
+    ttl=settings.PRODUCT_LOOKUP_CACHE_TTL,
+)
+
+
+def lookup_product(business, code: str) -> dict | None:
+    """
+    The active product of `business` whose barcode or SKU is `code`,
+    barcodes first, or None.
+    """
+    product = cache.get(business.id, code)
+    if product is not None:
+        return product
+
+    matches = Product.objects\
+        .filter(business=business, is_active=True)\
+        .filter(Q(barcode=code) | Q(sku=code))\
+        .annotate(inventory_id=F('inventory__id'))\
+        .order_by('pk')[:2]
+    match = min(matches, key=lambda product: product.barcode != code, default=None)
+
+    if not match:
+        return None
+
+    product = dict(ProductLookupSerializer(match).data)
+    cache.set(
+        business.id,
+        code,
+        product,
+        tags=[('product', match.id), ('inventory', match.inventory_id)],
+    )
+    return product
+
+
+def forget_products(business_id: str, product_ids, codes=()) -> None:
+    """
+    Drops the lookups of `product_ids`, whatever code they were found
+    by, and the lookups of `codes`, which may now resolve to one of them.
+    """
+    cache.invalidate(*[('product', product_id) for product_id in product_ids])
+    cache.discard(business_id, *filter(None, codes))
+
+
+def forget_inventories(inventory_ids) -> None:
+    cache.invalidate(*[('inventory', inventory_id) for inventory_id in inventory_ids])
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0001_initial'),
+        ('contacts', '0002_search_document'),
+        ('products', '0002_alter_product_cost_price'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['business', 'barcode'], name='product_business_barcode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['business', 'sku'], name='product_business_sku_idx'),
+        ),
+    ]
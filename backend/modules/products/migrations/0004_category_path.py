@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+from shared.categories import rebuild_paths
+
+
+def fill_category_paths(apps, schema_editor):
+    rebuild_paths(apps.get_model('products', 'ProductCategory'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0001_initial'),
+        ('products', '0003_product_code_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productcategory',
+            name='path',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='productcategory',
+            index=models.Index(fields=['path'], name='product_category_path_idx', opclasses=['text_pattern_ops']),
+        ),
+        migrations.RunPython(fill_category_paths, migrations.RunPython.noop),
+    ]
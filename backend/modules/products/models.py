@@ -69,6 +69,19 @@ class Product(models.Model):
     track_stock = models.BooleanField(default=True)
     is_active = models.BooleanField(default=True)
 
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['business', 'barcode'],
+                name='product_business_barcode_idx',
+            ),
+            models.Index(
+                fields=['business', 'sku'],
+                name='product_business_sku_idx',
+            ),
+        ]
+
     
     def __str__(self):
         return self.name
@@ -99,6 +112,19 @@ class ProductCategory(models.Model):
     name = models.CharField(max_length=150, unique=True)
     is_active = models.BooleanField(default=True)
 
+    # Ids from the root category down to this one, each followed by '/'.
+    path = models.TextField(blank=True, default='', editable=False)
+
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['path'],
+                name='product_category_path_idx',
+                opclasses=['text_pattern_ops'],
+            ),
+        ]
+
 
     def __str__(self):
         return self.name
@@ -6,27 +6,15 @@ from .models import Product, ProductCategory, ProductCostHistory
 
 from modules.inventory.models import Inventory, InventoryTransaction
 
-
-def serialize_with_parents(category):
-    if category.parent:
-        return {
-            'id': category.id,
-            'name': category.name,
-            'is_active': category.is_active,
-            'parent': serialize_with_parents(category.parent)
-        }
-    return {
-        'id': category.id,
-        'name': category.name,
-        'is_active': category.is_active,
-        'parent': None
-    }
+from shared.categories import serialize_category, validate_parent
 
 
 class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = '__all__'
+        select_related = ['category']
+        prefetch_related = ['supplier']
 
 
     def to_representation(self, instance):
@@ -56,32 +44,83 @@ class ProductSerializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def create(self, validated_data):
+        # Stock is derived from the inventory movements,
+        # so the initial quantity enters as an inbound movement.
+        stock = validated_data.pop('stock', 0)
         product = super().create(validated_data)
 
         inventory = Inventory.objects.create(product=product)
 
-        if product.stock > 0:
+        if stock > 0:
             InventoryTransaction.objects.create(
                 type='inbound',
                 inventory=inventory,
-                quantity=product.stock,
+                quantity=stock,
                 unit_cost=product.cost_price,
                 description='Initial inbound quantity.'
             )
+            product.stock = stock
 
         return product
 
 
+    def update(self, instance, validated_data):
+        # Stock is moved as deltas by the inventory movements,
+        # so it is left out of the row written back here.
+        validated_data.pop('stock', None)
+        supplier = validated_data.pop('supplier', None)
+
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=[*validated_data])
+
+        if supplier is not None:
+            instance.supplier.set(supplier)
+
+        return instance
+
+
+class ProductLookupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = [
+            'id',
+            'name',
+            'sku',
+            'barcode',
+            'unit',
+            'retail_price',
+            'discounted_price',
+            'stock',
+            'track_stock',
+            'is_available',
+        ]
+
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        discounted_price = representation['discounted_price']
+        return {
+            'product': {
+                **representation,
+                'price': discounted_price or representation['retail_price'],
+            }
+        }
+
+
 class ProductCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = ProductCategory
         fields = '__all__'
 
 
+    def validate(self, attrs):
+        return validate_parent(attrs, self.instance)
+
+
     def to_representation(self, instance):
-        super().to_representation(instance)
         return {
-            'category': serialize_with_parents(instance)
+            'category': serialize_category(instance, self.context)
         }
 
 
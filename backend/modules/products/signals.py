@@ -1,13 +1,44 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 
 import ulid
 
+from .lookup import forget_products
 from .models import Product, ProductCategory, ProductCostHistory
 
+from shared.categories import forget_category_tree, move_subtree, update_path
+
 @receiver(pre_save, sender=Product)
 @receiver(pre_save, sender=ProductCategory)
 @receiver(pre_save, sender=ProductCostHistory)
 def generate_ulids(sender, instance, **kwargs):
     if not instance.id:
         instance.id = ulid.new().str
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def forget_product_lookups(sender, instance, **kwargs):
+    codes = [instance.barcode, instance.sku]
+    forget_products(instance.business_id, [instance.id], codes)
+
+
+@receiver(pre_save, sender=ProductCategory)
+def update_category_path(sender, instance, update_fields=None, **kwargs):
+    instance._previous_path = None
+    if update_fields is None or 'parent' in update_fields:
+        instance._previous_path = update_path(instance)
+
+
+@receiver(post_save, sender=ProductCategory)
+def move_category_subtree(sender, instance, **kwargs):
+    previous_path = getattr(instance, '_previous_path', None)
+    if previous_path:
+        move_subtree(sender, previous_path, instance.path)
+        instance._previous_path = None
+
+
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+def forget_product_category_tree(sender, instance, **kwargs):
+    forget_category_tree(ProductCategory, instance.business_id)
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import ulid
+
+from modules.products.lookup import forget_products
+from modules.products.models import Product, ProductCategory
+from modules.products.views import (
+    ProductCategoryEndpoint,
+    ProductEndpoint,
+    ProductLookupEndpoint,
+    ProductSearchEndpoint,
+)
+
+from shared.testing import PerformanceTestCase
+
+from .factories import UserFactory
+
+
+class ProductPerformanceTest(PerformanceTestCase):
+    budgets_file = Path(__file__).with_name('budgets.json')
+    user_factory = UserFactory
+
+    def setUp(self):
+        super().setUp()
+        self.category = ProductCategory.objects.create(
+            name='Food', business=self.business
+        )
+        self.product = Product.objects.create(
+            name='Rice',
+            sku='RICE',
+            barcode='7890000000000',
+            category=self.category,
+            business=self.business,
+        )
+
+    def seed_products(self, count):
+        Product.objects.bulk_create(
+            (
+                Product(
+                    id=ulid.new().str,
+                    name=f'Product {ulid.new().str}',
+                    sku=ulid.new().str,
+                    barcode=ulid.new().str,
+                    category=self.category,
+                    business=self.business,
+                )
+                for _ in range(count)
+            ),
+            batch_size=5000,
+        )
+
+    def seed_categories(self, count):
+        ids = [ulid.new().str for _ in range(count)]
+        ProductCategory.objects.bulk_create(
+            ProductCategory(
+                id=id,
+                name=f'Category {id}',
+                parent=self.category,
+                path=f'{self.category.path}{id}/',
+                business=self.business,
+            )
+            for id in ids
+        )
+
+    def test_products(self):
+        self.assertWithinBudget(
+            'products.list',
+            self.seed_products,
+            self.request(ProductEndpoint, 'products'),
+        )
+        self.assertWithinBudget(
+            'products.category',
+            self.seed_products,
+            self.request(
+                ProductEndpoint, f'products?category={self.category.id}'
+            ),
+        )
+        self.assertWithinBudget(
+            'products.search',
+            self.seed_products,
+            self.request(ProductSearchEndpoint, 'products/?search=Product'),
+        )
+        self.assertWithinBudget(
+            'products.detail',
+            self.seed_products,
+            self.request(
+                ProductEndpoint, 'products/id', product_id=self.product.id
+            ),
+        )
+        self.assertWithinBudget(
+            'products.create',
+            self.seed_products,
+            self.request(ProductEndpoint, 'products', 'post', {
+                'name': 'Beans', 'stock': 5, 'cost_price': 10,
+            }),
+        )
+
+    def test_lookup(self):
+        lookup = self.request(
+            ProductLookupEndpoint, 'products/lookup?code=7890000000000'
+        )
+
+        def uncached_lookup():
+            forget_products(self.business.id, [self.product.id])
+            lookup()
+
+        self.assertWithinBudget('products.lookup', self.seed_products, lookup)
+        self.assertWithinBudget(
+            'products.lookup_uncached', self.seed_products, uncached_lookup
+        )
+
+    def test_categories(self):
+        self.assertWithinBudget(
+            'categories.list',
+            self.seed_categories,
+            self.request(ProductCategoryEndpoint, 'products/categories'),
+        )
@@ -0,0 +1,75 @@
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.test import TestCase
+
+from modules.accounts.models import Owner
+from modules.business.models import Business
+from modules.products.models import Product, ProductCategory
+from modules.products.views import (
+    ProductEndpoint,
+    ProductLookupEndpoint,
+    ProductSearchEndpoint,
+)
+
+from shared.testing import QueryPlanMixin
+
+from .factories import UserFactory
+
+
+class ProductQueryPlanTest(QueryPlanMixin, TestCase):
+    tables = ['products_product']
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+        self.owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner.business = self.business
+        self.owner.save()
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+        self.category = ProductCategory.objects.create(
+            name='Food', business=self.business
+        )
+        for n in range(3):
+            Product.objects.create(
+                name=f'Product {n}',
+                sku=f'SKU{n}',
+                barcode=f'789000000000{n}',
+                category=self.category,
+                business=self.business,
+            )
+
+    def get(self, endpoint, path, **params):
+        def call():
+            request = self.factory.get(
+                path, params, HTTP_AUTHORIZATION=self.auth_header
+            )
+            response = endpoint.as_view()(request)
+            self.assertEqual(response.status_code, 200)
+        return call
+
+    def test_list(self):
+        self.assertIndexScans(self.get(ProductEndpoint, 'products'), self.tables)
+        self.assertIndexScans(
+            self.get(ProductEndpoint, 'products', category=self.category.id),
+            self.tables,
+        )
+
+    def test_search(self):
+        self.assertIndexScans(
+            self.get(ProductSearchEndpoint, 'products/', search='product'),
+            self.tables,
+        )
+
+    def test_lookup(self):
+        self.assertIndexScans(
+            self.get(ProductLookupEndpoint, 'products/lookup', code='SKU1'),
+            self.tables,
+        )
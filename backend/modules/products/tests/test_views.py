@@ -1,20 +1,30 @@
 from rest_framework.test import APIRequestFactory
 from rest_framework_simplejwt.tokens import AccessToken
 
+from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from modules.accounts.models import Owner
 from modules.business.models import Business
-from modules.products.models import Product
-from modules.inventory.models import Inventory
+from modules.products.models import Product, ProductCategory
+from modules.inventory.models import Inventory, InventoryTransaction
 
+from modules.inventory.serializers import InventorySerializer
+from modules.products import lookup
+from modules.products.serializers import ProductSerializer
 from modules.products.views import (
     ProductSearchEndpoint,
+    ProductLookupEndpoint,
     ProductEndpoint,
     ProductCategoryEndpoint,
     ProductCostHistoryEndpoint,
 )
 
+from shared.categories import update_path
+from shared.testing import QueryCountMixin
+
 from .factories import UserFactory
 
 
@@ -52,6 +62,104 @@ class ProductSearchEndpointViewTest(TestCase):
         self.assertEqual(response.status_code, 400)
 
 
+class ProductLookupEndpointViewTest(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = UserFactory()
+
+        self.owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner.business = self.business
+        self.owner.save()
+        self.product = Product.objects.create(
+            name='Test Product',
+            sku='SKU-1',
+            barcode='7891000100103',
+            retail_price=10,
+            business=self.business,
+        )
+        self.inventory = Inventory.objects.create(product=self.product)
+
+        lookup.cache.clear()
+        self.addCleanup(lookup.cache.clear)
+
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+    def lookup(self, code):
+        request = self.factory.get(
+            f'products/lookup?code={code}',
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        return ProductLookupEndpoint.as_view()(request)
+
+    def test_permission_is_admin(self):
+        self.user.is_staff = False
+        self.user.save()
+        response = self.lookup('7891000100103')
+        self.assertEqual(response.status_code, 403)
+
+    def test_code_is_required(self):
+        response = self.lookup('')
+        self.assertEqual(response.status_code, 400)
+
+    def test_lookup_by_barcode_and_sku(self):
+        for code in ('7891000100103', 'SKU-1'):
+            response = self.lookup(code)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['product']['id'], self.product.id)
+            self.assertEqual(response.data['product']['price'], '10.00')
+
+    def test_lookup_is_scoped_to_the_business(self):
+        other_business = Business.objects.create(
+            legal_name='Other Business INC',
+            trade_name='Other Business',
+            cnpj=98765432109876
+        )
+        Product.objects.create(
+            name='Other Product',
+            barcode='7890000000000',
+            business=other_business,
+        )
+        response = self.lookup('7890000000000')
+        self.assertEqual(response.status_code, 404)
+
+    def test_repeated_lookup_is_cached(self):
+        self.lookup('7891000100103')
+        with CaptureQueriesContext(connection) as context:
+            response = self.lookup('7891000100103')
+
+        self.assertEqual(response.data['product']['id'], self.product.id)
+        self.assertFalse(any(
+            'products_product' in query['sql']
+            for query in context.captured_queries
+        ))
+
+    def test_cache_is_invalidated_on_save(self):
+        self.lookup('7891000100103')
+        self.product.discounted_price = 8
+        self.product.save()
+
+        response = self.lookup('7891000100103')
+        self.assertEqual(response.data['product']['price'], '8.00')
+
+        self.product.barcode = '7891000100110'
+        self.product.save()
+        self.assertEqual(self.lookup('7891000100103').status_code, 404)
+
+    def test_cache_is_invalidated_on_stock_movement(self):
+        self.lookup('SKU-1')
+        InventoryTransaction.objects.create(
+            inventory=self.inventory, type='inbound', quantity=5
+        )
+        response = self.lookup('SKU-1')
+        self.assertEqual(response.data['product']['stock'], 5)
+
+
 class ProductEndpointViewTest(TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
@@ -102,14 +210,230 @@ class ProductEndpointViewTest(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['error']['message'], error_message)
 
+    def test_update_keeps_concurrent_stock_movements(self):
+        product = Product.objects.get(id=self.product.id)
+        inventory = Inventory.objects.get(product=product)
+
+        # Moved after the instances being updated were loaded.
+        InventoryTransaction.objects.create(
+            inventory=inventory, type='inbound', quantity=5
+        )
+
+        serializer = ProductSerializer(
+            instance=product, data={'name': 'Renamed'}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        serializer = InventorySerializer(
+            instance=inventory, data={'location': 'Aisle 2'}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+
+        product.refresh_from_db()
+        inventory.refresh_from_db()
+        self.assertEqual(product.name, 'Renamed')
+        self.assertEqual(product.stock, 5)
+        self.assertEqual(inventory.location, 'Aisle 2')
+        self.assertEqual(inventory.quantity, 5)
+
+    def test_create_product_with_initial_stock(self):
+        data = {'name': 'Stocked Product', 'stock': 5, 'cost_price': 10}
+
+        request = self.factory.post(
+            'products',
+            data=data,
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ProductEndpoint.as_view()(request)
+
+        product = Product.objects.get(id=response.data['product']['id'])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['product']['stock'], 5)
+        self.assertEqual(product.stock, 5)
+        self.assertEqual(product.inventory.quantity, 5)
+
+    def test_list_products_paginated(self):
+        for number in range(59):
+            Product.objects.create(
+                name=f'Product {number}',
+                business=self.product.business,
+            )
+
+        request = self.factory.get(
+            'products?page=2',
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ProductEndpoint.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 60)
+        self.assertEqual(len(response.data['results']), 10)
 
-class ProductCategoryEndpointViewTest(TestCase):
+
+class ProductCategoryEndpointViewTest(QueryCountMixin, TestCase):
     def setUp(self):
         self.factory = APIRequestFactory()
         self.user = UserFactory()
+        self.owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner.business = self.business
+        self.owner.save()
         self.token = AccessToken.for_user(self.user)
         self.auth_header = f'Bearer {self.token}'
 
+    def list_categories(self):
+        request = self.factory.get(
+            'products/categories',
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ProductCategoryEndpoint.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_categories_are_serialized_with_their_parents(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        fruit = ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+        ProductCategory.objects.create(
+            name='Citrus', parent=fruit, business=self.business
+        )
+
+        results = self.list_categories()['results']
+        citrus = next(
+            row['category'] for row in results
+            if row['category']['name'] == 'Citrus'
+        )
+        self.assertEqual(citrus['parent']['name'], 'Fruit')
+        self.assertEqual(citrus['parent']['parent']['name'], 'Food')
+        self.assertIsNone(citrus['parent']['parent']['parent'])
+
+    def test_renamed_parent_is_served_fresh(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+        self.list_categories()
+
+        food.name = 'Groceries'
+        food.save()
+
+        results = self.list_categories()['results']
+        fruit = next(
+            row['category'] for row in results
+            if row['category']['name'] == 'Fruit'
+        )
+        self.assertEqual(fruit['parent']['name'], 'Groceries')
+
+    def test_list_query_count_does_not_grow_with_depth(self):
+        parents = [None]
+
+        def seed(size):
+            for _ in range(size):
+                parents.append(ProductCategory.objects.create(
+                    name=f'Category {len(parents)}',
+                    parent=parents[-1],
+                    business=self.business,
+                ))
+
+        self.assertConstantQueries(seed, self.list_categories)
+
+    def test_paths_follow_the_hierarchy(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        fruit = ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+        self.assertEqual(food.path, f'{food.id}/')
+        self.assertEqual(fruit.path, f'{food.id}/{fruit.id}/')
+
+    def test_moving_a_category_moves_its_subtree(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        drinks = ProductCategory.objects.create(name='Drinks', business=self.business)
+        fruit = ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+        citrus = ProductCategory.objects.create(
+            name='Citrus', parent=fruit, business=self.business
+        )
+
+        request = self.factory.patch(
+            f'products/categories/{fruit.id}',
+            {'parent': drinks.id},
+            format='json',
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ProductCategoryEndpoint.as_view()(request, category_id=fruit.id)
+        self.assertEqual(response.status_code, 200)
+
+        citrus.refresh_from_db()
+        self.assertEqual(citrus.path, f'{drinks.id}/{fruit.id}/{citrus.id}/')
+
+    def test_category_cannot_move_under_itself(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        fruit = ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+
+        request = self.factory.patch(
+            f'products/categories/{food.id}',
+            {'parent': fruit.id},
+            format='json',
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ProductCategoryEndpoint.as_view()(request, category_id=food.id)
+        self.assertEqual(response.status_code, 400)
+
+        food.refresh_from_db()
+        self.assertIsNone(food.parent)
+
+    def test_cycle_found_on_save_is_a_model_validation_error(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        fruit = ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+
+        food.parent = fruit
+        with self.assertRaises(ValidationError):
+            food.save()
+
+    def test_path_is_kept_while_the_parent_is_unchanged(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        fruit = ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+
+        fruit.name = 'Fruits'
+        with self.assertNumQueries(1):
+            self.assertIsNone(update_path(fruit))
+        self.assertEqual(fruit.path, f'{food.id}/{fruit.id}/')
+
+    def test_products_are_filtered_by_subtree(self):
+        food = ProductCategory.objects.create(name='Food', business=self.business)
+        fruit = ProductCategory.objects.create(
+            name='Fruit', parent=food, business=self.business
+        )
+        drinks = ProductCategory.objects.create(name='Drinks', business=self.business)
+        for name, category in [('Bread', food), ('Apple', fruit), ('Water', drinks)]:
+            Product.objects.create(
+                name=name, category=category, business=self.business
+            )
+
+        request = self.factory.get(
+            'products',
+            {'category': food.id},
+            HTTP_AUTHORIZATION=self.auth_header
+        )
+        response = ProductEndpoint.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        names = {row['product']['name'] for row in response.data['results']}
+        self.assertEqual(names, {'Bread', 'Apple'})
+
     def test_permission_is_admin(self):
         self.user.is_staff = False
         self.user.save()
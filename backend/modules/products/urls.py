@@ -16,6 +16,7 @@ urlpatterns = [
     ),
 
     path('/', views.ProductSearchEndpoint.as_view()),
+    path('/lookup', views.ProductLookupEndpoint.as_view()),
     
     path('', views.ProductEndpoint.as_view()),
     path('/<str:product_id>', views.ProductEndpoint.as_view()),
@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from django.db.models import Q
 
 from .utils.calculate import calculate_markup, calculate_average_cost
+from .lookup import lookup_product
 
 from .serializers import (
     ProductSerializer,
@@ -20,6 +21,7 @@ from shared import (
     SustainedRateThrottle,
     get_user_business,
 )
+from shared.categories import in_subtree
 
 
 class ProductSearchEndpoint(APIView):
@@ -51,12 +53,36 @@ class ProductSearchEndpoint(APIView):
             Q(barcode__exact=search)
         )
 
-        serializer = ProductSerializer(search_products, many=True)
-        paginated_data = paginate(serializer.data, request, 50)
+        paginated_data = paginate(search_products, request, 50, ProductSerializer)
 
         return paginated_data
 
 
+class ProductLookupEndpoint(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
+
+    def get(self, request):
+        code = request.query_params.get('code', '').strip()
+
+        if not code:
+            error_response = error.builder(400, 'Provide a barcode or SKU.')
+            return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+        business, got_no_business = get_user_business(request.user)
+
+        if got_no_business:
+            return Response(got_no_business, status.HTTP_404_NOT_FOUND)
+
+        product = lookup_product(business, code)
+
+        if not product:
+            error_response = error.builder(404, 'Product not found.')
+            return Response(error_response, status.HTTP_404_NOT_FOUND)
+
+        return Response(product, status.HTTP_200_OK)
+
+
 class ProductEndpoint(APIView):
     permission_classes = [permissions.IsAdminUser]
     throttle_classes = [BurstRateThrottle, SustainedRateThrottle]
@@ -79,8 +105,19 @@ class ProductEndpoint(APIView):
             serializer = ProductSerializer(product)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = ProductSerializer(products, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            category_id = request.query_params.get('category')
+            if category_id:
+                category = business.product_categories\
+                    .filter(id=category_id)\
+                    .first()
+
+                if not category:
+                    error_response = error.builder(404, 'Category not found.')
+                    return Response(error_response, status.HTTP_404_NOT_FOUND)
+
+                products = products.filter(in_subtree(category))
+
+            paginated_data = paginate(products.all(), request, 50, ProductSerializer)
             return paginated_data
 
 
@@ -166,7 +203,7 @@ class ProductEndpoint(APIView):
             return Response(error_response, status.HTTP_404_NOT_FOUND)
         
         product.is_active = False
-        product.save()
+        product.save(update_fields=['is_active'])
 
         data = {
             'product': {
@@ -200,8 +237,9 @@ class ProductCategoryEndpoint(APIView):
             serializer = ProductCategorySerializer(category)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = ProductCategorySerializer(categories, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(
+                categories.all(), request, 50, ProductCategorySerializer
+            )
             return paginated_data
 
 
@@ -325,8 +363,9 @@ class ProductCostHistoryEndpoint(APIView):
             serializer = ProductCostHistorySerializer(cost)
             return Response(serializer.data, status.HTTP_200_OK)
         else:
-            serializer = ProductCostHistorySerializer(costs, many=True)
-            paginated_data = paginate(serializer.data, request, 50)
+            paginated_data = paginate(
+                costs.all(), request, 50, ProductCostHistorySerializer
+            )
             return paginated_data
 
 
@@ -13,7 +13,15 @@ app.conf.beat_schedule = {
     'update-payments-daily': {
         'task': 'modules.billing.tasks.update_payment_status',
         'schedule': crontab(minute=0, hour=0),
-    }
+    },
+    'materialize-payment-schedules-daily': {
+        'task': 'modules.billing.tasks.materialize_payment_schedules',
+        'schedule': crontab(minute=30, hour=0),
+    },
+    'reconcile-financial-account-balances-daily': {
+        'task': 'modules.finance.tasks.reconcile_financial_account_balances',
+        'schedule': crontab(minute=0, hour=3),
+    },
 }
 
 app.config_from_object('django.conf:settings', namespace='CELERY')
@@ -50,15 +50,19 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',        
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'modules.accounts.authentication.TenantJWTAuthentication',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
         'rest_framework.throttling.UserRateThrottle',
     ],
+    # Requests allowed per client of each scope. Load tests raise them
+    # through the environment, where an empty value lifts the limit.
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '50/hour',
-        'user': '10/min',
+        'anon': os.environ.get('ANON_THROTTLE_RATE', '50/hour') or None,
+        'user': os.environ.get('USER_THROTTLE_RATE', '10/min') or None,
+        'burst': os.environ.get('BURST_THROTTLE_RATE', '100/min') or None,
+        'sustained': os.environ.get('SUSTAINED_THROTTLE_RATE', '4000/day') or None,
     },
     'EXCEPTION_HANDLER': 'core.exceptions.handler',
 }
@@ -74,8 +78,29 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER':
+        'modules.accounts.tokens.TenantTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER':
+        'modules.accounts.tokens.TenantTokenRefreshSerializer',
 }
 
+CACHE_URL = os.environ.get('CACHE_URL')
+
+# Seconds the token version of a user stays cached; 0 reads it from the
+# database on every request. Revocations only reach other processes
+# through a shared cache, so it is off without one.
+TOKEN_VERSION_CACHE_TIMEOUT = int(
+    os.environ.get('TOKEN_VERSION_CACHE_TIMEOUT', 300 if CACHE_URL else 0)
+)
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
@@ -124,6 +149,11 @@ else:
         )
     }
 
+# Some indexes include non-key columns so PostgreSQL can answer from the
+# index alone; SQLite builds them without those columns, which is fine for
+# tests and local runs.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -158,7 +188,55 @@ APPEND_SLASH = False
 ASGI_APPLICATION = 'server.asgi.application'
 
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
-CELERY_RESULT_BACKEND = 'rpc://'
+# The overdue recomputation sums the counts of its shards in a chord
+# callback when the backend supports chords (e.g. redis://); with rpc://
+# each shard only logs its own counts under the id of the run.
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'rpc://')
+
+# Overdue recomputation fans out one subtask per shard of businesses. A
+# shard closes once it holds this many candidate payments, so a large
+# tenant runs alone while small ones are grouped together.
+BILLING_OVERDUE_SHARD_ROWS = int(
+    os.environ.get('BILLING_OVERDUE_SHARD_ROWS', 20000)
+)
+BILLING_OVERDUE_BATCH_SIZE = int(
+    os.environ.get('BILLING_OVERDUE_BATCH_SIZE', 2000)
+)
+BILLING_OVERDUE_QUEUE = os.environ.get('BILLING_OVERDUE_QUEUE', 'celery')
+
+# Recurring payments exist as rows only this many days ahead; later
+# occurrences live in their PaymentSchedule until the horizon reaches them.
+BILLING_RECURRENCE_HORIZON_DAYS = int(
+    os.environ.get('BILLING_RECURRENCE_HORIZON_DAYS', 60)
+)
+
+# Barcode/SKU lookups are cached in each worker process, this many per
+# business, for this many seconds. Changes made through another process
+# are seen once the entry expires.
+PRODUCT_LOOKUP_CACHE_SIZE = int(
+    os.environ.get('PRODUCT_LOOKUP_CACHE_SIZE', 2048)
+)
+PRODUCT_LOOKUP_CACHE_TTL = int(
+    os.environ.get('PRODUCT_LOOKUP_CACHE_TTL', 30)
+)
+
+# Seconds the business of a user stays cached between requests; 0 resolves
+# it from the database on every request. Membership changes only reach
+# other processes through a shared cache, so it is off without one.
+TENANCY_CACHE_TIMEOUT = int(
+    os.environ.get('TENANCY_CACHE_TIMEOUT', 300 if CACHE_URL else 0)
+)
+
+# Seconds the category forest of a business stays cached; 0 reads it on
+# every request. Saving or deleting a category retires it right away, but
+# only in other processes through a shared cache, so it is off without one.
+CATEGORY_TREE_CACHE_TIMEOUT = int(
+    os.environ.get('CATEGORY_TREE_CACHE_TIMEOUT', 3600 if CACHE_URL else 0)
+)
+
+# Seconds an aging report of receivables or payables stays cached. Changes
+# to the payments of the business retire it right away.
+AGING_CACHE_TIMEOUT = int(os.environ.get('AGING_CACHE_TIMEOUT', 60))
 
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOWED_ORIGINS = [
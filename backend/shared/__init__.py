@@ -1,3 +1,8 @@
 from .throttling import BurstRateThrottle, SustainedRateThrottle
-from .helpers import get_user_business, paginate, get_start_and_end_date
+from .helpers import (
+    get_user_business,
+    paginate,
+    apply_query_plan,
+    get_start_and_end_date,
+)
 from .permissions import IsOwner
@@ -0,0 +1,174 @@
+"""
+Caching helpers.
+
+`TenantLRUCache` lives in each worker process, so an entry invalidated
+in one process may still be served by another until it expires. Its
+entries are short-lived for that reason.
+
+Entries of the Django cache, shared by every process when `CACHE_URL` is
+set, are instead invalidated in bulk through a version: they are keyed
+or tagged with the version they were read at, and bumping it retires
+them all.
+
+Classes:
+- TenantLRUCache: LRU cache with expiry, partitioned by tenant.
+
+Functions:
+- current_version: Version of a family of entries in the Django cache.
+- bump_version: Retires every entry of such a family.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+from collections import OrderedDict, defaultdict
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import threading
+import time
+
+
+class TenantLRUCache:
+    """
+    Least-recently-used cache of at most `maxsize` entries per tenant
+    and `max_tenants` tenants, each entry living `ttl` seconds.
+
+    Entries may carry tags (e.g. the id of the row they were built from)
+    so they can be invalidated without knowing their tenant or key.
+    """
+
+    def __init__(
+            self,
+            maxsize: int = 1024,
+            ttl: float = 30,
+            max_tenants: int = 256,
+        ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_tenants = max_tenants
+        self.hits = 0
+        self.misses = 0
+
+        self._tenants: OrderedDict[Hashable, OrderedDict] = OrderedDict()
+        self._tags: defaultdict[Hashable, set] = defaultdict(set)
+        self._lock = threading.Lock()
+
+
+    def get(self, tenant: Hashable, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entries = self._tenants.get(tenant)
+            entry = entries.get(key) if entries is not None else None
+
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._discard(tenant, key)
+                self.misses += 1
+                return default
+
+            self._tenants.move_to_end(tenant)
+            entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+
+    def set(
+            self,
+            tenant: Hashable,
+            key: Hashable,
+            value: Any,
+            tags: Iterable[Hashable] = (),
+        ) -> None:
+        tags = tuple(tags)
+
+        with self._lock:
+            self._discard(tenant, key)
+
+            entries = self._tenants.setdefault(tenant, OrderedDict())
+            self._tenants.move_to_end(tenant)
+            entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tags[tag].add((tenant, key))
+
+            while len(entries) > self.maxsize:
+                self._discard(tenant, next(iter(entries)))
+
+            while len(self._tenants) > self.max_tenants:
+                self._clear(next(iter(self._tenants)))
+
+
+    def discard(self, tenant: Hashable, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._discard(tenant, key)
+
+
+    def invalidate(self, *tags: Hashable) -> None:
+        """
+        Drops every entry carrying any of `tags`, whatever its tenant.
+        """
+        with self._lock:
+            for tag in tags:
+                for tenant, key in list(self._tags.get(tag, ())):
+                    self._discard(tenant, key)
+
+
+    def clear(self, tenant: Hashable | None = None) -> None:
+        with self._lock:
+            if tenant is None:
+                self._tenants.clear()
+                self._tags.clear()
+            else:
+                self._clear(tenant)
+
+
+    def _clear(self, tenant: Hashable) -> None:
+        for key in list(self._tenants.get(tenant, ())):
+            self._discard(tenant, key)
+
+
+    def _discard(self, tenant: Hashable, key: Hashable) -> None:
+        entries = self._tenants.get(tenant)
+        if entries is None:
+            return
+
+        entry = entries.pop(key, None)
+        if entry is not None:
+            for tag in entry[2]:
+                keys = self._tags.get(tag)
+                if keys is not None:
+                    keys.discard((tenant, key))
+                    if not keys:
+                        del self._tags[tag]
+
+        if not entries:
+            del self._tenants[tenant]
+
+
+def current_version(key: str) -> int:
+    """
+    The version stored under `key` in the Django cache. Entries cached
+    at another version are stale. A lost version restarts from a fresh
+    value, never from one that older entries could still carry.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key: str) -> None:
+    """
+    Moves the version under `key` on, now and again once the current
+    transaction commits, so no request caches what it read before the
+    change became visible.
+    """
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,261 @@
+"""
+Category trees of a business.
+
+Financial and product categories form a forest per business through
+their `parent`. Each category also stores its materialized `path`, the
+ids from its root down to itself, each followed by `/`, so a subtree is
+one indexed `LIKE 'path%'` and its root is the first id of the path.
+
+The forest of a business is loaded with one query and, with a shared
+cache, kept in the Django cache under a per-business version, bumped
+whenever one of its categories is saved or deleted. Serializers resolve the ancestry of a
+category from it instead of following `parent` one query at a time.
+
+Classes:
+- CategoryTree: The categories of one business, by id.
+
+Functions:
+- category_tree: The tree of a business, from the cache.
+- forget_category_tree: Retires the cached tree of a business.
+- serialize_category: A category with its chain of parents.
+- validate_parent: Rejects parents from another business or subtree.
+- update_path: Sets the path of a category about to be saved.
+- move_subtree: Rewrites the paths under a category that moved.
+- rebuild_paths: Recomputes every path from the `parent` links.
+- in_subtree: Filter for the rows under a category.
+- root_category: Expression with the id of the root of a category.
+"""
+
+from rest_framework import serializers
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Q, Value
+from django.db.models.functions import Concat, Substr
+
+from .cache import bump_version, current_version
+
+
+FIELDS = ['id', 'parent_id', 'name', 'is_active']
+
+
+def version_key(model: type[Model], business_id: str) -> str:
+    return f'categories:{model._meta.label_lower}:{business_id}:version'
+
+
+class CategoryTree:
+    """
+    The categories of one business, each as `(id, parent_id, name,
+    is_active)`.
+    """
+
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = {row[0]: row for row in rows}
+        self._serialized = {}
+
+
+    def __contains__(self, category_id: str) -> bool:
+        return category_id in self.rows
+
+
+    def serialize(self, category_id: str) -> dict | None:
+        """
+        The category with its parents nested under `parent`, up to the
+        root. Chains are built once per tree and shared.
+        """
+        if category_id in self._serialized:
+            return self._serialized[category_id]
+
+        # Iterative so a long chain cannot exhaust the recursion limit;
+        # `seen` stops at a cycle instead of looping.
+        chain, seen = [], set()
+        current = category_id
+        while (
+            current in self.rows
+            and current not in self._serialized
+            and current not in seen
+        ):
+            seen.add(current)
+            chain.append(current)
+            current = self.rows[current][1]
+
+        parent = self._serialized.get(current)
+        for node in reversed(chain):
+            _, _, name, is_active = self.rows[node]
+            parent = self._serialized[node] = {
+                'id': node,
+                'name': name,
+                'is_active': is_active,
+                'parent': parent,
+            }
+
+        return self._serialized.get(category_id)
+
+
+def category_tree(model: type[Model], business_id: str) -> CategoryTree:
+    timeout = settings.CATEGORY_TREE_CACHE_TIMEOUT
+    rows = key = None
+
+    if timeout:
+        version = current_version(version_key(model, business_id))
+        key = f'categories:{model._meta.label_lower}:{business_id}:{version}'
+        rows = cache.get(key)
+
+    if rows is None:
+        rows = list(
+            model.objects
+                .filter(business_id=business_id)
+                .values_list(*FIELDS)
+        )
+        if timeout:
+            cache.set(key, rows, timeout)
+
+    return CategoryTree(rows)
+
+
+def forget_category_tree(model: type[Model], business_id: str) -> None:
+    bump_version(version_key(model, business_id))
+
+
+def serialize_category(category: Model, context: dict | None = None) -> dict:
+    """
+    `category` with its parents nested under `parent`. Passing the
+    serializer context shares one tree between the rows of a page.
+    """
+    trees = context.setdefault('category_trees', {}) if context is not None else {}
+    key = (category._meta.label_lower, category.business_id)
+
+    tree = trees.get(key)
+    if tree is None or category.id not in tree:
+        tree = trees[key] = category_tree(type(category), category.business_id)
+
+    return tree.serialize(category.id) or {
+        'id': category.id,
+        'name': category.name,
+        'is_active': category.is_active,
+        'parent': None,
+    }
+
+
+def validate_parent(attrs: dict, instance: Model | None) -> dict:
+    """
+    Serializer-level check that the `parent` in `attrs` belongs to the
+    same business and is not the category itself or one of its
+    descendants.
+    """
+    parent = attrs.get('parent')
+    if not parent:
+        return attrs
+
+    business = attrs.get('business') or getattr(instance, 'business', None)
+    if business and parent.business_id != business.pk:
+        raise serializers.ValidationError({'parent': 'Category not found.'})
+
+    if instance and instance.path and parent.path.startswith(instance.path):
+        message = 'A category cannot be moved under itself.'
+        raise serializers.ValidationError({'parent': message})
+
+    return attrs
+
+
+def update_path(category: Model) -> str | None:
+    """
+    Sets `category.path` from the current path of its parent. Returns
+    the previous path when the category moved and its descendants need
+    `move_subtree`, None otherwise. A category keeping its parent keeps
+    its stored path, which an ancestor moved since it was loaded may
+    have rewritten. Raises Django's ValidationError if the new parent
+    lies under the category; requests are turned away by
+    `validate_parent` before getting here.
+    """
+    model = type(category)
+
+    previous_parent_id = previous_path = None
+    if not category._state.adding:
+        previous_parent_id, previous_path = model.objects\
+            .filter(pk=category.pk)\
+            .values_list('parent_id', 'path')\
+            .first() or (None, None)
+
+    if previous_path and previous_parent_id == category.parent_id:
+        category.path = previous_path
+        return None
+
+    parent_path = ''
+    if category.parent_id:
+        parent_path = model.objects\
+            .filter(pk=category.parent_id)\
+            .values_list('path', flat=True)\
+            .first() or ''
+
+    if category.id in parent_path.split('/'):
+        message = 'A category cannot be moved under itself.'
+        raise ValidationError({'parent': message})
+
+    category.path = f'{parent_path}{category.id}/'
+
+    if previous_path and previous_path != category.path:
+        return previous_path
+    return None
+
+
+def move_subtree(model: type[Model], previous_path: str, path: str) -> int:
+    """
+    Replaces the `previous_path` prefix of the descendants of a category
+    with its new `path`, in one UPDATE.
+    """
+    return model.objects\
+        .filter(path__startswith=previous_path)\
+        .exclude(path=previous_path)\
+        .update(path=Concat(
+            Value(path),
+            Substr('path', len(previous_path) + 1),
+        ))
+
+
+def rebuild_paths(model: type[Model], batch_size: int = 1000) -> int:
+    """
+    Recomputes the path of every category of `model` from its `parent`
+    links, e.g. to fill them in a migration. A cycle of `parent` links
+    is cut where it closes. Returns the number of paths rewritten.
+    """
+    rows = dict(model.objects.values_list('id', 'parent_id'))
+    stored = dict(model.objects.values_list('id', 'path'))
+    paths = {}
+
+    def path_of(category_id):
+        chain, seen = [], set()
+        current = category_id
+        while current in rows and current not in paths and current not in seen:
+            seen.add(current)
+            chain.append(current)
+            current = rows[current]
+
+        parent_path = paths.get(current, '')
+        for node in reversed(chain):
+            parent_path = paths[node] = f'{parent_path}{node}/'
+        return paths[category_id]
+
+    changed = [
+        model(pk=category_id, path=path_of(category_id))
+        for category_id in rows
+        if path_of(category_id) != stored[category_id]
+    ]
+    model.objects.bulk_update(changed, ['path'], batch_size=batch_size)
+
+    return len(changed)
+
+
+def in_subtree(category: Model, field: str = 'category') -> Q:
+    """
+    Rows whose `field` is `category` or any category under it.
+    """
+    return Q(**{f'{field}__path__startswith': category.path})
+
+
+def root_category(field: str = 'category') -> Substr:
+    """
+    The id of the top-level category above `field`, itself included.
+    """
+    return Substr(f'{field}__path', 1, 26)
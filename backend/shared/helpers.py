@@ -1,16 +1,25 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+from rest_framework.utils.urls import replace_query_param
+from rest_framework import status
 
+from django.db.models import QuerySet
 from django.utils import timezone
 
 from datetime import datetime, timedelta
 
 import calendar
+import re
 
 from modules.business.models import Business
 
 from . import error
+from .tenancy import resolve_business
+
+
+ULID_PATTERN = re.compile(r'^[0-9A-HJKMNP-TV-Z]{26}$')
 
 
 def get_user_business(user: Request) -> (
@@ -20,11 +29,11 @@ def get_user_business(user: Request) -> (
     """
     Helper function to retrieve the business associated with the owner.
     Returns a tuple (business, error_response), where one is None.
+
+    The business is resolved once per request and cached across requests
+    (see `shared.tenancy`).
     """
-    if hasattr(user, 'owner'):
-        business = getattr(user.owner, 'business')
-    elif hasattr(user, 'member'):
-        business = getattr(user.member, 'business')
+    business = resolve_business(user)
 
     if not business:
         error_response = error.builder(404, 'Owner does not have a business.')
@@ -33,15 +42,128 @@ def get_user_business(user: Request) -> (
     return business, None
 
 
-def paginate(data, request: Request, page_size: int) -> Response:
+def apply_query_plan(queryset, serializer: type[BaseSerializer]):
+    """
+    Applies the related-object plan declared by a serializer to a queryset.
+
+    Serializers that walk relations in `to_representation` declare them in
+    their `Meta` as `select_related` and/or `prefetch_related`, so a page
+    of N rows costs a constant number of queries instead of N + 1.
+    """
+    meta = getattr(serializer, 'Meta', None)
+    select_related = getattr(meta, 'select_related', None)
+    prefetch_related = getattr(meta, 'prefetch_related', None)
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    return queryset
+
+
+def paginate(
+        data,
+        request: Request,
+        page_size: int,
+        serializer: type[BaseSerializer] | None = None,
+        cursor: bool = False,
+    ) -> Response:
+    """
+    Paginates `data` and returns the paginated response.
+
+    When a `serializer` is given, only the rows of the requested page
+    are serialized. A queryset is sliced in the database (LIMIT/OFFSET),
+    so the cost of a page does not grow with the size of the table; a
+    list of model instances is sliced in memory.
+
+    Without a `serializer`, `data` is paginated as it is (e.g. a list
+    that has already been serialized).
+
+    With `cursor=True`, requests carrying `?cursor=` or `?limit=` are
+    served by `paginate_by_cursor` instead.
+    """
+    params = request.query_params
+    if cursor and ('cursor' in params or 'limit' in params):
+        return paginate_by_cursor(data, request, page_size, serializer)
+
     paginator = PageNumberPagination()
     paginator.page_size = page_size
+
+    if serializer and isinstance(data, QuerySet):
+        data = apply_query_plan(data, serializer)
+
+        # Pages sliced with LIMIT/OFFSET are only stable over a total order.
+        if not data.ordered:
+            data = data.order_by('pk')
     
     paginated_data = paginator.paginate_queryset(data, request)
+
+    if serializer:
+        paginated_data = serializer(paginated_data, many=True).data
     
     return paginator.get_paginated_response(paginated_data)
 
 
+def paginate_by_cursor(
+        queryset,
+        request: Request,
+        page_size: int,
+        serializer: type[BaseSerializer],
+        max_page_size: int = 200,
+    ) -> Response:
+    """
+    Keyset pagination over ULID primary keys, newest first.
+
+    ULIDs sort lexicographically by creation time, so the primary key is
+    the cursor: each page is fetched with
+    `WHERE id < :cursor ORDER BY id DESC LIMIT :limit`, without COUNT(*)
+    or OFFSET, and deep pages cost the same as the first one.
+
+    ### Parameters:
+    - `cursor`: ID of the last item of the previous page.
+    - `limit`: Page size, up to `max_page_size` (defaults to `page_size`).
+
+    ### Returns:
+    - `{"next": url | None, "results": [...]}`, where `next` carries the
+      cursor of the following page.
+    """
+    cursor = request.query_params.get('cursor')
+    limit = request.query_params.get('limit', page_size)
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        limit = 0
+
+    if not 1 <= limit <= max_page_size:
+        message = f'Limit must be between 1 and {max_page_size}.'
+        error_response = error.builder(400, message)
+        return Response(error_response, status.HTTP_400_BAD_REQUEST)
+
+    if cursor:
+        cursor = cursor.upper()
+        if not ULID_PATTERN.match(cursor):
+            error_response = error.builder(400, 'Invalid cursor.')
+            return Response(error_response, status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(pk__lt=cursor)
+
+    queryset = apply_query_plan(queryset, serializer)
+    rows = list(queryset.order_by('-pk')[:limit + 1])
+    page = rows[:limit]
+
+    next_url = None
+    if len(rows) > limit:
+        url = request.build_absolute_uri()
+        url = replace_query_param(url, 'cursor', page[-1].pk)
+        next_url = replace_query_param(url, 'limit', limit)
+
+    return Response({
+        'next': next_url,
+        'results': serializer(page, many=True).data,
+    })
+
+
 def get_start_and_end_date(
         today: datetime,
         week: bool | None = None,
@@ -1,8 +1,11 @@
 from rest_framework import permissions
+from rest_framework_simplejwt.models import TokenUser
 
 
 class IsOwner(permissions.BasePermission):
     def has_permission(self, request, view):
         user = request.user
+        if isinstance(user, TokenUser):
+            return user.role == 'owner'
         if hasattr(user, 'owner'):
             return request.user
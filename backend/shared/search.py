@@ -0,0 +1,86 @@
+"""
+Search over denormalized, normalized documents.
+
+A search document is the text a row is found by, folded once on write
+(accents removed, lowercased, whitespace collapsed) and stored in a
+column of its own. Queries are folded the same way and matched with a
+plain `LIKE '%term%'` on that column, which PostgreSQL serves from a
+trigram index and SQLite answers with a scan.
+
+Functions:
+- normalize: Folds and joins the given texts into one search document.
+- rank: Expression ranking how well a document matches a term.
+- search: Filters a queryset by a document field and ranks the matches.
+- create_trigram_index: Migration operation for the trigram index.
+"""
+
+from django.db import migrations
+from django.db.models import Case, IntegerField, Q, QuerySet, Value, When
+
+import re
+import unicodedata
+
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(*texts: str | None) -> str:
+    """
+    Joins `texts`, skipping empty ones, without accents, in lowercase and
+    with runs of whitespace collapsed. Normalizing twice is harmless.
+    """
+    text = ' '.join(str(text) for text in texts if text)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return WHITESPACE.sub(' ', text).strip().lower()
+
+
+def rank(field: str, term: str) -> Case:
+    """
+    0 for documents starting with the already normalized `term`, 1 for
+    the ones with a word starting with it and 2 for any other match.
+    """
+    return Case(
+        When(Q(**{f'{field}__startswith': term}), then=Value(0)),
+        When(Q(**{f'{field}__contains': f' {term}'}), then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField(),
+    )
+
+
+def search(queryset: QuerySet, field: str, term: str) -> QuerySet:
+    """
+    Rows of `queryset` whose `field` contains `term`, best matches first
+    (see `rank`). Ties keep the queryset's order.
+    """
+    term = normalize(term)
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+
+    return queryset\
+        .filter(**{f'{field}__contains': term})\
+        .annotate(search_rank=rank(field, term))\
+        .order_by('search_rank', *ordering, 'pk')
+
+
+def create_trigram_index(table: str, column: str) -> migrations.RunPython:
+    """
+    Creates a GIN trigram index on `table.column` on PostgreSQL, where it
+    makes `LIKE '%term%'` an index scan. Other databases are left as is.
+    """
+    name = f'{table}_{column}_trgm'
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} '
+            f'ON {table} USING gin ({column} gin_trgm_ops)'
+        )
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+    return migrations.RunPython(forwards, backwards)
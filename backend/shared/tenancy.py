@@ -0,0 +1,132 @@
+"""
+Resolution of the business a user works for.
+
+Every endpoint starts by resolving the tenant of `request.user`. The
+answer is memoized on the user object for the rest of the request and
+kept in the Django cache across requests, so a warm request resolves it
+with one cache round trip and no queries.
+
+Users authenticated from a token (`TenantUser`) carry a `business_id`
+claim, honoured only while the token version is current; a user who
+loses or changes business has its tokens revoked. Their business is
+read by primary key instead of through the owner and member tables.
+Tokens issued before the user had a business carry no claim and are
+resolved as usual.
+
+Cached entries carry the tenancy version they were read at. Any change
+to an `Owner`, a `Member` or a `Business` bumps the version, which
+retires every entry at once; such changes are rare next to the requests
+that read them.
+
+Functions:
+- resolve_business: The business of a user, or None.
+- bump_tenancy_version: Retires every cached resolution.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Q, Value, When
+
+import time
+
+from modules.business.models import Business
+
+from .cache import bump_version
+
+
+VERSION_KEY = 'tenancy:version'
+MISSING = object()
+
+
+def user_key(user_id: str) -> str:
+    return f'tenancy:user:{user_id}'
+
+
+def field_names() -> list[str]:
+    return [field.attname for field in Business._meta.concrete_fields]
+
+
+def query_business(user_id: str) -> Business | None:
+    """
+    The business the user owns or, failing that, works for as a member,
+    in a single query.
+    """
+    return Business.objects\
+        .filter(Q(owner__user_id=user_id) | Q(members__credential_id=user_id))\
+        .annotate(is_owner=Case(
+            When(owner__user_id=user_id, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ))\
+        .order_by('is_owner', 'pk')\
+        .first()
+
+
+def claimed_business(business_id: str) -> Business | None:
+    """
+    The business named by the `business_id` claim of a token, or None
+    if it was deleted since.
+    """
+    return Business.objects.filter(pk=business_id).first()
+
+
+def cached_business(user_id: str) -> tuple[int, Business | None | object]:
+    """
+    The current tenancy version and the business cached for the user at
+    that version, MISSING when there is none.
+    """
+    entries = cache.get_many([VERSION_KEY, user_key(user_id)])
+    version = entries.get(VERSION_KEY)
+    entry = entries.get(user_key(user_id))
+
+    # A lost version restarts from a fresh value, never from one that
+    # entries cached before an earlier bump could still carry.
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        return cache.get(VERSION_KEY), MISSING
+
+    if not entry or entry[0] != version:
+        return version, MISSING
+
+    _, names, values = entry
+    if values is None:
+        return version, None
+    if names != field_names():
+        return version, MISSING
+
+    return version, Business.from_db('default', names, values)
+
+
+def resolve_business(user) -> Business | None:
+    """
+    The business `user` owns or is a member of, or None.
+    """
+    if '_tenant' in user.__dict__:
+        return user._tenant
+
+    if not user.pk:
+        return None
+
+    timeout = settings.TENANCY_CACHE_TIMEOUT
+    version, business = cached_business(user.pk) if timeout else (0, MISSING)
+
+    if business is MISSING:
+        business_id = getattr(user, 'business_id', None)
+        if business_id:
+            business = claimed_business(business_id)
+        else:
+            business = query_business(user.pk)
+        if timeout:
+            names = field_names()
+            values = business and [getattr(business, name) for name in names]
+            cache.set(user_key(user.pk), (version, names, values), timeout)
+
+    user._tenant = business
+    return business
+
+
+def bump_tenancy_version() -> None:
+    """
+    Retires every cached resolution.
+    """
+    bump_version(VERSION_KEY)
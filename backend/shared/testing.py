@@ -0,0 +1,246 @@
+"""
+Helpers shared by the test suites of the modules.
+
+Classes:
+- QueryCountMixin: Assertions about the number of queries of an endpoint.
+- QueryPlanMixin: Assertions about how the queries of an endpoint read.
+- PerformanceBudgetMixin: Query and time budgets of endpoints by scale.
+- PerformanceTestCase: A business and its owner to measure endpoints as.
+"""
+
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from pathlib import Path
+
+import json
+import os
+import re
+import time
+
+from modules.accounts.models import Owner
+from modules.business.models import Business
+
+
+class QueryCountMixin:
+    def assertConstantQueries(self, seed, call, sizes=(1, 10)):
+        """
+        Asserts that `call` runs the same number of queries however many
+        rows there are, which catches N + 1 queries in list endpoints.
+
+        Args:
+            seed (Callable[[int], Any]): Creates the given number of rows.
+            call (Callable[[], Any]): Requests the endpoint under test.
+            sizes (tuple[int]): Rows to add before each measurement.
+        """
+        counts = []
+        for size in sizes:
+            seed(size)
+            # Tenancy is resolved from the database every time so that a
+            # warm cache on later calls does not mask a growing count.
+            with override_settings(TENANCY_CACHE_TIMEOUT=0):
+                with CaptureQueriesContext(connection) as context:
+                    call()
+            counts.append(len(context.captured_queries))
+
+        self.assertEqual(
+            len(set(counts)),
+            1,
+            f'Query count changed with the number of rows: {counts}',
+        )
+
+
+def explain(sql: str) -> list[str]:
+    """
+    The plan of `sql`, one line per step. On PostgreSQL sequential scans
+    are disabled while planning, so a table is only read in full when no
+    index can serve the query, however few rows the test database holds.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            return [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(plan: list[str], table: str) -> list[str]:
+    """
+    The steps of `plan` reading `table` (or, on SQLite, any table) from
+    start to end rather than through an index.
+    """
+    if connection.vendor == 'postgresql':
+        pattern = rf'Seq Scan on {re.escape(table)}\b'
+    else:
+        # SQLite names aliases instead of tables, and reports an index it
+        # walks in full as `SCAN ... USING INDEX`, which is still ordered.
+        # Scans of the rows a subquery already produced are not counted.
+        pattern = r'^SCAN (?!\(?subquery|CONSTANT ROW)\S+$'
+    return [step for step in plan if re.search(pattern, step.strip())]
+
+
+class QueryPlanMixin:
+    def assertIndexScans(self, call, tables):
+        """
+        Asserts that every SELECT `call` runs on any of `tables` reads
+        them through an index, without scanning a table in full. Catches
+        tenant-scoped queries left without an index that matches them.
+
+        Args:
+            call (Callable[[], Any]): Requests the endpoint under test.
+            tables (list[str]): Tables whose queries are explained.
+        """
+        with CaptureQueriesContext(connection) as context:
+            call()
+
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+            and any(f'"{table}"' in query['sql'] for table in tables)
+        ]
+        self.assertTrue(queries, f'No query read any of: {", ".join(tables)}')
+
+        for sql in queries:
+            plan = explain(sql)
+            for table in tables:
+                scans = full_scans(plan, table)
+                self.assertFalse(
+                    scans,
+                    f'Full scan in:\n{sql}\n\nPlan:\n' + '\n'.join(plan),
+                )
+
+
+def perf_scales() -> list[int]:
+    """
+    Rows seeded before each measurement of the performance suites, from
+    `PERF_SCALES` (e.g. `10,1000,100000` for a nightly run).
+    """
+    scales = os.environ.get('PERF_SCALES', '10,1000')
+    return sorted(int(scale) for scale in scales.split(','))
+
+
+class PerformanceBudgetMixin:
+    """
+    Checks endpoints against `budgets_file`, a JSON object giving each
+    measured call the most `queries` it may run and the most `ms` it may
+    take at any scale:
+
+        {"transactions.list": {"queries": 5, "ms": 150}}
+
+    Query budgets always apply. Time budgets depend on the machine, so
+    they are only checked when `PERF_TIME_FACTOR` is set, multiplied by
+    it (e.g. 1 on the machine the budgets were set on, 2 on one twice as
+    slow); it is 0 by default, which turns them off.
+    """
+
+    budgets_file: str | Path
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(cls.budgets_file) as file:
+            cls.budgets = json.load(file)
+
+    def assertWithinBudget(self, name, seed, call):
+        """
+        Seeds each scale of `perf_scales` in turn and measures `call` once
+        warm, with tenancy resolved from the database. Fails if its query
+        count changes with the number of rows (an N + 1) or exceeds the
+        budget, or if it takes longer than the budget at any scale.
+
+        Args:
+            name (str): Key of the budget in `budgets_file`.
+            seed (Callable[[int], Any]): Adds the given number of rows.
+            call (Callable[[], Any]): Requests the endpoint under test.
+        """
+        self.assertIn(name, self.budgets, f'No budget for {name}.')
+        budget = self.budgets[name]
+        time_factor = float(os.environ.get('PERF_TIME_FACTOR') or 0)
+
+        seeded, measurements = 0, []
+        for scale in perf_scales():
+            seed(scale - seeded)
+            seeded = scale
+
+            # The first call may fill caches or create rows once a day.
+            call()
+            with override_settings(TENANCY_CACHE_TIMEOUT=0):
+                with CaptureQueriesContext(connection) as context:
+                    start = time.perf_counter()
+                    call()
+                    elapsed = (time.perf_counter() - start) * 1000
+            measurements.append((scale, len(context.captured_queries), elapsed))
+
+        summary = ', '.join(
+            f'{scale} rows: {queries} queries in {elapsed:.1f} ms'
+            for scale, queries, elapsed in measurements
+        )
+        counts = {queries for _, queries, _ in measurements}
+
+        self.assertEqual(
+            len(counts),
+            1,
+            f'{name}: query count changed with the number of rows ({summary})',
+        )
+        self.assertLessEqual(
+            max(counts),
+            budget['queries'],
+            f'{name}: over its budget of {budget["queries"]} queries ({summary})',
+        )
+        if time_factor:
+            self.assertLessEqual(
+                max(elapsed for _, _, elapsed in measurements),
+                budget['ms'] * time_factor,
+                f'{name}: over its budget of {budget["ms"]} ms ({summary})',
+            )
+
+
+class PerformanceTestCase(PerformanceBudgetMixin, TestCase):
+    """
+    Sets up a business owned by a staff user from `user_factory`, with
+    an empty cache, for the performance suite of a module to seed and
+    measure its endpoints in.
+    """
+
+    user_factory: type
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.factory = APIRequestFactory()
+        self.user = self.user_factory()
+        self.owner = Owner.objects.create(user=self.user)
+        self.business = Business.objects.create(
+            legal_name='The Test Business INC',
+            trade_name='Test Business',
+            cnpj=12345678901234
+        )
+        self.owner.business = self.business
+        self.owner.save()
+        self.token = AccessToken.for_user(self.user)
+        self.auth_header = f'Bearer {self.token}'
+
+    def request(self, endpoint, path, method='get', data=None, **kwargs):
+        """
+        A call of `endpoint` as the owner, sending `data` as JSON, that
+        fails the test unless it succeeds. A callable `data` is called
+        for each request, e.g. to create rows with unique fields.
+        """
+        def call():
+            request = getattr(self.factory, method)(
+                path,
+                data() if callable(data) else data,
+                format='json' if method != 'get' else None,
+                HTTP_AUTHORIZATION=self.auth_header,
+            )
+            response = endpoint.as_view()(request, **kwargs)
+            self.assertLess(response.status_code, 300, response.data)
+        return call
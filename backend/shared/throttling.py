@@ -1,11 +1,10 @@
 from rest_framework.throttling import UserRateThrottle
 
 
+# Rates are set per scope in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'].
 class BurstRateThrottle(UserRateThrottle):
     scope = 'burst'
-    rate = '100/min'
 
 
 class SustainedRateThrottle(UserRateThrottle):
     scope = 'sustained'
-    rate = '4000/day'